@@ -0,0 +1,33 @@
+"""whiteboard_logs timeline: thumb_keys + (session_id, timestamp, id) index
+
+Revision ID: a7b8c9d00005
+Revises: f6a7b8c90004
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d00005"
+down_revision: Union[str, None] = "f6a7b8c90004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows get thumbnails from scripts/migrate_board_images.py --thumbs.
+    op.add_column("whiteboard_logs", sa.Column("thumb_keys", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_index(
+        "ix_whiteboard_logs_session_timeline", "whiteboard_logs", ["session_id", "timestamp", "id"], unique=False
+    )
+    op.create_index(op.f("ix_whiteboard_logs_image_key"), "whiteboard_logs", ["image_key"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_whiteboard_logs_image_key"), table_name="whiteboard_logs")
+    op.drop_index("ix_whiteboard_logs_session_timeline", table_name="whiteboard_logs")
+    op.drop_column("whiteboard_logs", "thumb_keys")
@@ -0,0 +1,46 @@
+"""shared context buffer (context_counters, context_items)
+
+Only used when CONTEXT_BUFFER_BACKEND=postgres.
+
+Revision ID: c3d4e5f60001
+Revises: a1c2e3f40000
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f60001"
+down_revision: Union[str, None] = "a1c2e3f40000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "context_counters",
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("tokens", sa.Integer(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+    op.create_table(
+        "context_items",
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("tokens", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id", "seq"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("context_items")
+    op.drop_table("context_counters")
@@ -0,0 +1,32 @@
+"""topic_terms (rolling word-cloud index)
+
+Revision ID: d4e5f6a70002
+Revises: c3d4e5f60001
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a70002"
+down_revision: Union[str, None] = "c3d4e5f60001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "topic_terms",
+        sa.Column("scope", sa.String(length=8), nullable=False),
+        sa.Column("scope_id", sa.UUID(), nullable=False),
+        sa.Column("term", sa.String(length=64), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("scope", "scope_id", "term"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("topic_terms")
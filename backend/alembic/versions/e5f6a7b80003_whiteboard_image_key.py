@@ -0,0 +1,26 @@
+"""whiteboard_logs.image_key (images move to the blob store)
+
+Revision ID: e5f6a7b80003
+Revises: d4e5f6a70002
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b80003"
+down_revision: Union[str, None] = "d4e5f6a70002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing base64 images stay in image_data until scripts/migrate_board_images.py moves them.
+    op.add_column("whiteboard_logs", sa.Column("image_key", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("whiteboard_logs", "image_key")
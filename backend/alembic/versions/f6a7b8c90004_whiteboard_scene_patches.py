@@ -0,0 +1,37 @@
+"""whiteboard_logs scene keyframe + patch columns
+
+Revision ID: f6a7b8c90004
+Revises: e5f6a7b80003
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c90004"
+down_revision: Union[str, None] = "e5f6a7b80003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are all keyframes (whole tldraw_snapshot, scene_key_id NULL).
+    op.add_column("whiteboard_logs", sa.Column("scene_patch", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column("whiteboard_logs", sa.Column("scene_key_id", sa.UUID(), nullable=True))
+    op.add_column("whiteboard_logs", sa.Column("scene_seq", sa.Integer(), server_default="0", nullable=False))
+    op.create_foreign_key(
+        "whiteboard_logs_scene_key_id_fkey", "whiteboard_logs", "whiteboard_logs", ["scene_key_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_index(op.f("ix_whiteboard_logs_scene_key_id"), "whiteboard_logs", ["scene_key_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_whiteboard_logs_scene_key_id"), table_name="whiteboard_logs")
+    op.drop_constraint("whiteboard_logs_scene_key_id_fkey", "whiteboard_logs", type_="foreignkey")
+    op.drop_column("whiteboard_logs", "scene_seq")
+    op.drop_column("whiteboard_logs", "scene_key_id")
+    op.drop_column("whiteboard_logs", "scene_patch")
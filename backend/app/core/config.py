@@ -45,6 +45,67 @@ class Settings(BaseSettings):
 
     # Context compression
     compression_token_limit: int = 10000
+    # "memory" (single worker) | "postgres" (shared across worker processes
+    # through the context_* tables + LISTEN/NOTIFY; still no Redis).
+    context_buffer_backend: str = "memory"
+
+    # In-process per-session state (context buffer, last OCR, live games).
+    session_idle_timeout_s: int = 1800  # release after this long with no sockets/activity
+    session_state_max_bytes: int = 64 * 1024 * 1024  # LRU-evict beyond this instance-wide
+
+    # Whisper inference (raw-audio path): dedicated worker processes.
+    stt_preload: bool = True  # spawn + warm the workers at startup instead of on first chunk
+    stt_workers: int = 1
+    stt_model_size: str = "base"  # tiny/base are CPU-friendly
+    stt_compute_type: str = "int8"
+    stt_cpu_threads: int = 2  # per worker process
+    stt_queue_depth: int = 8  # chunks waiting beyond this are dropped
+    stt_timeout_s: float = 30.0  # per chunk, once a worker is ready
+    stt_startup_timeout_s: float = 180.0  # wait for spawn + model load; chunk deadlines start after
+    # Voice-activity gate before Whisper (app.services.vad).
+    vad_enabled: bool = True
+    vad_energy_db: float = -45.0  # frame RMS (dBFS) below this is silence
+    vad_zcr_max: float = 0.35  # zero-crossing rate above this is hiss/noise
+    vad_min_speech_ms: int = 240  # chunks with less speech than this are skipped
+    vad_pad_ms: int = 210  # kept around the speech span when trimming
+
+    # Whiteboard snapshot dedupe (app.services.board_image).
+    board_hash_size: int = 16  # dHash grid; size*size bits
+    board_hash_threshold: int = 0  # differing bits still checked against the region diff
+    # Image normalization before vision OCR (app.services.ocr_image).
+    ocr_prep_enabled: bool = True
+    ocr_max_side: int = 1280  # px; long side of what providers receive
+    # Offline EasyOCR fallback in its own process (app.services.ocr_sidecar).
+    easyocr_preload: bool = True  # spawn + warm the sidecar at startup instead of on first use
+    easyocr_languages: str = "en"  # comma-separated
+    easyocr_queue_depth: int = 4  # images waiting beyond this are dropped
+    easyocr_timeout_s: float = 20.0  # a slower image returns no text and restarts the sidecar
+    easyocr_startup_timeout_s: float = 180.0  # wait for spawn + model load; job deadlines start after
+
+    # Board scene history: a full document every N snapshots, JSON patches between.
+    scene_keyframe_every: int = 20
+
+    # Whiteboard images: content-addressed files, rows keep the key (app.services.blob_store).
+    blob_store_dir: str = "data/blobs"
+    # Timeline thumbnails, built off the snapshot path (app.workers.thumbnail_worker).
+    thumb_queue_max: int = 256  # waiting jobs beyond this are dropped (the row keeps no thumbs)
+
+    # Late-joiner catch-up: recent events replayed on student connect (app.services.catchup).
+    catchup_transcripts: int = 50
+    catchup_commands: int = 12
+
+    # Event-loop lag monitor (app.core.loop_monitor, GET /debug/loop).
+    loop_monitor_interval_ms: int = 100
+    loop_stall_threshold_ms: int = 100  # lag beyond this is a stall (stack captured when enabled)
+    loop_stall_capture: bool | None = None  # capture stalled stacks; default: `debug`
+
+    # Write-behind transcript persistence (app.workers.transcript_writer).
+    transcript_flush_ms: int = 300  # per-session batch window
+    transcript_batch_max: int = 200  # flush early once this many rows wait
+
+    # Server-side "Hey Aura" detection on transcripts (app.services.wake_word).
+    wake_detection_enabled: bool = True
+    wake_dedupe_s: float = 8.0  # a similar command within this window is not re-dispatched
 
     # External rendering helpers (free, keyless). Only short prompts / compound
     # names are sent to these — never lecture content.
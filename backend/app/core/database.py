@@ -1,15 +1,20 @@
-"""SQLAlchemy 2.0 engine, session factory, and declarative Base.
+"""SQLAlchemy 2.0 engines, session factories, and declarative Base.
 
-Sync engine with the psycopg (v3) driver. FastAPI sync dependencies run in a
-threadpool, so blocking DB calls don't stall the event loop. Workers that need
-the DB open their own short-lived session via `session_scope()`.
+Two engines on the psycopg (v3) driver, one database:
+
+- sync (`engine`, `get_db`, `session_scope`): FastAPI sync routes, which run in
+  a threadpool, plus scripts and startup code;
+- async (`async_engine`, `get_async_db`, `async_session_scope`): every coroutine
+  on the event loop (socket handlers, workers, async routes). A blocking call
+  there would stall every socket on the instance for the round trip.
 """
 from __future__ import annotations
 
-from collections.abc import Generator, Iterator
-from contextlib import contextmanager
+from collections.abc import AsyncIterator, Generator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
@@ -25,6 +30,16 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+async_engine = create_async_engine(
+    settings.database_url,  # postgresql+psycopg:// resolves to psycopg's async dialect
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    echo=False,
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     """Declarative base for all ORM models."""
@@ -51,3 +66,21 @@ def session_scope() -> Iterator[Session]:
         raise
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency for async routes: yields an AsyncSession, always closed."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """Transactional AsyncSession for coroutines on the event loop."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
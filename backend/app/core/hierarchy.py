@@ -2,6 +2,7 @@
 
 Chain: Session.unit_id -> Unit.course_id -> Course.semester_id ->
 Semester.department_id -> Department.batch_id. Used by scoped stats + counts.
+The *_course_ids helpers serve course-level rollups (e.g. topic terms).
 """
 from __future__ import annotations
 
@@ -65,3 +66,28 @@ def batch_session_ids(db: DBSession, batch_id: uuid.UUID) -> list[uuid.UUID]:
             .where(Department.batch_id == batch_id)
         ).all()
     )
+
+
+def semester_course_ids(db: DBSession, semester_id: uuid.UUID) -> list[uuid.UUID]:
+    return list(db.scalars(select(Course.id).where(Course.semester_id == semester_id)).all())
+
+
+def department_course_ids(db: DBSession, department_id: uuid.UUID) -> list[uuid.UUID]:
+    return list(
+        db.scalars(
+            select(Course.id)
+            .join(Semester, Course.semester_id == Semester.id)
+            .where(Semester.department_id == department_id)
+        ).all()
+    )
+
+
+def batch_course_ids(db: DBSession, batch_id: uuid.UUID) -> list[uuid.UUID]:
+    return list(
+        db.scalars(
+            select(Course.id)
+            .join(Semester, Course.semester_id == Semester.id)
+            .join(Department, Semester.department_id == Department.id)
+            .where(Department.batch_id == batch_id)
+        ).all()
+    )
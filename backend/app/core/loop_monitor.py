@@ -0,0 +1,170 @@
+"""Event-loop lag monitor and blocking-call detector.
+
+Every Socket.IO client of an instance is served by one event loop, so any
+callback that runs long (a sync DB call, password hashing, a big json.dumps)
+delays all of them. `LoopMonitor.run` sleeps `loop_monitor_interval_ms` in a
+loop and records how late each wake-up is: that lateness is the loop lag any
+socket event would have seen. It is kept as a histogram plus percentiles.
+
+With capture on (`loop_stall_capture`, default: `debug`), a watchdog thread
+also watches the monitor's heartbeat. When the loop has been stuck for more
+than `loop_stall_threshold_ms`, it takes the loop thread's stack *while it is
+still blocked* and attributes the stall to the blocking site (the innermost
+frame in the app) and the entry point (the outermost: socket handler,
+worker, route). It then records the stall's full duration once the loop
+wakes. Per-site counts, duration, max and last stack are kept for the
+`_MAX_SITES` worst sites.
+
+Both are served by `GET /debug/loop`.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import Histogram, LatencyStats
+
+logger = get_logger("aura.loop")
+
+_APP_ROOT = str(Path(__file__).resolve().parent.parent)  # .../app
+_MAX_SITES = 64
+_STACK_FRAMES = 12
+
+
+def _app_frames(frame) -> list[traceback.FrameSummary]:  # noqa: ANN001
+    """The stack's frames inside the app package, outermost first."""
+    stack = traceback.extract_stack(frame)
+    return [f for f in stack if f.filename.startswith(_APP_ROOT) and f.filename != __file__]
+
+
+def _label(f: traceback.FrameSummary) -> str:
+    rel = Path(f.filename).relative_to(Path(_APP_ROOT).parent).with_suffix("")
+    return f"{'.'.join(rel.parts)}:{f.name}"
+
+
+class _Site:
+    __slots__ = ("entry", "site", "count", "total", "max", "stack")
+
+    def __init__(self, entry: str, site: str) -> None:
+        self.entry, self.site = entry, site
+        self.count, self.total, self.max = 0, 0.0, 0.0
+        self.stack: list[str] = []
+
+
+class LoopMonitor:
+    def __init__(
+        self, interval_ms: int | None = None, threshold_ms: int | None = None, capture: bool | None = None
+    ) -> None:
+        self.interval = (interval_ms or settings.loop_monitor_interval_ms) / 1000
+        self.threshold = (threshold_ms or settings.loop_stall_threshold_ms) / 1000
+        if capture is None:
+            capture = settings.debug if settings.loop_stall_capture is None else settings.loop_stall_capture
+        self.capture = capture
+        self.lag = LatencyStats()
+        self.histogram = Histogram()
+        self.stalls = 0
+        self._sites: dict[tuple[str, str], _Site] = {}
+        self._beat = 0.0  # monotonic time the monitor expects its next wake-up
+        self._loop_thread: int | None = None
+        self._held: tuple[float, _Site] | None = None  # stall seen by the watchdog, not yet measured
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    async def run(self) -> None:
+        """Measure loop lag until cancelled (started in the app lifespan)."""
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        watchdog = None
+        if self.capture:
+            watchdog = threading.Thread(target=self._watch, name="aura-loop-watchdog", daemon=True)
+        try:
+            self._beat = time.monotonic() + self.interval
+            if watchdog is not None:
+                watchdog.start()
+            while True:
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                lag = max(0.0, now - self._beat)
+                self._beat = now + self.interval
+                self.observe(lag)
+        finally:
+            self._stop.set()
+
+    def observe(self, lag: float) -> None:
+        self.lag.observe(lag)
+        self.histogram.observe(lag)
+        with self._lock:
+            held, self._held = self._held, None
+        if lag < self.threshold:
+            return
+        self.stalls += 1
+        site = held[1] if held else None
+        if site is not None:
+            site.count += 1
+            site.total += lag
+            site.max = max(site.max, lag)
+        logger.warning(
+            "loop.stall",
+            lag_ms=round(lag * 1000, 1),
+            entry=site.entry if site else None,
+            site=site.site if site else None,
+        )
+
+    def _watch(self) -> None:
+        """Watchdog thread: sample the loop thread's stack during a stall."""
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            beat = self._beat
+            if time.monotonic() - beat < self.threshold:
+                continue
+            with self._lock:
+                if self._held is not None and self._held[0] == beat:
+                    continue  # this stall is already sampled
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            frames = _app_frames(frame)
+            entry = _label(frames[0]) if frames else "(outside app)"
+            where = _label(frames[-1]) if frames else "(outside app)"
+            stack = [f"{f.filename}:{f.lineno} {f.name}" for f in traceback.extract_stack(frame)[-_STACK_FRAMES:]]
+            del frame
+            with self._lock:
+                site = self._sites.get((entry, where))
+                if site is None:
+                    if len(self._sites) >= _MAX_SITES:  # keep the worst sites
+                        del self._sites[min(self._sites, key=lambda k: self._sites[k].total)]
+                    site = self._sites[(entry, where)] = _Site(entry, where)
+                site.stack = stack
+                self._held = (beat, site)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda s: -s.total)
+        return {
+            "intervalMs": round(self.interval * 1000),
+            "thresholdMs": round(self.threshold * 1000),
+            "capture": self.capture,
+            "lag": self.lag.summary(),
+            "histogram": self.histogram.summary(),
+            "stalls": self.stalls,
+            "sites": [
+                {
+                    "entry": s.entry,
+                    "site": s.site,
+                    "count": s.count,
+                    "totalMs": round(s.total * 1000, 1),
+                    "maxMs": round(s.max * 1000, 1),
+                    "stack": s.stack,
+                }
+                for s in sites
+            ],
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,69 @@
+"""Small in-process latency summaries for operator endpoints (no external deps)."""
+from __future__ import annotations
+
+from collections import deque
+
+
+class LatencyStats:
+    """Count/total over the process lifetime plus percentiles over a recent window."""
+
+    __slots__ = ("count", "total", "max", "_recent")
+
+    def __init__(self, window: int = 512) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> dict:
+        """Milliseconds, rounded — the shape served by /debug endpoints."""
+        ms = lambda s: round(s * 1000, 1)  # noqa: E731
+        return {
+            "count": self.count,
+            "meanMs": ms(self.total / self.count) if self.count else 0.0,
+            "p50Ms": ms(self.percentile(0.50)),
+            "p95Ms": ms(self.percentile(0.95)),
+            "maxMs": ms(self.max),
+        }
+
+
+class Histogram:
+    """Cumulative counts per upper bound (ms), Prometheus-style; the last bucket is +Inf."""
+
+    __slots__ = ("bounds_ms", "counts", "count", "total")
+
+    def __init__(self, bounds_ms: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)) -> None:
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(self.bounds_ms):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def summary(self) -> dict:
+        """{"le": {"1": n, ..., "+Inf": n}} (cumulative), with count and sum."""
+        le, running = {}, 0
+        for label, n in zip([f"{b:g}" for b in self.bounds_ms] + ["+Inf"], self.counts):
+            running += n
+            le[label] = running
+        return {"count": self.count, "sumMs": round(self.total * 1000, 1), "le": le}
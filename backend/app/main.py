@@ -5,6 +5,7 @@ Routers, Socket.IO, and workers are mounted in later phases.
 """
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -34,7 +35,35 @@ async def lifespan(app: FastAPI):
         seed_admin()
     except Exception as exc:  # noqa: BLE001
         logger.warning("aura.seed_failed", error=str(exc))
+
+    from app.core.loop_monitor import loop_monitor
+    from app.services.ocr_sidecar import ocr_sidecar
+    from app.services.session_state import session_registry
+    from app.services.whisper_pool import whisper_pool
+
+    background = [asyncio.create_task(session_registry.run_sweeper()), asyncio.create_task(loop_monitor.run())]
+    if settings.context_buffer_backend == "postgres":
+        from app.services.context_manager import context_manager
+        from app.websocket.connection import broadcast_to_session
+
+        async def _relay(session_id: str, tokens: int) -> None:
+            # Token chip for sockets on this process when another process changed the buffer.
+            await broadcast_to_session(session_id, "context_update", {"tokens": tokens})
+
+        background.append(asyncio.create_task(context_manager.listen(_relay)))
+    if settings.stt_preload:
+        # Workers load + warm in their own processes; chunks arriving meanwhile wait for them.
+        whisper_pool.start()
+    if settings.easyocr_preload:
+        ocr_sidecar.start()
     yield
+    from app.workers.transcript_writer import transcript_writer
+
+    await transcript_writer.flush_all()  # don't lose the last write-behind window
+    for task in background:
+        task.cancel()
+    whisper_pool.stop()  # no-op unless started (preload or first raw-audio chunk)
+    ocr_sidecar.stop()  # likewise (preload or first offline OCR)
     logger.info("aura.shutdown")
 
 
@@ -84,6 +113,7 @@ def create_app() -> FastAPI:
         auth,
         batches,
         courses,
+        debug,
         departments,
         export,
         library,
@@ -109,6 +139,7 @@ def create_app() -> FastAPI:
     app.include_router(stats.router)
     app.include_router(library.router)
     app.include_router(live.router)
+    app.include_router(debug.router)
 
     return app
 
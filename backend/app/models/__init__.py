@@ -8,6 +8,7 @@ from app.models.enums import (
 from app.models.assignment import Assignment, AssignmentSubmission
 from app.models.batch import Batch
 from app.models.command import Command
+from app.models.context_buffer import ContextCounter, ContextItem
 from app.models.course import Course
 from app.models.department import Department
 from app.models.quiz import Quiz
@@ -15,6 +16,7 @@ from app.models.quiz_attempt import QuizAttempt
 from app.models.semester import Semester
 from app.models.semester_member import SemesterMember
 from app.models.session import Session
+from app.models.topic_term import TopicTerm
 from app.models.transcript import Transcript
 from app.models.unit import Unit
 from app.models.user import User
@@ -28,11 +30,14 @@ __all__ = [
     "SemesterMember",
     "Unit",
     "Session",
+    "TopicTerm",
     "Transcript",
     "WhiteboardLog",
     "Assignment",
     "AssignmentSubmission",
     "Command",
+    "ContextCounter",
+    "ContextItem",
     "Course",
     "Quiz",
     "QuizAttempt",
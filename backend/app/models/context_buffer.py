@@ -0,0 +1,40 @@
+"""Shared context buffer tables (CONTEXT_BUFFER_BACKEND=postgres).
+
+Lets several worker processes share one per-session compression window.
+`ContextCounter` holds the running token total, the per-session item sequence
+and the compression lease; `ContextItem` rows are the not-yet-compressed items,
+keyed by (session_id, seq) with no surrogate id to keep them compact.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ContextCounter(Base):
+    __tablename__ = "context_counters"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    seq: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ContextItem(Base):
+    __tablename__ = "context_items"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(8), nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    tokens: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,24 @@
+"""TopicTerm — rolling term frequencies for the topic word cloud.
+
+One row per (scope, scope_id, term), where scope is "session", "unit" or
+"course". Maintained incrementally as transcripts are persisted (see
+app.services.topic_index); higher levels sum their courses' rows.
+"""
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class TopicTerm(Base):
+    __tablename__ = "topic_terms"
+
+    scope: Mapped[str] = mapped_column(String(8), primary_key=True)
+    scope_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,14 +1,16 @@
 """WhiteboardLog model — one captured board snapshot + its OCR text.
 
-Image bytes are stored in Postgres (base64 text) at demo scale; swap to an
-object-store URL behind a storage interface if this ever needs to scale.
+Image bytes live in the blob store (app.services.blob_store); the row keeps
+only `image_key` (plus `thumb_keys` once its timeline thumbnails are built).
+`image_data` (base64 in Postgres) is legacy: rows written before the blob
+store keep it until scripts/migrate_board_images.py moves them.
 """
 from __future__ import annotations
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,13 +19,23 @@ from app.core.database import Base
 
 class WhiteboardLog(Base):
     __tablename__ = "whiteboard_logs"
+    __table_args__ = (Index("ix_whiteboard_logs_session_timeline", "session_id", "timestamp", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), index=True, nullable=False
     )
+    # Scene document: whole on keyframe rows; patch rows hold RFC 6902 ops from the
+    # previous row of the chain instead (app.services.board_scene).
     tldraw_snapshot: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
-    image_data: Mapped[str | None] = mapped_column(Text, nullable=True)  # base64 PNG
+    scene_patch: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    scene_key_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("whiteboard_logs.id", ondelete="CASCADE"), index=True, nullable=True
+    )
+    scene_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    image_key: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)  # blob_store key
+    thumb_keys: Mapped[dict | None] = mapped_column(JSONB(none_as_null=True), nullable=True)  # size name -> blob_store key
+    image_data: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)  # legacy base64 PNG
     ocr_text: Mapped[str] = mapped_column(Text, default="", nullable=False)
     page_number: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -11,13 +11,14 @@ from sqlalchemy.orm import Session as DBSession
 from app.core.access import accessible_batch_ids
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_admin
-from app.core.hierarchy import batch_session_ids
+from app.core.hierarchy import batch_course_ids, batch_session_ids
 from app.models.batch import Batch
 from app.models.command import Command
 from app.models.department import Department
 from app.models.user import User
 from app.schemas.batch import BatchCreate, BatchOut, BatchUpdate
 from app.routers.stats import aggregate_stats
+from app.services.topic_index import forget_courses, topics
 
 router = APIRouter(prefix="/batches", tags=["batches"])
 
@@ -131,6 +132,7 @@ def delete_batch(
     batch = db.get(Batch, batch_id)
     if batch is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Batch not found")
+    forget_courses(db, batch_course_ids(db, batch_id))
     db.delete(batch)  # cascades dept -> semester -> course -> unit -> session
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -142,3 +144,11 @@ def batch_stats(
 ) -> dict:
     _visible(batch_id, db, user)
     return aggregate_stats(db, batch_session_ids(db, batch_id))
+
+
+@router.get("/{batch_id}/topics")
+def batch_topics(
+    batch_id: uuid.UUID, db: DBSession = Depends(get_db), user: User = Depends(get_current_user)
+) -> dict:
+    _visible(batch_id, db, user)
+    return topics(db, "course", batch_course_ids(db, batch_id))
@@ -20,6 +20,7 @@ from app.models.user import User
 from app.schemas.course import CourseCreate, CourseOut, CourseUpdate
 from app.schemas.unit import UnitOut
 from app.routers.stats import aggregate_stats
+from app.services.topic_index import forget_courses, topics
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
@@ -166,6 +167,7 @@ def delete_course(
 ) -> Response:
     course = _course_or_404(course_id, db)
     assert_semester_access(db, user, course.semester_id, write=True)
+    forget_courses(db, [course_id])  # its sessions go by FK cascade
     db.delete(course)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -180,3 +182,14 @@ def course_stats(
     course = _course_or_404(course_id, db)
     assert_semester_access(db, user, course.semester_id)
     return aggregate_stats(db, course_session_ids(db, course_id))
+
+
+@router.get("/{course_id}/topics")
+def course_topics(
+    course_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    course = _course_or_404(course_id, db)
+    assert_semester_access(db, user, course.semester_id)
+    return topics(db, "course", [course_id])
@@ -0,0 +1,52 @@
+"""Operator introspection of in-process state (admin only)."""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import require_admin
+from app.core.loop_monitor import loop_monitor
+from app.models.user import User
+from app.services import vad
+from app.services.ocr_sidecar import ocr_sidecar
+from app.services.session_state import session_registry
+from app.services.whisper_pool import whisper_pool
+from app.workers.llm_worker import command_stats
+from app.workers.mirror_worker import mirror_stats
+from app.workers.thumbnail_worker import thumb_stats
+from app.workers.vision_worker import vision_stats
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/sessions")
+def live_sessions(_: User = Depends(require_admin)) -> dict:
+    """Live sessions held in this process and their estimated memory footprint."""
+    return session_registry.stats()
+
+
+@router.get("/stt")
+def stt_pool(_: User = Depends(require_admin)) -> dict:
+    """Whisper worker pool: readiness, queue, per-chunk queue wait and inference latency;
+    plus per-session VAD savings (share of received audio never sent to Whisper)."""
+    return {**whisper_pool.stats(), "vad": vad.savings()}
+
+
+@router.get("/vision")
+def vision(_: User = Depends(require_admin)) -> dict:
+    """Snapshot dedupe / OCR cache counters: OCR calls skipped and image bytes not stored;
+    plus the student board mirror (keyframes vs tile deltas, bytes sent vs source), the
+    timeline thumbnail queue and the EasyOCR sidecar (queue wait, inference, timeouts)."""
+    return {**vision_stats(), "mirror": mirror_stats(), "thumbs": thumb_stats(), "easyocr": ocr_sidecar.stats()}
+
+
+@router.get("/llm")
+def llm(_: User = Depends(require_admin)) -> dict:
+    """AI commands: DB time per command (its two units of work) against end-to-end latency."""
+    return command_stats()
+
+
+@router.get("/loop")
+def event_loop(_: User = Depends(require_admin)) -> dict:
+    """Event-loop lag (histogram + percentiles) and, with capture on, the code behind each
+    stall: blocking site, entry point (handler / worker) and its last stack."""
+    return loop_monitor.stats()
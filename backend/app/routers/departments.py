@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session as DBSession
 from app.core.access import accessible_batch_ids, accessible_department_ids, is_admin
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_admin
-from app.core.hierarchy import department_session_ids
+from app.core.hierarchy import department_course_ids, department_session_ids
 from app.models.batch import Batch
 from app.models.command import Command
 from app.models.course import Course
@@ -22,6 +22,7 @@ from app.models.session import Session
 from app.models.unit import Unit
 from app.models.user import User
 from app.routers.stats import aggregate_stats
+from app.services.topic_index import forget_courses, topics
 from app.schemas.department import DepartmentCreate, DepartmentOut, DepartmentUpdate, SemesterOut
 
 router = APIRouter(prefix="/departments", tags=["departments"])
@@ -176,6 +177,7 @@ def delete_department(
     department_id: uuid.UUID, db: DBSession = Depends(get_db), _: User = Depends(require_admin)
 ) -> Response:
     dept = _dept_or_404(department_id, db)
+    forget_courses(db, department_course_ids(db, department_id))
     db.delete(dept)  # cascades semesters -> courses -> ...
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -190,3 +192,14 @@ def department_stats(
     dept = _dept_or_404(department_id, db)
     _assert_dept_visible(db, user, dept)
     return aggregate_stats(db, department_session_ids(db, department_id))
+
+
+@router.get("/{department_id}/topics")
+def department_topics(
+    department_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    dept = _dept_or_404(department_id, db)
+    _assert_dept_visible(db, user, dept)
+    return topics(db, "course", department_course_ids(db, department_id))
@@ -5,9 +5,10 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as DBSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models.session import Session
 from app.models.transcript import Transcript
 from app.services.ai_service import ai_service
@@ -34,17 +35,24 @@ def resolve_live(join_code: str, db: DBSession = Depends(get_db)) -> dict:
 
 
 @router.post("/{join_code}/ask")
-async def ask_tutor(join_code: str, body: AskIn, db: DBSession = Depends(get_db)) -> dict:
+async def ask_tutor(join_code: str, body: AskIn, db: AsyncSession = Depends(get_async_db)) -> dict:
     """PUBLIC — a student asks Aura a follow-up grounded in this class's transcript."""
-    sess = db.scalar(select(Session).where(Session.join_code == join_code.upper()))
+    sess = (
+        await db.execute(
+            select(Session.id, Session.subject, Session.language).where(Session.join_code == join_code.upper())
+        )
+    ).first()
     if sess is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Session not found")
-    rows = db.scalars(
-        select(Transcript.text)
-        .where(Transcript.session_id == sess.id)
-        .order_by(Transcript.timestamp.desc())
-        .limit(40)
+    rows = (
+        await db.scalars(
+            select(Transcript.text)
+            .where(Transcript.session_id == sess.id)
+            .order_by(Transcript.timestamp.desc())
+            .limit(40)
+        )
     ).all()
+    await db.close()  # release the connection before the (slow) LLM call
     context = "\n".join(reversed(list(rows))) or f"This is a class about {sess.subject}."
     result = await ai_service.answer_question(context, body.question, language=sess.language)
     return {"answer": result.get("answer") or result.get("error") or "I'm not sure yet."}
@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session as DBSession
 from app.core.access import assert_semester_access, member_semester_ids
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_admin
-from app.core.hierarchy import course_session_ids, semester_session_ids
+from app.core.hierarchy import course_session_ids, semester_course_ids, semester_session_ids
 from app.models.batch import Batch
 from app.models.command import Command
 from app.models.course import Course
@@ -23,6 +23,7 @@ from app.models.user import User
 from app.schemas.course import CourseOut
 from app.schemas.department import DepartmentOut, SemesterOut
 from app.routers.stats import aggregate_stats
+from app.services.topic_index import forget_courses, topics
 
 router = APIRouter(prefix="/semesters", tags=["semesters"])
 
@@ -133,6 +134,7 @@ def delete_semester(
     semester_id: uuid.UUID, db: DBSession = Depends(get_db), _: User = Depends(require_admin)
 ) -> Response:
     sem = _sem_or_404(semester_id, db)
+    forget_courses(db, semester_course_ids(db, semester_id))
     db.delete(sem)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -147,3 +149,14 @@ def semester_stats(
     _sem_or_404(semester_id, db)
     assert_semester_access(db, user, semester_id)
     return aggregate_stats(db, semester_session_ids(db, semester_id))
+
+
+@router.get("/{semester_id}/topics")
+def semester_topics(
+    semester_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    _sem_or_404(semester_id, db)
+    assert_semester_access(db, user, semester_id)
+    return topics(db, "course", semester_course_ids(db, semester_id))
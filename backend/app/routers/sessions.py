@@ -1,12 +1,15 @@
 """Session lifecycle routes — access gated by batch membership (via the unit)."""
 from __future__ import annotations
 
+import base64
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session as DBSession
 
 from app.core.access import accessible_session_ids, assert_semester_access, semester_of_session, semester_of_unit
@@ -21,8 +24,14 @@ from app.models.session import Session
 from app.models.transcript import Transcript
 from app.models.unit import Unit
 from app.models.user import User
+from app.models.whiteboard import WhiteboardLog
 from app.schemas.session import SessionCreate, SessionOut, SessionUpdate
+from app.services.blob_store import blob_store, sniff_type
+from app.services.board_thumbs import SIZES as THUMB_SIZES
+from app.services.board_scene import materialize, scene_at
 from app.services.command_payload import response_type_for
+from app.services.session_state import session_registry
+from app.services.topic_index import attach_session, detach_session, forget_session, topics
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 logger = get_logger("aura.sessions")
@@ -47,6 +56,12 @@ def _write(session_id: uuid.UUID, db: DBSession, user: User) -> Session:
     return sess
 
 
+def _release(session_id: uuid.UUID) -> None:
+    """Release the session's in-process state on the event loop: sync routes run
+    in the threadpool, and the registry and its release hooks are loop-owned."""
+    from_thread.run_sync(session_registry.end_session, str(session_id))
+
+
 @router.post("", response_model=SessionOut, status_code=status.HTTP_201_CREATED)
 def create_session(
     body: SessionCreate,
@@ -88,6 +103,11 @@ def update_session(
         if db.get(Unit, body.unit_id) is None:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Unit not found")
         assert_semester_access(db, user, semester_of_unit(db, body.unit_id), write=True)
+        if sess.unit_id != body.unit_id:
+            # Move the session's word-cloud counts to the new unit/course rollups.
+            if sess.unit_id is not None:
+                detach_session(db, sess.id, sess.unit_id)
+            attach_session(db, sess.id, body.unit_id)
         sess.unit_id = body.unit_id
     if "language" in fields and body.language:
         sess.language = body.language
@@ -102,9 +122,11 @@ def delete_session(
     db: DBSession = Depends(get_db),
     user: User = Depends(require_staff),
 ) -> Response:
-    _write(session_id, db, user)  # 404 / access gate
-    db.delete(_session_or_404(session_id, db))
+    sess = _write(session_id, db, user)  # 404 / access gate
+    forget_session(db, sess.id, sess.unit_id)
+    db.delete(sess)
     db.commit()
+    _release(session_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -170,6 +192,17 @@ def session_history(
     }
 
 
+@router.get("/{session_id}/topics")
+def session_topics(
+    session_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    """Word cloud + top topics from the rolling term index."""
+    _read(session_id, db, user)
+    return topics(db, "session", [session_id])
+
+
 class StarUpdate(BaseModel):
     starred: bool
 
@@ -204,6 +237,7 @@ def end_session(
         sess.end_time = datetime.now(timezone.utc)
         db.commit()
         db.refresh(sess)
+    _release(sess.id)
     logger.info("session.end", session_id=str(sess.id))
     return SessionOut.model_validate(sess)
 
@@ -285,3 +319,146 @@ def session_report(
         "quizzes": quizzes,
         "stats": {"commands": commands or 0, "transcripts": transcripts or 0},
     }
+
+
+_IMAGE_CACHE = "private, max-age=31536000, immutable"  # content-addressed: never changes
+_PREVIEW_CHARS = 160
+
+
+def _cursor(ts: datetime, log_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{ts.isoformat()}|{log_id}".encode()).decode()
+
+
+def _uncursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        ts, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(ts), uuid.UUID(log_id)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, "Invalid cursor") from exc
+
+
+@router.get("/{session_id}/whiteboard/timeline")
+def whiteboard_timeline(
+    session_id: uuid.UUID,
+    page: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    """Board history, oldest first: snapshot metadata + thumbnail links, no image bytes.
+    Pass `nextCursor` back as `cursor` for the next page of results."""
+    _read(session_id, db, user)
+    q = select(
+        WhiteboardLog.id,
+        WhiteboardLog.timestamp,
+        WhiteboardLog.page_number,
+        WhiteboardLog.image_key,
+        WhiteboardLog.thumb_keys,
+        func.left(WhiteboardLog.ocr_text, _PREVIEW_CHARS).label("preview"),
+    ).where(WhiteboardLog.session_id == session_id)
+    if page is not None:
+        q = q.where(WhiteboardLog.page_number == page)
+    if cursor:
+        q = q.where(tuple_(WhiteboardLog.timestamp, WhiteboardLog.id) > _uncursor(cursor))
+    rows = db.execute(q.order_by(WhiteboardLog.timestamp, WhiteboardLog.id).limit(limit + 1)).all()
+    base = f"/sessions/{session_id}/whiteboard"
+    items = [
+        {
+            "id": str(r.id),
+            "timestamp": r.timestamp.isoformat(),
+            "page": r.page_number,
+            "ocrPreview": r.preview,
+            "hash": r.image_key,
+            "image": f"{base}/{r.id}/image",
+            "thumbs": {size: f"{base}/{r.id}/thumb/{size}" for size in (r.thumb_keys or {})},
+        }
+        for r in rows[:limit]
+    ]
+    last = rows[limit - 1] if len(rows) > limit else None
+    return {
+        "items": items,
+        "nextCursor": _cursor(last.timestamp, last.id) if last else None,
+        "thumbSizes": THUMB_SIZES,
+    }
+
+
+@router.get("/{session_id}/whiteboard/scene")
+def whiteboard_scene_at(
+    session_id: uuid.UUID,
+    page: int = 1,
+    at: datetime | None = None,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    """The board's scene document as of `at` (default: now) on `page` — board replay."""
+    _read(session_id, db, user)
+    log_id = scene_at(db, session_id, page, at)
+    if log_id is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "No board scene at that time")
+    return {"logId": str(log_id), "scene": materialize(db, log_id)}
+
+
+@router.get("/{session_id}/whiteboard/{log_id}/scene")
+def whiteboard_scene(
+    session_id: uuid.UUID,
+    log_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    """One snapshot's scene document, rebuilt from its keyframe + patches."""
+    _read(session_id, db, user)
+    owner = db.scalar(select(WhiteboardLog.session_id).where(WhiteboardLog.id == log_id))
+    if owner != session_id:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Snapshot not found")
+    return {"logId": str(log_id), "scene": materialize(db, log_id)}
+
+
+@router.get("/{session_id}/whiteboard/{log_id}/thumb/{size}", response_class=Response)
+def whiteboard_thumb(
+    session_id: uuid.UUID,
+    log_id: uuid.UUID,
+    size: str,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """One timeline thumbnail (`size` in `thumbSizes`), streamed from the blob store."""
+    _read(session_id, db, user)
+    keys = db.scalar(
+        select(WhiteboardLog.thumb_keys).where(WhiteboardLog.id == log_id, WhiteboardLog.session_id == session_id)
+    )
+    path = blob_store.path(keys[size]) if keys and size in keys else None
+    if path is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Thumbnail not found")
+    with path.open("rb") as fh:
+        media_type = sniff_type(fh.read(16))
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": _IMAGE_CACHE})
+
+
+@router.get("/{session_id}/whiteboard/{log_id}/image", response_class=Response)
+def whiteboard_image(
+    session_id: uuid.UUID,
+    log_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """A board snapshot's image, streamed from the blob store (Range requests supported)."""
+    _read(session_id, db, user)
+    row = db.execute(
+        select(WhiteboardLog.image_key, WhiteboardLog.image_data).where(
+            WhiteboardLog.id == log_id, WhiteboardLog.session_id == session_id
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Snapshot not found")
+    if row.image_key:
+        path = blob_store.path(row.image_key)
+        if path is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Snapshot image missing")
+        with path.open("rb") as fh:
+            media_type = sniff_type(fh.read(16))
+        return FileResponse(path, media_type=media_type, headers={"Cache-Control": _IMAGE_CACHE})
+    if row.image_data:  # not yet moved out of Postgres
+        data = base64.b64decode(row.image_data)
+        return Response(data, media_type=sniff_type(data[:16]), headers={"Cache-Control": _IMAGE_CACHE})
+    raise HTTPException(status.HTTP_404_NOT_FOUND, "Snapshot has no image")
@@ -14,6 +14,7 @@ from app.models.quiz_attempt import QuizAttempt
 from app.models.session import Session
 from app.models.transcript import Transcript
 from app.models.user import User
+from app.services.topic_index import topics
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
@@ -182,6 +183,12 @@ def deep(db: DBSession = Depends(get_db), user: User = Depends(get_current_user)
     }
 
 
+@router.get("/topics")
+def topic_cloud(db: DBSession = Depends(get_db), user: User = Depends(get_current_user)) -> dict:
+    """Topic word cloud across everything the user can see (precomputed counts)."""
+    return topics(db, "session", accessible_session_ids(db, user))
+
+
 # ---- reusable scoped aggregator (unit / course / batch stats) ----
 def aggregate_stats(db: DBSession, session_ids: list) -> dict:
     """Compute a stats payload for an arbitrary set of session ids (any hierarchy
@@ -18,6 +18,7 @@ from app.models.user import User
 from app.schemas.session import SessionOut
 from app.schemas.unit import UnitCreate, UnitOut, UnitUpdate
 from app.routers.stats import aggregate_stats
+from app.services.topic_index import forget_unit, topics
 
 router = APIRouter(prefix="/units", tags=["units"])
 
@@ -101,6 +102,7 @@ def delete_unit(
 ) -> Response:
     unit = _unit_or_404(unit_id, db)
     assert_semester_access(db, user, semester_of_unit(db, unit_id), write=True)
+    forget_unit(db, unit_id)  # its sessions go by FK cascade
     db.delete(unit)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -115,3 +117,14 @@ def unit_stats(
     _unit_or_404(unit_id, db)
     assert_semester_access(db, user, semester_of_unit(db, unit_id))
     return aggregate_stats(db, unit_session_ids(db, unit_id))
+
+
+@router.get("/{unit_id}/topics")
+def unit_topics(
+    unit_id: uuid.UUID,
+    db: DBSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    _unit_or_404(unit_id, db)
+    assert_semester_access(db, user, semester_of_unit(db, unit_id))
+    return topics(db, "unit", [unit_id])
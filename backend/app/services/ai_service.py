@@ -9,6 +9,7 @@ from __future__ import annotations
 import asyncio
 import contextvars
 import json
+import re
 from typing import Any
 from urllib.parse import quote
 
@@ -17,6 +18,7 @@ import httpx
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.models.enums import CommandIntent
+from app.services.keyphrases import extract_keyphrases
 
 logger = get_logger("aura.ai")
 
@@ -527,8 +529,6 @@ class AIService:
         """Best-effort cleanup of LLM Mermaid: strip fences/prose, canonicalize the
         header, and auto-quote rectangle/rhombus labels that contain chars which
         commonly break the parser. The frontend still validates before rendering."""
-        import re
-
         s = src.strip()
         s = re.sub(r"^```(?:mermaid)?\s*", "", s)
         s = re.sub(r"\s*```$", "", s).strip()
@@ -634,7 +634,7 @@ class AIService:
         return await self._generate_json("fast", system, user)
 
     async def compress_context(self, buffer_text: str) -> dict[str, Any]:
-        """Compress a lecture buffer into a structured summary segment."""
+        """Compress a lecture buffer chunk into a structured summary segment."""
         system = (
             "Compress this lecture buffer into a structured JSON summary that preserves "
             "continuity for later questions. Respond with ONLY JSON: "
@@ -645,19 +645,26 @@ class AIService:
         if "topicFlow" in data:
             return data
         # Extractive fallback so compression always produces something usable.
-        words: list[str] = []
-        for w in buffer_text.split():
-            if w.lower() not in words:
-                words.append(w.lower())
-            if len(words) >= 12:
-                break
+        plain = re.sub(r"(?m)^\[\w+\]\s*", "", buffer_text)  # drop [speech]/[board] tags
         return {
-            "topicFlow": words,
+            "topicFlow": extract_keyphrases(plain, k=12),
             "keyConcepts": {},
             "visualReferences": [],
             "dependencies": [],
             "_fallback": True,
         }
 
+    async def merge_summaries(self, older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+        """Fold two consecutive summaries into one higher-level summary of the same
+        shape. Returns an error payload on failure; the caller falls back to a
+        structural merge."""
+        system = (
+            "Merge two consecutive lecture summaries (older first) into ONE concise summary "
+            "covering both, keeping the most important topics and concepts. Respond with "
+            'ONLY JSON: {"topicFlow": [str], "keyConcepts": {concept: definition}, '
+            '"visualReferences": [str], "dependencies": [str]}.'
+        )
+        user = f"Older:\n{json.dumps(older)}\n\nNewer:\n{json.dumps(newer)}"
+        return await self._generate_json("fast", system, user[:8000])
 
 ai_service = AIService()
@@ -0,0 +1,152 @@
+"""Per-session streaming transcription state (rolling buffer + local agreement).
+
+Speech audio accumulates in a rolling 16 kHz buffer that is re-transcribed (with
+word timestamps) as chunks arrive. A word is committed once two consecutive
+hypotheses agree on it (the longest common word prefix); the rest of the newest
+hypothesis is an interim partial. After a commit the buffer is cut back to
+`overlap_s` before the last committed word, so the next pass still hears the
+boundary but only words ending after it are considered new. A silent chunk ends
+the utterance and commits whatever is pending; a buffer that grows past
+`max_buffer_s` without agreement is force-committed.
+
+The buffer is preallocated once per stream in shared memory: chunks are copied
+into its tail, trims shift it in place, and a pass hands the Whisper worker a
+`SharedAudio` window (segment name + sample range) instead of pickling samples.
+"""
+from __future__ import annotations
+
+import re
+from multiprocessing import shared_memory
+from typing import Any
+
+from app.services.whisper_pool import SharedAudio
+
+try:
+    import numpy as np
+except ImportError:  # streaming needs NumPy; callers fall back to per-chunk mode
+    np = None
+
+RATE = 16000
+_HEADROOM_S = 10.0  # buffer capacity beyond max_buffer_s, for chunks landing mid-pass
+_EPS = 0.05  # seconds; word-end jitter tolerated between passes
+_NORM = re.compile(r"[^\w']+")
+
+# Session.language holds display names ("English"); Whisper wants ISO 639-1.
+_LANGUAGE_CODES = {
+    "english": "en", "hindi": "hi", "spanish": "es", "french": "fr", "german": "de",
+    "italian": "it", "portuguese": "pt", "russian": "ru", "chinese": "zh", "japanese": "ja",
+    "korean": "ko", "arabic": "ar", "bengali": "bn", "tamil": "ta", "telugu": "te",
+    "marathi": "mr", "gujarati": "gu", "kannada": "kn", "malayalam": "ml", "punjabi": "pa",
+    "urdu": "ur", "turkish": "tr", "dutch": "nl", "indonesian": "id", "vietnamese": "vi",
+}
+
+Word = tuple[float, float, str]  # (start_s, end_s, text), stream-absolute times
+
+
+def whisper_language(name: str | None) -> str | None:
+    """Session language -> Whisper code; None (auto-detect) when unknown."""
+    key = (name or "").strip().lower()
+    if len(key) == 2 and key.isalpha():
+        return key
+    return _LANGUAGE_CODES.get(key)
+
+
+def _norm(word: str) -> str:
+    return _NORM.sub("", word.lower())
+
+
+def _text(words: list[Word]) -> str:
+    return " ".join(w for _, _, w in words).strip()
+
+
+class AsrStream:
+    __slots__ = (
+        "language", "offset", "committed_until", "pending", "inbox", "running", "overlap_s", "max_buffer_s",
+        "_shm", "_buf", "_end",
+    )
+
+    def __init__(
+        self, language: str | None, overlap_s: float = 1.0, max_buffer_s: float = 20.0, shared: bool = True
+    ) -> None:
+        self.language = language
+        self.offset = 0.0  # stream time of the first buffered sample
+        self.committed_until = 0.0
+        self.pending: list[Word] = []  # uncommitted tail of the last hypothesis
+        self.inbox: list[Any] = []  # chunks (or None = silence) waiting for the runner
+        self.running = False
+        self.overlap_s = overlap_s
+        self.max_buffer_s = max_buffer_s
+        capacity = int((max_buffer_s + _HEADROOM_S) * RATE)
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity * 4) if shared else None
+        self._buf = np.ndarray((capacity,), dtype=np.float32, buffer=self._shm.buf if shared else None)
+        self._end = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._buf.nbytes)
+
+    @property
+    def buffered_s(self) -> float:
+        return self._end / RATE
+
+    @property
+    def audio(self) -> Any:
+        """View of the buffered samples (no copy)."""
+        return self._buf[: self._end]
+
+    def window(self) -> Any:
+        """What to hand the Whisper pool for the buffered audio."""
+        return SharedAudio(self._shm.name, 0, self._end) if self._shm else self.audio
+
+    def append(self, samples: Any) -> None:
+        samples = samples[-len(self._buf) :]
+        overflow = self._end + len(samples) - len(self._buf)
+        if overflow > 0:  # only if passes fall far behind: oldest audio goes
+            self._trim(self.offset + overflow / RATE)
+        self._buf[self._end : self._end + len(samples)] = samples
+        self._end += len(samples)
+
+    def advance(self, words: list[tuple[float, float, str]]) -> tuple[str, str]:
+        """Fold a hypothesis for the current buffer (buffer-relative word times).
+        Returns (newly committed text, interim partial text)."""
+        hyp = [
+            (self.offset + s, self.offset + e, w.strip())
+            for s, e, w in words
+            if w.strip() and self.offset + e > self.committed_until + _EPS
+        ]
+        n = 0
+        while n < min(len(hyp), len(self.pending)) and _norm(hyp[n][2]) == _norm(self.pending[n][2]):
+            n += 1
+        if self.buffered_s >= self.max_buffer_s:
+            n = len(hyp)  # no agreement in a long window: take it as final
+        stable, self.pending = hyp[:n], hyp[n:]
+        if stable:
+            self.committed_until = stable[-1][1]
+            self._trim(self.committed_until - self.overlap_s)
+        elif self.buffered_s >= self.max_buffer_s:
+            self._trim(self.offset + self.buffered_s - self.overlap_s)
+        return _text(stable), _text(self.pending)
+
+    def end_utterance(self) -> str:
+        """Silence: commit the pending hypothesis and start a fresh buffer."""
+        text = _text(self.pending)
+        self.offset += self.buffered_s
+        self.committed_until = self.offset
+        self._end = 0
+        self.pending = []
+        return text
+
+    def close(self) -> None:
+        """Free the shared segment (the stream is unusable afterwards)."""
+        self._buf = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _trim(self, until: float) -> None:
+        cut = min(round((until - self.offset) * RATE), self._end)
+        if cut > 0:
+            self._buf[: self._end - cut] = self._buf[cut : self._end]  # in-place shift
+            self._end -= cut
+            self.offset += cut / RATE
@@ -0,0 +1,72 @@
+"""Decoders for binary `audio_chunk` payloads (16-bit PCM and Opus packets).
+
+PCM is viewed in place over the received bytes (`np.frombuffer`) and scaled to
+float32 in a single pass — the only copy between the socket and the ASR buffer.
+Opus needs `opuslib` (libopus); a decoder is stateful, so one is kept per session
+and decodes straight to 16 kHz mono.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from app.core.logging import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # binary audio needs NumPy; ships with faster-whisper
+    np = None
+
+logger = get_logger("aura.stt.codec")
+
+OPUS_RATE = 16000
+_OPUS_MAX_FRAME = OPUS_RATE * 120 // 1000  # longest Opus frame (120 ms), in samples
+PCM_RATES = frozenset({8000, 16000, 22050, 24000, 44100, 48000})  # accepted `sampleRate`s
+
+
+def pcm_rate(value: Any) -> int | None:
+    """Client-sent PCM sample rate (16 kHz when absent); None if not an accepted rate."""
+    if value is None:
+        return 16000
+    try:
+        rate = int(value)
+    except (TypeError, ValueError):
+        return None
+    return rate if rate in PCM_RATES else None
+
+
+def binary_audio_available() -> bool:
+    return np is not None
+
+
+def pcm16_to_float32(payload: bytes | memoryview) -> Any:
+    """Little-endian int16 PCM -> float32 in [-1, 1]."""
+    pcm = np.frombuffer(payload, dtype="<i2", count=len(payload) // 2)
+    return np.multiply(pcm, 1 / 32768, dtype=np.float32)
+
+
+def opus_available() -> bool:
+    if np is None:
+        return False
+    try:
+        import opuslib  # type: ignore  # noqa: F401
+    except Exception:  # ImportError, or libopus missing at load time
+        return False
+    return True
+
+
+class OpusDecoder:
+    """Stateful per-session decoder: Opus packets -> float32 samples at 16 kHz."""
+
+    def __init__(self) -> None:
+        import opuslib  # type: ignore
+
+        self._dec = opuslib.Decoder(OPUS_RATE, 1)
+
+    def decode(self, packets: list[bytes]) -> Any:
+        pcm = bytearray()
+        for packet in packets:
+            try:
+                pcm += self._dec.decode(bytes(packet), _OPUS_MAX_FRAME)
+            except Exception as exc:  # noqa: BLE001 — one corrupt packet shouldn't drop the chunk
+                logger.warning("stt.opus_packet_failed", error=str(exc))
+        return pcm16_to_float32(pcm)
@@ -0,0 +1,103 @@
+"""Content-addressed blob storage for whiteboard images (raw bytes, not base64).
+
+A blob's key is the SHA-256 of its bytes, so an image is stored once however
+many snapshot rows point at it; rows keep only the key. `LocalBlobStore` lays
+blobs out as `<root>/ab/cd/<key>` and writes them atomically (temp file +
+rename), so a reader never sees a partial blob. Serving goes through the file
+path (`path`), which lets the HTTP layer stream from disk with Range support.
+
+Another backend (S3, GCS…) only has to implement the `BlobStore` protocol.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Protocol
+
+from app.core.config import settings
+
+_MAGIC = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+)
+
+
+def blob_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sniff_type(head: bytes) -> str:
+    """Media type from the first bytes of an image."""
+    for magic, mime in _MAGIC:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class BlobStore(Protocol):
+    def put(self, data: bytes) -> str: ...
+    def path(self, key: str) -> Path | None: ...
+    def exists(self, key: str) -> bool: ...
+    def delete(self, key: str) -> None: ...
+    def keys(self) -> Iterator[str]: ...
+
+
+class LocalBlobStore:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _file(self, key: str) -> Path:
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"not a blob key: {key!r}")
+        return self.root / key[:2] / key[2:4] / key
+
+    def put(self, data: bytes) -> str:
+        """Store `data` (no-op if already present); returns its key."""
+        key = blob_key(data)
+        dest = self._file(key)
+        if dest.exists():
+            return key
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, dest)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return key
+
+    def path(self, key: str) -> Path | None:
+        try:
+            p = self._file(key)
+        except ValueError:
+            return None
+        return p if p.is_file() else None
+
+    def exists(self, key: str) -> bool:
+        return self.path(key) is not None
+
+    def get(self, key: str) -> bytes | None:
+        p = self.path(key)
+        return p.read_bytes() if p else None
+
+    def delete(self, key: str) -> None:
+        p = self.path(key)
+        if p is not None:
+            p.unlink(missing_ok=True)
+
+    def keys(self) -> Iterator[str]:
+        if not self.root.is_dir():
+            return
+        for p in self.root.glob("??/??/*"):
+            if not p.name.startswith(".tmp-"):
+                yield p.name
+
+
+blob_store = LocalBlobStore(settings.blob_store_dir)
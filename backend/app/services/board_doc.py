@@ -0,0 +1,176 @@
+"""Board text straight from the scene document (`canvas_snapshot.tldrawState`).
+
+Text the teacher typed or dropped on the board (text shapes, sticky notes,
+labels on geo shapes, Aura text cards) is already structured data in the
+scene, so it is read here instead of being OCR'd off the PNG. Two document
+shapes are understood:
+
+- tldraw: a store snapshot (`{store: {id: record}}`, `{document: {store}}` or
+  `{records: [...]}`); `shape` records with `props.text` / `props.richText`,
+  positioned relative to their parent, grouped by `page` records (page order =
+  their `index`).
+- Excalidraw (what the web client sends): `{format: "excalidraw", elements,
+  exportPadding}`; one page, `text` elements (including container labels).
+
+Besides the texts, `extract` keeps the scene bounds so a text box can be mapped
+onto the exported PNG (the export is the bounds plus padding, scaled to the
+image): the vision worker blanks those boxes so OCR only sees freehand ink.
+"""
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+Rect = tuple[int, int, int, int]
+
+_PADDING = {"tldraw": 32, "excalidraw": 10}  # library default export padding (scene units)
+_MASK_MARGIN = 4  # px around a blanked text box
+_TEXT_LINE = 36.0  # scene units per line when a text shape carries no height
+
+
+class BoardText(NamedTuple):
+    text: str
+    x: float
+    y: float
+    w: float
+    h: float
+
+
+class BoardDoc:
+    """Texts of one board page plus what is needed to place them on its PNG."""
+
+    __slots__ = ("texts", "bounds", "padding")
+
+    def __init__(self, texts: list[BoardText], bounds: tuple[float, float, float, float] | None, padding: float) -> None:
+        self.texts = texts
+        self.bounds = bounds  # scene-space bounds of everything exported
+        self.padding = padding
+
+    def pixel_rect(self, t: BoardText, size: tuple[int, int]) -> Rect | None:
+        """`t`'s box on an exported image of `size`, or None if it can't be placed."""
+        if self.bounds is None:
+            return None
+        x0, y0, x1, y1 = self.bounds
+        span = x1 - x0 + 2 * self.padding
+        if span <= 0:
+            return None
+        scale = size[0] / span
+        return (
+            max(0, int((t.x - x0 + self.padding) * scale) - _MASK_MARGIN),
+            max(0, int((t.y - y0 + self.padding) * scale) - _MASK_MARGIN),
+            min(size[0], int((t.x + t.w - x0 + self.padding) * scale) + _MASK_MARGIN + 1),
+            min(size[1], int((t.y + t.h - y0 + self.padding) * scale) + _MASK_MARGIN + 1),
+        )
+
+    def pixel_rects(self, size: tuple[int, int]) -> list[Rect]:
+        rects = (self.pixel_rect(t, size) for t in self.texts)
+        return [r for r in rects if r is not None]
+
+    def regions(self, size: tuple[int, int] | None) -> list[tuple[Rect, str]] | None:
+        """Texts as layout regions on the image, or None if they can't all be placed."""
+        if size is None or self.bounds is None:
+            return None
+        return [(self.pixel_rect(t, size), t.text) for t in self.texts]
+
+
+def _rich_text(node: Any) -> str:
+    """Plain text of a tldraw richText (TipTap) document: paragraphs on lines."""
+    if not isinstance(node, dict):
+        return ""
+    if node.get("type") == "text":
+        return str(node.get("text") or "")
+    parts = [_rich_text(child) for child in node.get("content") or []]
+    sep = "\n" if node.get("type") == "doc" else ""
+    return sep.join(parts)
+
+
+def _num(v: Any, default: float = 0.0) -> float:
+    return float(v) if isinstance(v, (int, float)) else default
+
+
+def _box(x: float, y: float, w: float, h: float, bounds: list[float] | None) -> list[float]:
+    if bounds is None:
+        return [x, y, x + w, y + h]
+    return [min(bounds[0], x), min(bounds[1], y), max(bounds[2], x + w), max(bounds[3], y + h)]
+
+
+def _points_box(x: float, y: float, points: list) -> tuple[float, float, float, float]:
+    xs = [_num(p[0] if isinstance(p, list) else p.get("x")) for p in points if isinstance(p, (list, dict))]
+    ys = [_num(p[1] if isinstance(p, list) else p.get("y")) for p in points if isinstance(p, (list, dict))]
+    if not xs:
+        return x, y, 0.0, 0.0
+    return x + min(xs), y + min(ys), max(xs) - min(xs), max(ys) - min(ys)
+
+
+def _excalidraw(doc: dict) -> BoardDoc:
+    texts: list[BoardText] = []
+    bounds: list[float] | None = None
+    for el in doc.get("elements") or []:
+        if not isinstance(el, dict) or el.get("isDeleted"):
+            continue
+        x, y = _num(el.get("x")), _num(el.get("y"))
+        w, h = _num(el.get("width")), _num(el.get("height"))
+        if isinstance(el.get("points"), list):  # freedraw / line / arrow
+            x, y, w, h = _points_box(x, y, el["points"])
+        bounds = _box(x, y, w, h, bounds)
+        text = str(el.get("originalText") or el.get("text") or "").strip() if el.get("type") == "text" else ""
+        if text:
+            texts.append(BoardText(text, x, y, w, h))
+    return BoardDoc(texts, tuple(bounds) if bounds else None, _num(doc.get("exportPadding"), _PADDING["excalidraw"]))
+
+
+def _tldraw_records(doc: dict) -> list[dict]:
+    store = doc.get("store")
+    if store is None and isinstance(doc.get("document"), dict):
+        store = doc["document"].get("store")
+    if isinstance(store, dict):
+        return [r for r in store.values() if isinstance(r, dict)]
+    return [r for r in doc.get("records") or [] if isinstance(r, dict)]
+
+
+def _tldraw(doc: dict, page_number: int) -> BoardDoc:
+    records = _tldraw_records(doc)
+    pages = sorted((r for r in records if r.get("typeName") == "page"), key=lambda r: str(r.get("index") or ""))
+    shapes = {r["id"]: r for r in records if r.get("typeName") == "shape" and "id" in r}
+    page_id = pages[page_number - 1]["id"] if 0 < page_number <= len(pages) else None
+
+    def placed(shape: dict) -> tuple[str | None, float, float]:
+        """(page id, page-space x, y): parents are pages or shapes (frames/groups)."""
+        x, y, parent, hops = _num(shape.get("x")), _num(shape.get("y")), shape.get("parentId"), 0
+        while parent in shapes and hops < 32:
+            x, y = x + _num(shapes[parent].get("x")), y + _num(shapes[parent].get("y"))
+            parent, hops = shapes[parent].get("parentId"), hops + 1
+        return parent, x, y
+
+    texts: list[BoardText] = []
+    bounds: list[float] | None = None
+    for shape in shapes.values():
+        page, x, y = placed(shape)
+        if page_id is not None and page != page_id:
+            continue
+        props = shape.get("props") if isinstance(shape.get("props"), dict) else {}
+        scale = _num(props.get("scale"), 1.0)
+        text = str(props.get("text") or "").strip() or _rich_text(props.get("richText")).strip()
+        if isinstance(props.get("segments"), list):  # draw / highlight
+            points = [p for seg in props["segments"] if isinstance(seg, dict) for p in seg.get("points") or []]
+            bx, by, w, h = _points_box(x, y, points)
+        else:
+            bx, by = x, y
+            w = _num(props.get("w"), 200.0) * scale
+            h = _num(props.get("h"), 200.0 if shape.get("type") == "note" else 0.0) * scale
+            if not h and text:
+                h = _TEXT_LINE * (text.count("\n") + 1) * scale
+        bounds = _box(bx, by, w, h, bounds)
+        if text:
+            texts.append(BoardText(text, bx, by, w, h))
+    return BoardDoc(texts, tuple(bounds) if bounds else None, _num(doc.get("exportPadding"), _PADDING["tldraw"]))
+
+
+def extract(doc: dict | None, page_number: int = 1) -> BoardDoc | None:
+    """Texts on page `page_number` of a scene document; None if it isn't one."""
+    if not isinstance(doc, dict):
+        return None
+    if doc.get("format") == "excalidraw" or isinstance(doc.get("elements"), list):
+        return _excalidraw(doc)
+    if _tldraw_records(doc):
+        return _tldraw(doc, page_number)
+    return None
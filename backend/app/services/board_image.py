@@ -0,0 +1,84 @@
+"""Whiteboard snapshot fingerprints: perceptual dHash (NumPy + Pillow) and SHA-256.
+
+dHash: the board is grayscaled, box-downsampled to (size+1) x size, and each
+bit records whether a cell is brighter than its right neighbour. Re-encoding
+and anti-aliasing noise leave it unchanged; new ink darkens a cell and flips a
+bit. Without Pillow/NumPy the fingerprint falls back to the SHA-256 of the
+bytes (exact matches only).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+from collections import OrderedDict
+from typing import Any
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # optional image stack; exact-hash dedupe still works
+    np = None
+    Image = None
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def dhash(data: bytes, size: int = 16) -> int | None:
+    """size*size-bit difference hash of an encoded image, or None if unavailable."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            small = img.convert("L").resize((size + 1, size), Image.Resampling.BOX)
+    except Exception:  # noqa: BLE001 — undecodable image: no perceptual hash
+        return None
+    px = np.asarray(small, dtype=np.int16)
+    bits = (px[:, :-1] > px[:, 1:]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def fingerprint(data: bytes, size: int = 16) -> str:
+    """Perceptual dedupe key: "d:<dhash hex>" when possible, else "s:<sha256>"."""
+    h = dhash(data, size)
+    return f"d:{h:0{size * size // 4}x}" if h is not None else f"s:{content_hash(data)}"
+
+
+def same_board(a: str | None, b: str, threshold: int = 0) -> bool:
+    """Whether two fingerprints describe the same board (dHash within `threshold` bits)."""
+    if a is None or a[:2] != b[:2]:
+        return False
+    if a.startswith("s:"):
+        return a == b
+    return bin(int(a[2:], 16) ^ int(b[2:], 16)).count("1") <= threshold
+
+
+class OcrCache:
+    """Bounded LRU of OCR results keyed by exact content hash (repeated pages).
+
+    `nbytes` is the sum of the sizes given to `put` for the entries kept."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.nbytes = 0
+        self._items: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: str, value: Any, nbytes: int = 0) -> None:
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._items[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while len(self._items) > self.max_entries:
+            self.nbytes -= self._items.popitem(last=False)[1][1]
+
+    def __len__(self) -> int:
+        return len(self._items)
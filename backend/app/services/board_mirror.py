@@ -0,0 +1,157 @@
+"""Student-grade board frames: downscaled, encoded once per snapshot, tile deltas.
+
+Each snapshot is encoded once per quality tier, and that one payload goes to
+every viewer in the tier's room:
+
+- "high": long side up to 1600 px, WebP q80;
+- "low": long side up to 800 px, WebP q50 (for phones on weak links).
+
+JPEG is used when Pillow lacks WebP. After the first frame, a tier sends only
+the 128 px tiles that changed since its previous frame (`key: false`, `base` =
+the seq the tiles apply to). A full keyframe goes out when the frame size
+changes, when more than `_DELTA_MAX_SHARE` of the tiles changed, or every
+`_KEY_EVERY` frames. A viewer that joins late or misses a frame asks for
+`keyframe(tier)`: the current frame is encoded once and cached for everyone
+else who asks before the next snapshot.
+
+CPU-bound: `encode` and `keyframe` run in a worker thread.
+"""
+from __future__ import annotations
+
+import base64
+import io
+from typing import Any
+
+try:
+    import numpy as np
+    from PIL import Image, features
+except ImportError:  # optional image stack: callers mirror the original image
+    np = None
+    Image = None
+
+TIERS: dict[str, tuple[int, int]] = {"high": (1600, 80), "low": (800, 50)}  # max side px, quality
+DEFAULT_TIER = "high"
+_TILE = 128
+_PIXEL_DELTA = 24
+_DELTA_MAX_SHARE = 0.4
+_KEY_EVERY = 30
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def tier_of(value: Any) -> str:
+    return value if value in TIERS else DEFAULT_TIER
+
+
+def _fmt() -> tuple[str, str]:
+    return ("WEBP", "image/webp") if features.check("webp") else ("JPEG", "image/jpeg")
+
+
+def _encode(img: Any, quality: int) -> str:
+    fmt, mime = _fmt()
+    buf = io.BytesIO()
+    if fmt == "WEBP":
+        img.save(buf, fmt, quality=quality, method=4)
+    else:
+        img.save(buf, fmt, quality=quality)
+    return f"data:{mime};base64,{base64.b64encode(buf.getvalue()).decode()}"
+
+
+class _Frame:
+    __slots__ = ("seq", "px", "since_key", "key")
+
+    def __init__(self, seq: int, px: Any) -> None:
+        self.seq = seq  # snapshot this frame shows (a tier skips unchanged ones)
+        self.px = px  # RGB uint8 array of the last frame at tier resolution
+        self.since_key = 0
+        self.key: dict | None = None  # cached keyframe payload of `px`
+
+
+class MirrorState:
+    """Per-session mirror: sequence number and the last frame of each tier."""
+
+    __slots__ = ("seq", "frames")
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.frames: dict[str, _Frame] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(f.px.nbytes) for f in self.frames.values())
+
+
+def _scaled(src: Any, max_side: int) -> Any:
+    if max(src.size) <= max_side:
+        return src
+    img = src.copy()
+    img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return img
+
+
+def _key_payload(seq: int, img: Any, quality: int) -> dict:
+    return {"seq": seq, "key": True, "width": img.width, "height": img.height, "image": _encode(img, quality)}
+
+
+def _changed_tiles(prev: Any, cur: Any) -> list[tuple[int, int]]:
+    h, w = cur.shape[:2]
+    diff = (np.abs(cur.astype(np.int16) - prev.astype(np.int16)).max(axis=2) > _PIXEL_DELTA)
+    return [
+        (x, y)
+        for y in range(0, h, _TILE)
+        for x in range(0, w, _TILE)
+        if diff[y : y + _TILE, x : x + _TILE].any()
+    ]
+
+
+def encode(state: MirrorState, data: bytes) -> dict[str, dict] | None:
+    """Payload per tier for a new snapshot (None if it can't be decoded, {}
+    if nothing visible changed). Advances `state`."""
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            src = src.convert("RGB")
+    except Exception:  # noqa: BLE001
+        return None
+    seq = state.seq + 1
+    out: dict[str, dict] = {}
+    for tier, (max_side, quality) in TIERS.items():
+        img = _scaled(src, max_side)
+        px = np.asarray(img, dtype=np.uint8)
+        prev = state.frames.get(tier)
+        frame = _Frame(seq, px)
+        h, w = px.shape[:2]
+        if prev is not None and prev.px.shape == px.shape and prev.since_key < _KEY_EVERY:
+            tiles = _changed_tiles(prev.px, px)
+            if not tiles:
+                continue  # identical at this tier: keep the old frame, send nothing
+            n_tiles = -(-px.shape[0] // _TILE) * -(-px.shape[1] // _TILE)
+            if len(tiles) <= _DELTA_MAX_SHARE * n_tiles:
+                frame.since_key = prev.since_key + 1
+                out[tier] = {
+                    "seq": seq,
+                    "key": False,
+                    "base": prev.seq,
+                    "tiles": [
+                        {"x": x, "y": y, "image": _encode(img.crop((x, y, min(x + _TILE, w), min(y + _TILE, h))), quality)}
+                        for x, y in tiles
+                    ],
+                }
+                state.frames[tier] = frame
+                continue
+        frame.key = out[tier] = _key_payload(seq, img, quality)
+        state.frames[tier] = frame
+    if out:
+        state.seq = seq
+    return out
+
+
+def keyframe(state: MirrorState, tier: str) -> dict | None:
+    """Full frame of the tier's current state (cached until the next snapshot)."""
+    frame = state.frames.get(tier)
+    if frame is None:
+        return None
+    if frame.key is None:
+        frame.key = _key_payload(frame.seq, Image.fromarray(frame.px), TIERS[tier][1])
+    return frame.key
@@ -0,0 +1,175 @@
+"""Region-diff OCR planning: find what changed on a board page, crop only that.
+
+Each page keeps a half-resolution grayscale copy of its last snapshot and a
+text layout (OCR'd regions with their pixel boxes). A new snapshot is diffed
+tile by tile against the copy (the first snapshot of a page against a blank
+board); changed tiles are grown by one tile and grouped into connected
+rectangles. A rectangle that touches an existing region is widened to cover it
+entirely, so the crop's OCR can replace that region's text outright. Too many
+rectangles, or too much of the page changed, falls back to one full-page OCR
+(whose single page-sized region means later edits of that page are full-page
+too, until a snapshot with less on it resets the layout).
+
+Needs NumPy + Pillow; callers OCR the whole board without them.
+"""
+from __future__ import annotations
+
+import base64
+import io
+from typing import Any, Callable
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw
+except ImportError:  # optional image stack
+    np = None
+    Image = None
+    ImageDraw = None
+
+Rect = tuple[int, int, int, int]  # x0, y0, x1, y1 in full-resolution pixels
+
+_SCALE = 2  # diff at half resolution
+_TILE = 64  # tile edge at diff resolution (128 px on the board)
+_PIXEL_DELTA = 48  # gray levels for a pixel to count as changed
+_TILE_MIN_CHANGED = 6  # changed pixels for a tile to count as changed
+_MARGIN = 12  # px added around a crop
+_MAX_REGIONS = 6
+_MAX_AREA = 0.6  # changed share of the page beyond which one full OCR is cheaper
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class PageLayout:
+    """OCR'd regions of one page; the page text is their reading-order join."""
+
+    __slots__ = ("regions",)
+
+    def __init__(self, regions: list[tuple[Rect, str]] | None = None) -> None:
+        self.regions: list[tuple[Rect, str]] = list(regions or [])
+
+    def expand(self, rects: list[Rect]) -> list[Rect]:
+        """Widen rects over the regions they touch and merge the ones that overlap."""
+        out = list(rects)
+        changed = True
+        while changed:
+            changed = False
+            for i, r in enumerate(out):
+                for box, _ in self.regions:
+                    if _overlaps(r, box) and _union(r, box) != r:
+                        out[i] = r = _union(r, box)
+                        changed = True
+                for j in range(len(out) - 1, i, -1):
+                    if _overlaps(r, out[j]):
+                        out[i] = r = _union(r, out.pop(j))
+                        changed = True
+        return out
+
+    def replace(self, rect: Rect, text: str) -> None:
+        self.regions = [(box, t) for box, t in self.regions if not _overlaps(box, rect)]
+        if text.strip():
+            self.regions.append((rect, text.strip()))
+
+    def text(self) -> str:
+        """Reading order: rows top to bottom (a region whose top is above the
+        middle of the row's first region joins that row), each left to right."""
+        rows: list[tuple[float, list[tuple[Rect, str]]]] = []
+        for box, t in sorted(self.regions, key=lambda r: r[0][1]):
+            if rows and box[1] < rows[-1][0]:
+                rows[-1][1].append((box, t))
+            else:
+                rows.append(((box[1] + box[3]) / 2, [(box, t)]))
+        return "\n".join(t for _, row in rows for _, t in sorted(row, key=lambda r: r[0][0]))
+
+
+def load(data: bytes, blank: Callable[[tuple[int, int]], list[Rect]] | None = None) -> tuple[Any, Any] | None:
+    """(RGB image, half-resolution grayscale array) of an encoded snapshot, with
+    the rectangles `blank(size)` returns painted white (text read elsewhere)."""
+    if Image is None:
+        return None
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:  # noqa: BLE001
+        return None
+    img = img.convert("RGB")
+    if blank is not None:
+        draw = ImageDraw.Draw(img)
+        for rect in blank(img.size):
+            draw.rectangle((rect[0], rect[1], rect[2] - 1, rect[3] - 1), fill="white")
+    gray = np.asarray(img.convert("L").reduce(_SCALE), dtype=np.uint8)
+    return img, gray
+
+
+def changed_rects(prev: Any | None, cur: Any, size: tuple[int, int]) -> list[Rect] | None:
+    """Full-resolution rectangles that changed since `prev` (None = blank board).
+    None means "OCR the whole page" (too many or too large changes)."""
+    if prev is None or prev.shape != cur.shape:
+        prev = np.full_like(cur, 255)
+    diff = np.abs(cur.astype(np.int16) - prev.astype(np.int16)) > _PIXEL_DELTA
+    h, w = diff.shape
+    rows, cols = -(-h // _TILE), -(-w // _TILE)
+    padded = np.zeros((rows * _TILE, cols * _TILE), dtype=bool)
+    padded[:h, :w] = diff
+    tiles = padded.reshape(rows, _TILE, cols, _TILE).sum(axis=(1, 3)) >= _TILE_MIN_CHANGED
+    if not tiles.any():
+        return []
+    if tiles.mean() > _MAX_AREA:
+        return None
+    grown = tiles.copy()  # one-tile dilation joins strokes of the same block
+    grown[1:, :] |= tiles[:-1, :]
+    grown[:-1, :] |= tiles[1:, :]
+    grown[:, 1:] |= tiles[:, :-1]
+    grown[:, :-1] |= tiles[:, 1:]
+
+    seen = np.zeros_like(grown)
+    rects: list[Rect] = []
+    for r0, c0 in zip(*(idx.tolist() for idx in np.nonzero(tiles))):
+        if seen[r0, c0]:
+            continue
+        stack, box = [(r0, c0)], [c0, r0, c0, r0]
+        seen[r0, c0] = True
+        while stack:
+            r, c = stack.pop()
+            if tiles[r, c]:  # the box covers changed tiles only, not the dilation
+                box = [min(box[0], c), min(box[1], r), max(box[2], c), max(box[3], r)]
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and grown[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    stack.append((nr, nc))
+        step = _TILE * _SCALE
+        rects.append(
+            (
+                max(0, box[0] * step - _MARGIN),
+                max(0, box[1] * step - _MARGIN),
+                min(size[0], (box[2] + 1) * step + _MARGIN),
+                min(size[1], (box[3] + 1) * step + _MARGIN),
+            )
+        )
+    return rects if len(rects) <= _MAX_REGIONS else None
+
+
+def plan(prev: Any | None, cur: Any, size: tuple[int, int], layout: PageLayout) -> list[Rect] | None:
+    rects = changed_rects(prev, cur, size)
+    if rects is None:
+        return None
+    rects = layout.expand(rects)
+    area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects)
+    if len(rects) > _MAX_REGIONS or area > _MAX_AREA * size[0] * size[1]:
+        return None
+    return rects
+
+
+def crop_b64(img: Any, rect: Rect) -> str:
+    buf = io.BytesIO()
+    img.crop(rect).save(buf, "PNG", optimize=False)
+    return base64.b64encode(buf.getvalue()).decode()
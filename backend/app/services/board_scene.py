@@ -0,0 +1,146 @@
+"""Board scene history as keyframes plus JSON patches (app.services.json_patch).
+
+Per (session, page), the scene document that arrives with each stored snapshot
+is written either whole or as a patch:
+
+- A keyframe row has `tldraw_snapshot` set and no `scene_key_id`.
+- A patch row has `scene_patch` set: the RFC 6902 ops from the previous
+  stored document. `scene_key_id` points at the chain's keyframe, and
+  `scene_seq` is the row's position after it.
+
+A chain restarts with a keyframe every `scene_keyframe_every` rows, when a
+patch would be larger than half the document, and after a process restart
+(the previous document lives in memory only).
+
+`materialize` rebuilds any row's document: one query for the chain up to that
+row, then the patches applied to the keyframe. It starts from the nearest
+recently rebuilt state in the chain if one is cached.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.whiteboard import WhiteboardLog
+from app.services import json_patch
+
+
+class SceneChain:
+    """Writer state of one page: the last stored document and its chain position."""
+
+    __slots__ = ("doc", "key_id", "seq", "nbytes", "pending")
+
+    def __init__(self) -> None:
+        self.doc: Any = None
+        self.key_id: uuid.UUID | None = None
+        self.seq = 0
+        self.nbytes = 0  # serialized size of `doc`
+        self.pending: tuple[Any, int, dict] | None = None  # (doc, size, fields) awaiting `committed`
+
+    def fields(self, doc: dict | None) -> dict:
+        """Column values for a row storing `doc` (call `committed` once it is written)."""
+        if doc is None:
+            self.pending = None
+            return {}
+        out: dict = {"tldraw_snapshot": doc}
+        size = len(json.dumps(doc))
+        if self.doc is not None and self.key_id is not None and self.seq + 1 < settings.scene_keyframe_every:
+            patch = json_patch.diff(self.doc, doc)
+            if len(json.dumps(patch)) * 2 < size:
+                out = {"scene_patch": patch, "scene_key_id": self.key_id, "scene_seq": self.seq + 1}
+        self.pending = (doc, size, out)
+        return out
+
+    def committed(self, row_id: uuid.UUID) -> None:
+        if self.pending is None:
+            return
+        doc, self.nbytes, out = self.pending
+        self.pending = None
+        self.doc = doc
+        if "scene_patch" in out:
+            self.seq = out["scene_seq"]
+        else:
+            self.key_id, self.seq = row_id, 0
+
+
+class _Lru:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._items: OrderedDict[uuid.UUID, Any] = OrderedDict()
+
+    def get(self, key: uuid.UUID) -> Any | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: uuid.UUID, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+
+_cache = _Lru(64)
+
+
+def materialize(db: DBSession, log_id: uuid.UUID) -> dict | None:
+    """The scene document as of snapshot `log_id` (None if it carried none).
+    The result may be shared with the cache: treat it as read-only."""
+    row = db.execute(
+        sa.select(WhiteboardLog.scene_key_id, WhiteboardLog.scene_seq).where(WhiteboardLog.id == log_id)
+    ).first()
+    if row is None:
+        return None
+    if row.scene_key_id is None:  # a keyframe (or no scene at all)
+        cached = _cache.get(log_id)
+        if cached is None:
+            cached = db.scalar(sa.select(WhiteboardLog.tldraw_snapshot).where(WhiteboardLog.id == log_id))
+            if cached is not None:
+                _cache.put(log_id, cached)
+        return cached
+    cached = _cache.get(log_id)
+    if cached is not None:
+        return cached
+
+    chain = db.execute(
+        sa.select(WhiteboardLog.id, WhiteboardLog.scene_patch)
+        .where(WhiteboardLog.scene_key_id == row.scene_key_id, WhiteboardLog.scene_seq <= row.scene_seq)
+        .order_by(WhiteboardLog.scene_seq)
+    ).all()
+    start, base = 0, None
+    for i in range(len(chain) - 1, -1, -1):
+        base = _cache.get(chain[i].id)
+        if base is not None:
+            start = i + 1
+            break
+    if base is None:
+        base = materialize(db, row.scene_key_id)
+        if base is None:
+            return None
+    doc = copy.deepcopy(base)
+    for step in chain[start:]:
+        doc = json_patch.apply(doc, step.scene_patch, in_place=True)
+    _cache.put(log_id, doc)
+    return doc
+
+
+def scene_at(db: DBSession, session_id: uuid.UUID, page: int, at: datetime | None) -> uuid.UUID | None:
+    """Id of the last snapshot on `page` at or before `at` (latest if None) that carries a scene."""
+    q = sa.select(WhiteboardLog.id).where(
+        WhiteboardLog.session_id == session_id,
+        WhiteboardLog.page_number == page,
+        # jsonb_typeof: older rows hold a JSON null rather than SQL NULL
+        sa.or_(sa.func.jsonb_typeof(WhiteboardLog.tldraw_snapshot) == "object", WhiteboardLog.scene_patch.is_not(None)),
+    )
+    if at is not None:
+        q = q.where(WhiteboardLog.timestamp <= at)
+    return db.scalar(q.order_by(WhiteboardLog.timestamp.desc()).limit(1))
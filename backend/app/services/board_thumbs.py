@@ -0,0 +1,42 @@
+"""Board snapshot thumbnails for history views: a small pyramid per image.
+
+Each stored board image gets one thumbnail per entry of `SIZES` (long side in
+px; smaller images are not upscaled), encoded as WebP, or JPEG if Pillow lacks
+WebP. The output depends only on the image bytes, so thumbnails are
+content-addressed in the blob store like the images themselves.
+
+CPU-bound: `render` runs in a worker thread.
+"""
+from __future__ import annotations
+
+import io
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional image stack: no thumbnails, timelines link the full image
+    Image = None
+
+SIZES: dict[str, int] = {"sm": 160, "md": 480, "lg": 960}
+_QUALITY = 72
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def render(data: bytes) -> dict[str, bytes] | None:
+    """Encoded thumbnail per size name (None if the image can't be decoded)."""
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            img = src.convert("RGB")
+    except Exception:  # noqa: BLE001
+        return None
+    fmt = "WEBP" if features.check("webp") else "JPEG"
+    out: dict[str, bytes] = {}
+    for name, side in sorted(SIZES.items(), key=lambda kv: -kv[1]):  # shrink the previous step
+        if max(img.size) > side:
+            img.thumbnail((side, side), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, fmt, quality=_QUALITY)
+        out[name] = buf.getvalue()
+    return out
@@ -0,0 +1,66 @@
+"""Recent live events per session, replayed to a student who joins mid-class.
+
+`broadcast_to_session` records what a late joiner would otherwise fetch over
+REST: finalized transcript lines (`transcript_batch` items) and AI responses
+(`command_response`). Each is a bounded ring (`catchup_transcripts` /
+`catchup_commands`), so memory per session is capped; the rings go when the
+session is released. The board frame comes from the mirror (app.workers.mirror_worker).
+"""
+from __future__ import annotations
+
+import json
+from collections import deque
+
+from app.core.config import settings
+from app.services.session_state import session_registry
+
+
+class _Ring:
+    __slots__ = ("transcripts", "commands", "nbytes")
+
+    def __init__(self) -> None:
+        self.transcripts: deque[tuple[dict, int]] = deque(maxlen=settings.catchup_transcripts)
+        self.commands: deque[tuple[dict, int]] = deque(maxlen=settings.catchup_commands)
+        self.nbytes = 0
+
+
+def _push(ring: _Ring, buf: deque, item: dict) -> int:
+    """Append with byte accounting; returns the change in held bytes."""
+    size = len(json.dumps(item, default=str))
+    delta = size - (buf[0][1] if len(buf) == buf.maxlen else 0)
+    buf.append((item, size))
+    ring.nbytes += delta
+    return delta
+
+
+class CatchupLog:
+    def __init__(self) -> None:
+        self._rings: dict[str, _Ring] = {}
+
+    def record(self, session_id: str, event: str, data: dict) -> None:
+        if event == "transcript_batch":
+            items = data.get("items") or []
+        elif event == "command_response":
+            items = [data]
+        else:
+            return
+        ring = self._rings.setdefault(session_id, _Ring())
+        buf = ring.transcripts if event == "transcript_batch" else ring.commands
+        delta = sum(_push(ring, buf, item) for item in items)
+        session_registry.touch(session_id, delta)
+
+    def snapshot(self, session_id: str) -> dict:
+        ring = self._rings.get(session_id)
+        if ring is None:
+            return {"transcripts": [], "commands": []}
+        return {
+            "transcripts": [item for item, _ in ring.transcripts],
+            "commands": [item for item, _ in ring.commands],
+        }
+
+    def drop(self, session_id: str) -> None:
+        self._rings.pop(session_id, None)
+
+
+catchup_log = CatchupLog()
+session_registry.on_release(catchup_log.drop)
@@ -0,0 +1,122 @@
+"""Tiered compression engine for `Session.compressed_history`.
+
+Leaf: the live buffer is split on line boundaries into bounded chunks that are
+compressed in parallel (map) and folded into one level-0 segment (reduce) — no
+content is truncated away. Tiers: history is kept like a binary counter; whenever
+the two newest segments share a level they are merged into one segment of the
+next level, so a lecture of n leaves keeps O(log n) segments.
+
+Segment shape (JSONB): {segment_num, level, leaves, time_range, token_count,
+compression_method, summary}. `segment_num` is the newest leaf covered;
+`time_range` is an ISO-8601 `start/end` interval once merged.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from app.services.ai_service import ai_service
+
+_CHUNK_CHARS = 6000  # per map call; stays under compress_context's input cap
+_LIST_CAP = 24
+_CONCEPT_CAP = 30
+_LIST_KEYS = ("topicFlow", "visualReferences", "dependencies")
+
+
+def chunk_text(text: str, limit: int = _CHUNK_CHARS) -> list[str]:
+    """Split on line boundaries into chunks of at most `limit` chars."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines():
+        while len(line) > limit:  # a single oversized line is hard-split
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if size + len(line) + 1 > limit and current:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current and any(ln.strip() for ln in current):
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def merge_summaries(*summaries: dict[str, Any]) -> dict[str, Any]:
+    """Structural (offline) merge: ordered de-duplicated union, bounded in size.
+    Later summaries win on concept definitions."""
+    merged: dict[str, Any] = {key: [] for key in _LIST_KEYS}
+    concepts: dict[str, str] = {}
+    for s in summaries:
+        for key in _LIST_KEYS:
+            merged[key].extend(str(v) for v in (s.get(key) or []) if v)
+        raw = s.get("keyConcepts") or {}
+        if isinstance(raw, dict):
+            concepts.update({str(k): str(v) for k, v in raw.items()})
+    for key in _LIST_KEYS:
+        merged[key] = list(dict.fromkeys(merged[key]))[-_LIST_CAP:]
+    merged["keyConcepts"] = dict(list(concepts.items())[-_CONCEPT_CAP:])
+    return merged
+
+
+async def compress_leaf(text: str) -> tuple[dict[str, Any], str]:
+    """Map chunks through the LLM in parallel and reduce them into one summary.
+    Returns (summary, method) where method is "llm" or "fallback"."""
+    chunks = chunk_text(text, _CHUNK_CHARS)
+    if not chunks:
+        return merge_summaries(), "fallback"
+    parts = await asyncio.gather(*(ai_service.compress_context(c) for c in chunks))
+    fell_back = [p.pop("_fallback", False) for p in parts]
+    method = "fallback" if any(fell_back) else "llm"
+    summary = parts[0] if len(parts) == 1 else merge_summaries(*parts)
+    return summary, method
+
+
+def _span(older: dict, newer: dict) -> str:
+    start = str(older.get("time_range", "")).split("/")[0]
+    end = str(newer.get("time_range", "")).split("/")[-1]
+    return f"{start}/{end}"
+
+
+async def _merge_pair(older: dict, newer: dict) -> dict:
+    summary = await ai_service.merge_summaries(older.get("summary") or {}, newer.get("summary") or {})
+    method = "llm"
+    if "topicFlow" not in summary:
+        summary, method = merge_summaries(older.get("summary") or {}, newer.get("summary") or {}), "fallback"
+    return {
+        "segment_num": newer.get("segment_num", 0),
+        "level": int(older.get("level", 0)) + 1,
+        "leaves": int(older.get("leaves", 1)) + int(newer.get("leaves", 1)),
+        "time_range": _span(older, newer),
+        "token_count": int(older.get("token_count", 0)) + int(newer.get("token_count", 0)),
+        "compression_method": method,
+        "summary": summary,
+    }
+
+
+async def fold(history: list[dict], leaf: dict) -> list[dict]:
+    """Append a level-0 leaf and carry-merge equal-level tails (binary counter)."""
+    out = [*history, {"level": 0, "leaves": 1, **leaf}]
+    while len(out) >= 2 and int(out[-1].get("level", 0)) == int(out[-2].get("level", 0)):
+        newer = out.pop()
+        older = out.pop()
+        out.append(await _merge_pair(older, newer))
+    return out
+
+
+def render_history(history: list[dict], limit: int = 3000) -> str:
+    """Compact oldest-first text of the compressed segments for prompt context."""
+    lines: list[str] = []
+    for seg in history:
+        s = seg.get("summary") or {}
+        flow = " → ".join(str(t) for t in (s.get("topicFlow") or []))
+        raw = s.get("keyConcepts") or {}
+        concepts = "; ".join(f"{k}: {v}" if v else str(k) for k, v in raw.items()) if isinstance(raw, dict) else ""
+        line = f"- {flow}" if flow else "-"
+        if concepts:
+            line += f" | Concepts: {concepts}"
+        lines.append(line)
+    return "\n".join(lines)[:limit]
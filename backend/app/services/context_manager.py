@@ -1,22 +1,58 @@
 """Assemble fused lecture context (spoken + board + compressed history).
 
 P5: built directly from the DB (recent transcripts + OCR + compressed_history).
-P7 adds the live in-memory buffer + automatic compression.
+P7 adds the live in-memory buffer + automatic compression. With
+CONTEXT_BUFFER_BACKEND=postgres the buffer is shared by all worker processes
+(SharedContextManager) and kept fresh via LISTEN/NOTIFY.
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import session_scope
+from app.core.database import async_session_scope
+from app.core.logging import get_logger
 from app.models.session import Session
 from app.models.transcript import Transcript
 from app.models.whiteboard import WhiteboardLog
+from app.services.compression import render_history
+from app.services.session_state import RECORD_OVERHEAD, SessionRegistry, session_registry
+
+logger = get_logger("aura.context")
 
 _CHARS_PER_TOKEN = 4
+_CHANNEL = "aura_context"
+
+
+class _Item:
+    __slots__ = ("seq", "kind", "text", "tokens")
+
+    def __init__(self, seq: int, kind: str, text: str, tokens: int) -> None:
+        self.seq = seq
+        self.kind = kind
+        self.text = text
+        self.tokens = tokens
+
+    @property
+    def nbytes(self) -> int:
+        return RECORD_OVERHEAD + len(self.text)
+
+
+class _Buffer:
+    __slots__ = ("items", "tokens", "seq")
+
+    def __init__(self, seq: int = 0) -> None:
+        self.items: list[_Item] = []
+        self.tokens = 0
+        self.seq = seq
 
 
 class ContextManager:
@@ -24,58 +60,293 @@ class ContextManager:
 
     Feeds the compression trigger and the live token chip. The DB remains the
     source of truth for content (see get_context); this only tracks the
-    not-yet-compressed window.
+    not-yet-compressed window. Items carry a monotonically increasing sequence
+    number so a compression can snapshot up to a watermark and later drop only
+    what it actually summarized. With a registry, buffer bytes are accounted
+    against the instance-wide ceiling and released with the session.
+
+    Methods are coroutines to share SharedContextManager's interface; none of
+    them awaits anything here, so each still runs atomically on the loop.
     """
 
-    def __init__(self) -> None:
-        self._buf: dict[str, dict] = {}
+    def __init__(self, registry: SessionRegistry | None = None) -> None:
+        self._buf: dict[str, _Buffer] = {}
+        self._registry = registry
+        if registry is not None:
+            registry.on_release(self.drop)
+
+    async def add(self, session_id: str, kind: str, text: str) -> int:
+        b = self._buf.get(session_id)
+        if b is None:
+            b = self._buf[session_id] = _Buffer()
+        b.seq += 1
+        item = _Item(b.seq, kind, text, max(1, len(text) // _CHARS_PER_TOKEN))
+        b.items.append(item)
+        b.tokens += item.tokens
+        if self._registry is not None:
+            self._registry.touch(session_id, item.nbytes)
+        return b.tokens
+
+    async def tokens(self, session_id: str) -> int:
+        b = self._buf.get(session_id)
+        return b.tokens if b else 0
+
+    async def should_compress(self, session_id: str) -> bool:
+        return await self.tokens(session_id) >= settings.compression_token_limit
+
+    async def snapshot_text(self, session_id: str) -> str:
+        return (await self.snapshot(session_id))[0]
+
+    async def snapshot(self, session_id: str) -> tuple[str, int, int]:
+        """(text, tokens, watermark) of the current buffer, taken atomically
+        (no await) so items added afterwards sit above the watermark."""
+        b = self._buf.get(session_id)
+        if not b:
+            return "", 0, 0
+        text = "\n".join(f"[{i.kind}] {i.text}" for i in b.items)
+        return text, b.tokens, b.seq
+
+    async def clear_through(self, session_id: str, watermark: int) -> int:
+        """Drop items with seq <= watermark; returns the tokens still buffered."""
+        b = self._buf.get(session_id)
+        if not b:
+            return 0
+        kept = [i for i in b.items if i.seq > watermark]
+        freed = sum(i.nbytes for i in b.items if i.seq <= watermark)
+        b.items = kept
+        b.tokens = sum(i.tokens for i in kept)
+        if self._registry is not None and freed:
+            self._registry.touch(session_id, -freed)
+        return b.tokens
+
+    async def clear(self, session_id: str) -> None:
+        b = self._buf.get(session_id)
+        if b is not None:
+            await self.clear_through(session_id, b.seq)
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session entirely (registry release hook)."""
+        self._buf.pop(session_id, None)
+
+    async def acquire_lease(self, session_id: str) -> bool:
+        """Cross-process compression claim; a single process needs none."""
+        return True
+
+    async def release_lease(self, session_id: str) -> None:
+        return None
+
+
+_ADD_SQL = sa.text(
+    """
+    WITH c AS (
+        INSERT INTO context_counters (session_id, tokens, seq) VALUES (:sid, :n, 1)
+        ON CONFLICT (session_id) DO UPDATE
+            SET tokens = context_counters.tokens + EXCLUDED.tokens, seq = context_counters.seq + 1
+        RETURNING tokens, seq
+    ), i AS (
+        INSERT INTO context_items (session_id, seq, kind, text, tokens)
+        SELECT :sid, c.seq, :kind, :text, :n FROM c
+    )
+    SELECT c.tokens, pg_notify(:channel, :prefix || c.tokens || :suffix) FROM c
+    """
+)
+_CLEAR_SQL = sa.text(
+    """
+    WITH d AS (
+        DELETE FROM context_items WHERE session_id = :sid AND seq <= :mark RETURNING tokens
+    ), u AS (
+        UPDATE context_counters
+        SET tokens = GREATEST(0, tokens - (SELECT COALESCE(SUM(tokens), 0) FROM d))
+        WHERE session_id = :sid
+        RETURNING tokens
+    )
+    SELECT u.tokens, pg_notify(:channel, :prefix || u.tokens || :suffix) FROM u
+    """
+)
+_LEASE_SQL = sa.text(
+    """
+    UPDATE context_counters SET lease_until = now() + make_interval(secs => :ttl)
+    WHERE session_id = :sid AND (lease_until IS NULL OR lease_until < now())
+    RETURNING session_id
+    """
+)
+
+
+class SharedContextManager:
+    """Postgres-backed buffer with the ContextManager interface, for running
+    several worker processes. Appends, token counters and clears are single
+    atomic statements; the per-session `seq` is bumped under the counter row
+    lock, so a snapshot watermark never skips an uncommitted item. Every change
+    is NOTIFY'd as `session_id:tokens:pid`; `listen()` keeps this process's token
+    cache fresh and reports changes made by other processes. Every query goes
+    through the async engine, so callers on the event loop never block on it."""
+
+    def __init__(self, registry: SessionRegistry | None = None, lease_ttl_s: int = 180) -> None:
+        self._tokens: dict[str, int] = {}
+        self._registry = registry
+        self._lease_ttl_s = lease_ttl_s
+        self._suffix = f":{os.getpid()}"
+        if registry is not None:
+            registry.on_release(self.drop)
+
+    def _params(self, session_id: str) -> dict:
+        return {
+            "sid": uuid.UUID(session_id),
+            "channel": _CHANNEL,
+            "prefix": f"{session_id}:",
+            "suffix": self._suffix,
+        }
+
+    async def add(self, session_id: str, kind: str, text: str) -> int:
+        n = max(1, len(text) // _CHARS_PER_TOKEN)
+        async with async_session_scope() as db:
+            tokens = (
+                await db.execute(_ADD_SQL, {**self._params(session_id), "kind": kind[:8], "text": text, "n": n})
+            ).scalar_one()
+        self._tokens[session_id] = tokens
+        if self._registry is not None:
+            self._registry.touch(session_id)
+        return tokens
+
+    async def tokens(self, session_id: str) -> int:
+        cached = self._tokens.get(session_id)
+        if cached is not None:
+            return cached
+        async with async_session_scope() as db:
+            tokens = await db.scalar(
+                sa.text("SELECT tokens FROM context_counters WHERE session_id = :sid"),
+                {"sid": uuid.UUID(session_id)},
+            )
+        return tokens or 0
+
+    async def should_compress(self, session_id: str) -> bool:
+        return await self.tokens(session_id) >= settings.compression_token_limit
+
+    async def snapshot_text(self, session_id: str) -> str:
+        return (await self.snapshot(session_id))[0]
+
+    async def snapshot(self, session_id: str) -> tuple[str, int, int]:
+        sid = uuid.UUID(session_id)
+        async with async_session_scope() as db:
+            mark = await db.scalar(sa.text("SELECT seq FROM context_counters WHERE session_id = :sid"), {"sid": sid})
+            if not mark:
+                return "", 0, 0
+            rows = (
+                await db.execute(
+                    sa.text(
+                        "SELECT kind, text, tokens FROM context_items "
+                        "WHERE session_id = :sid AND seq <= :mark ORDER BY seq"
+                    ),
+                    {"sid": sid, "mark": mark},
+                )
+            ).all()
+        text = "\n".join(f"[{kind}] {body}" for kind, body, _ in rows)
+        return text, sum(r[2] for r in rows), mark
+
+    async def clear_through(self, session_id: str, watermark: int) -> int:
+        async with async_session_scope() as db:
+            tokens = await db.scalar(_CLEAR_SQL, {**self._params(session_id), "mark": watermark})
+        self._tokens[session_id] = tokens or 0
+        return tokens or 0
+
+    async def clear(self, session_id: str) -> None:
+        await self.clear_through(session_id, 2**62)
+
+    def drop(self, session_id: str) -> None:
+        """Forget the local cache only; the shared rows belong to the session."""
+        self._tokens.pop(session_id, None)
+
+    async def acquire_lease(self, session_id: str) -> bool:
+        """Claim the session's compression for `lease_ttl_s` across processes.
+        A crashed holder's lease simply expires."""
+        async with async_session_scope() as db:
+            got = await db.scalar(_LEASE_SQL, {"sid": uuid.UUID(session_id), "ttl": self._lease_ttl_s})
+        return got is not None
+
+    async def release_lease(self, session_id: str) -> None:
+        async with async_session_scope() as db:
+            await db.execute(
+                sa.text("UPDATE context_counters SET lease_until = NULL WHERE session_id = :sid"),
+                {"sid": uuid.UUID(session_id)},
+            )
 
-    def add(self, session_id: str, kind: str, text: str) -> int:
-        b = self._buf.setdefault(session_id, {"items": [], "tokens": 0})
-        b["items"].append({"kind": kind, "text": text})
-        b["tokens"] += max(1, len(text) // _CHARS_PER_TOKEN)
-        return b["tokens"]
+    def _on_notify(self, payload: str) -> tuple[str, int] | None:
+        """Apply a NOTIFY payload; returns (session_id, tokens) if it came from
+        another process."""
+        session_id, _, rest = payload.partition(":")
+        tokens, _, pid = rest.partition(":")
+        try:
+            self._tokens[session_id] = int(tokens)
+        except ValueError:
+            return None
+        return None if f":{pid}" == self._suffix else (session_id, int(tokens))
 
-    def tokens(self, session_id: str) -> int:
-        return self._buf.get(session_id, {}).get("tokens", 0)
+    async def listen(self, on_change: Callable[[str, int], Awaitable[None]] | None = None) -> None:
+        """LISTEN forever (reconnecting) on a dedicated autocommit connection."""
+        import psycopg
 
-    def should_compress(self, session_id: str) -> bool:
-        return self.tokens(session_id) >= settings.compression_token_limit
+        url = settings.database_url.replace("postgresql+psycopg://", "postgresql://", 1)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(url, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {_CHANNEL}")
+                    logger.info("context.listening", channel=_CHANNEL)
+                    async for note in conn.notifies():
+                        change = self._on_notify(note.payload)
+                        if change and on_change is not None:
+                            await on_change(*change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("context.listen_failed", error=str(exc))
+                await asyncio.sleep(5)
 
-    def snapshot_text(self, session_id: str) -> str:
-        items = self._buf.get(session_id, {}).get("items", [])
-        return "\n".join(f"[{i['kind']}] {i['text']}" for i in items)
 
-    def clear(self, session_id: str) -> None:
-        self._buf[session_id] = {"items": [], "tokens": 0}
+context_manager: ContextManager | SharedContextManager = (
+    SharedContextManager(session_registry)
+    if settings.context_buffer_backend == "postgres"
+    else ContextManager(session_registry)
+)
 
 
-context_manager = ContextManager()
+def _latest(column: Any, ts: Any, *where: Any, limit: int) -> Any:
+    """array of the newest `limit` values of `column`, oldest first (a scalar subquery)."""
+    recent = sa.select(column.label("v"), ts.label("ts")).where(*where).order_by(ts.desc()).limit(limit).subquery()
+    return sa.select(sa.func.array_agg(aggregate_order_by(recent.c.v, recent.c.ts))).scalar_subquery()
 
 
-def get_context(session_id: str, n_transcripts: int = 30, n_boards: int = 5) -> str:
+async def get_context(
+    session_id: str, n_transcripts: int = 30, n_boards: int = 5, db: AsyncSession | None = None
+) -> str:
+    """Fused lecture context in one query (on `db` when given, e.g. a caller's unit of work)."""
+    if db is None:
+        async with async_session_scope() as db:
+            return await get_context(session_id, n_transcripts, n_boards, db)
     sid = uuid.UUID(session_id)
-    with session_scope() as db:
-        transcripts = db.scalars(
-            sa.select(Transcript)
-            .where(Transcript.session_id == sid)
-            .order_by(Transcript.timestamp.desc())
-            .limit(n_transcripts)
-        ).all()
-        boards = db.scalars(
-            sa.select(WhiteboardLog)
-            .where(WhiteboardLog.session_id == sid, WhiteboardLog.ocr_text != "")
-            .order_by(WhiteboardLog.timestamp.desc())
-            .limit(n_boards)
-        ).all()
-        sess = db.get(Session, sid)
-        compressed = list(sess.compressed_history) if sess and sess.compressed_history else []
+    # Text columns only: never hydrate whole rows (JSONB scene, image columns).
+    row = (
+        await db.execute(
+            sa.select(
+                _latest(Transcript.text, Transcript.timestamp, Transcript.session_id == sid, limit=n_transcripts),
+                _latest(
+                    WhiteboardLog.ocr_text,
+                    WhiteboardLog.timestamp,
+                    WhiteboardLog.session_id == sid,
+                    WhiteboardLog.ocr_text != "",
+                    limit=n_boards,
+                ),
+                sa.select(Session.compressed_history).where(Session.id == sid).scalar_subquery(),
+            )
+        )
+    ).one()
+    transcripts, boards, history = row[0] or [], row[1] or [], row[2]
+    compressed = list(history) if history else []
 
     parts: list[str] = []
     if compressed:
-        parts.append("[Earlier summary]\n" + json.dumps(compressed)[:2000])
+        parts.append("[Earlier summary]\n" + render_history(compressed))
     if boards:
-        parts.append("[Whiteboard]\n" + "\n".join(b.ocr_text for b in reversed(boards)))
+        parts.append("[Whiteboard]\n" + "\n".join(boards))
     if transcripts:
-        parts.append("[Spoken]\n" + "\n".join(t.text for t in reversed(transcripts)))
+        parts.append("[Spoken]\n" + "\n".join(transcripts))
     return "\n\n".join(parts) if parts else "(no lecture content captured yet)"
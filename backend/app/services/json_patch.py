@@ -0,0 +1,96 @@
+"""Minimal RFC 6902 JSON Patch: `diff` two JSON documents, `apply` a patch.
+
+Only `add`, `remove` and `replace` are produced (and understood). Objects are
+diffed key by key. Arrays are diffed element-wise over their common prefix
+and suffix, with removes/adds for the differing middle. That keeps the
+usual board edits small: appending elements, editing one element in place,
+or deleting one.
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+Patch = list[dict[str, Any]]
+
+
+def _escape(token: str | int) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(a: Any, b: Any, path: str = "") -> Patch:
+    """Operations turning `a` into `b`."""
+    if type(a) is not type(b):
+        return [{"op": "replace", "path": path, "value": b}]
+    if isinstance(a, dict):
+        ops: Patch = []
+        for key in a:
+            if key not in b:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in b.items():
+            if key not in a:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(diff(a[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(a, list):
+        return _diff_list(a, b, path)
+    return [] if a == b else [{"op": "replace", "path": path, "value": b}]
+
+
+def _diff_list(a: list, b: list, path: str) -> Patch:
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a, end_b = end_a - 1, end_b - 1
+    ops: Patch = []
+    common = min(end_a, end_b) - start
+    for i in range(start, start + common):  # changed in place
+        ops.extend(diff(a[i], b[i], f"{path}/{i}"))
+    for i in range(end_a - 1, start + common - 1, -1):  # removed (back to front)
+        ops.append({"op": "remove", "path": f"{path}/{i}"})
+    for i in range(start + common, end_b):  # inserted
+        ops.append({"op": "add", "path": f"{path}/{i}", "value": b[i]})
+    return ops
+
+
+def _parent(doc: Any, path: str) -> tuple[Any, str]:
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    node = doc
+    for token in tokens[:-1]:
+        node = node[int(token)] if isinstance(node, list) else node[token]
+    return node, tokens[-1]
+
+
+def apply(doc: Any, patch: Patch, in_place: bool = False) -> Any:
+    """`doc` with `patch` applied (a deep copy unless `in_place`)."""
+    if not in_place:
+        doc = copy.deepcopy(doc)
+    for op in patch:
+        path, kind = op["path"], op["op"]
+        if path == "":
+            if kind == "remove":
+                doc = None
+            else:
+                doc = copy.deepcopy(op["value"])
+            continue
+        parent, key = _parent(doc, path)
+        if isinstance(parent, list):
+            index = len(parent) if key == "-" else int(key)
+            if kind == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif kind == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        elif kind == "remove":
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(op["value"])
+    return doc
@@ -0,0 +1,81 @@
+"""Lightweight keyphrase extraction (n-gram frequency) for offline summaries.
+
+Used by the extractive compression fallback when no LLM is reachable. Candidates
+are short n-grams inside runs of content words (split on stopwords/punctuation),
+counted in a single pass — linear in the input size.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been
+    before being below between both but by can could did do does doing done down during
+    each either else etc even ever every few for from further get gets getting go goes
+    going gonna got had has have having he her here hers herself him himself his how i if
+    in into is it its itself just kind know let like lot make may me might mine more most
+    much must my myself need no nor not now of off ok okay on once one only or other our
+    ours ourselves out over own please put quite rather really right said same say says
+    see shall she should since so some something still such sure take than that thats the
+    their theirs them themselves then there these they thing things think this those
+    though through to today too under until up upon us use used using very want was way
+    we well were what whatever when where whether which while who whom whose why will
+    with within without would yeah yes yet you your yours yourself yourselves
+    """.split()
+)
+
+_SENTENCE = re.compile(r"[.!?;:,()\[\]{}\"\n\t]+")
+_WORD = re.compile(r"[a-z][a-z0-9'+\-]*")
+
+
+def content_runs(text: str) -> list[list[str]]:
+    """Maximal runs of content words between stopwords / punctuation."""
+    runs: list[list[str]] = []
+    for chunk in _SENTENCE.split(text.lower()):
+        current: list[str] = []
+        for tok in _WORD.findall(chunk):
+            tok = tok.strip("'-")
+            if len(tok) < 3 or tok in STOPWORDS:
+                if current:
+                    runs.append(current)
+                    current = []
+                continue
+            current.append(tok)
+        if current:
+            runs.append(current)
+    return runs
+
+
+def extract_keyphrases(text: str, k: int = 12, max_words: int = 3) -> list[str]:
+    """Top-k keyphrases, returned in order of first appearance (reads as a topic flow).
+
+    Every 1..max_words n-gram inside a content run is a candidate, scored by
+    frequency weighted toward longer phrases; a candidate overlapping an
+    already-picked phrase (sub- or super-string) is skipped.
+    """
+    counts: Counter[tuple[str, ...]] = Counter()
+    first_seen: dict[tuple[str, ...], int] = {}
+    pos = 0
+    for run in content_runs(text or ""):
+        for i in range(len(run)):
+            for n in range(1, min(max_words, len(run) - i) + 1):
+                gram = tuple(run[i : i + n])
+                counts[gram] += 1
+                first_seen.setdefault(gram, pos)
+            pos += 1
+    if not counts:
+        return []
+
+    ranked = sorted(counts, key=lambda g: (-counts[g] * len(g) ** 0.5, first_seen[g]))
+    picked: list[tuple[str, ...]] = []
+    for gram in ranked:
+        joined = f" {' '.join(gram)} "
+        if any(joined in f" {' '.join(p)} " or f" {' '.join(p)} " in joined for p in picked):
+            continue
+        picked.append(gram)
+        if len(picked) == k:
+            break
+    picked.sort(key=first_seen.__getitem__)
+    return [" ".join(p) for p in picked]
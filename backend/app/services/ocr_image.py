@@ -0,0 +1,68 @@
+"""Normalize a board image before it is sent to a vision OCR provider.
+
+The client exports the whole canvas at screen resolution, mostly empty
+background. Before OCR the image is:
+
+1. grayscaled, and inverted if the board is dark (dark-theme export), so ink
+   is always dark on light;
+2. cropped to the ink bounding box plus a margin; a board with no ink is
+   not sent at all;
+3. downsampled so its long side is at most `ocr_max_side` (vision models
+   resample larger inputs anyway; nothing is ever upscaled);
+4. contrast-stretched and posterized to 16 gray levels, then re-encoded as
+   PNG, which compresses flat line art very well.
+
+CPU-bound (Pillow + NumPy): call it through `asyncio.to_thread`. Without
+the image stack `prepare` returns the input unchanged.
+"""
+from __future__ import annotations
+
+import io
+
+try:
+    import numpy as np
+    from PIL import Image, ImageOps
+except ImportError:  # optional image stack: send the original image
+    np = None
+    Image = None
+
+_INK_DELTA = 40  # gray levels darker than the background that count as ink
+_MARGIN = 16  # px kept around the ink box (before downsampling)
+_LEVELS = 16
+_POSTERIZE = [(v * _LEVELS // 256) * 255 // (_LEVELS - 1) for v in range(256)]
+
+
+def prepare(data: bytes, max_side: int = 1280) -> bytes | None:
+    """Compact OCR-ready PNG of `data`; None if the board has no ink.
+    Undecodable input (or no Pillow) is returned as-is."""
+    if Image is None:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            gray = src.convert("L")
+    except Exception:  # noqa: BLE001 — let the provider decide
+        return data
+    px = np.asarray(gray)
+    background = int(np.median(px))
+    if background < 128:
+        px = 255 - px
+        background = 255 - background
+        gray = Image.fromarray(px)
+    rows, cols = np.nonzero(px < background - _INK_DELTA)
+    if not len(rows):
+        return None
+    h, w = px.shape
+    box = (
+        max(0, int(cols.min()) - _MARGIN),
+        max(0, int(rows.min()) - _MARGIN),
+        min(w, int(cols.max()) + _MARGIN + 1),
+        min(h, int(rows.max()) + _MARGIN + 1),
+    )
+    img = gray.crop(box)
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    img = ImageOps.autocontrast(img, cutoff=1)
+    img = img.point(_POSTERIZE)
+    buf = io.BytesIO()
+    img.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
@@ -0,0 +1,295 @@
+"""EasyOCR in a dedicated process: the offline fallback of the vision worker.
+
+One spawned process loads the EasyOCR reader (`easyocr_languages`), reads a
+small blank image so the first real board doesn't pay for lazy
+initialisation, then serves jobs from a request queue bounded at
+`easyocr_queue_depth` (a job beyond it is dropped and counted). Image decode
+and inference both happen in that process, never on the event loop's
+interpreter.
+
+Images are handed over through shared memory: the caller copies the encoded
+bytes into a segment it owns and sends only its name and size; the segment is
+unlinked once the job ends. A job that takes longer than `easyocr_timeout_s`
+returns "" and recycles the process (it is presumed stuck), so one bad image
+can't hold up every later one; the next job respawns it.
+
+Started at startup (`easyocr_preload`, on by default), else on the first job.
+Loading torch and the model takes a while on a cold CPU host, so a job's
+deadline only starts once the sidecar is ready; until then jobs wait up to
+`easyocr_startup_timeout_s` and return "" past it, leaving the load running.
+Queue wait and inference time are served by `GET /debug/vision`.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import io
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing import shared_memory
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import LatencyStats
+
+logger = get_logger("aura.ocr.sidecar")
+
+
+def load_easyocr(languages: tuple[str, ...]) -> Any:
+    import easyocr  # type: ignore
+
+    return easyocr.Reader(list(languages), gpu=False)
+
+
+def _blank_png() -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _read(reader: Any, data: bytes) -> str:
+    import numpy as np
+    from PIL import Image
+
+    img = np.array(Image.open(io.BytesIO(data)).convert("RGB"))
+    return " ".join(reader.readtext(img, detail=0, paragraph=True)).strip()
+
+
+def _serve(requests: Any, results: Any, loader: Callable[..., Any], languages: tuple[str, ...]) -> None:
+    """Sidecar process body: load + warm the reader, then serve until a None job."""
+    import os
+
+    reader = loader(languages)
+    _read(reader, _blank_png())
+    results.put(("ready", os.getpid()))
+    while True:
+        job = requests.get()
+        if job is None:
+            return
+        job_id, name, size = job
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                data = bytes(shm.buf[:size])
+            finally:
+                shm.close()
+            text, error = _read(reader, data), None
+        except Exception as exc:  # noqa: BLE001
+            text, error = "", str(exc)
+        results.put((job_id, text, started, time.perf_counter() - t0, error))
+
+
+def _kill(proc: Any, results: Any) -> None:
+    proc.terminate()
+    proc.join(1.0)
+    results.put(None)  # ends the old process's result reader
+
+
+class OcrSidecar:
+    def __init__(
+        self,
+        queue_depth: int | None = None,
+        timeout_s: float | None = None,
+        languages: tuple[str, ...] | None = None,
+        loader: Callable[..., Any] = load_easyocr,
+        startup_timeout_s: float | None = None,
+    ) -> None:
+        self.queue_depth = queue_depth or settings.easyocr_queue_depth
+        self.timeout_s = timeout_s or settings.easyocr_timeout_s
+        self.startup_timeout_s = startup_timeout_s or settings.easyocr_startup_timeout_s
+        self.languages = languages or tuple(settings.easyocr_languages.split(","))
+        self._loader = loader
+        self._proc: Any = None
+        self._requests: Any = None
+        self._results: Any = None
+        self._reader: threading.Thread | None = None
+        self._pending: dict[int, tuple[asyncio.Future, float]] = {}
+        self._ids = itertools.count(1)
+        self._ready_event = threading.Event()
+        self.unavailable = False
+        self.counts = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "timedOut": 0,
+            "notReady": 0,
+            "restarts": 0,
+        }
+        self.queue_wait = LatencyStats()
+        self.inference = LatencyStats()
+
+    @property
+    def started(self) -> bool:
+        return self._proc is not None
+
+    def start(self) -> bool:
+        """Spawn the sidecar (idempotent). False when EasyOCR isn't installed."""
+        if self._proc is not None:
+            return True
+        if self._loader is load_easyocr and importlib.util.find_spec("easyocr") is None:
+            if not self.unavailable:
+                logger.warning("ocr.easyocr_unavailable", hint="pip install easyocr")
+            self.unavailable = True
+            return False
+        ctx = mp.get_context("spawn")  # never fork the event loop / DB pool
+        self._requests = ctx.Queue(maxsize=self.queue_depth)
+        self._results = ctx.Queue()
+        self._proc = ctx.Process(
+            target=_serve,
+            args=(self._requests, self._results, self._loader, self.languages),
+            name="aura-easyocr",
+            daemon=True,
+        )
+        self._proc.start()
+        self._reader = threading.Thread(
+            target=self._read_results, args=(self._results,), name="aura-easyocr-results", daemon=True
+        )
+        self._reader.start()
+        logger.info("ocr.sidecar_started", languages=self.languages, depth=self.queue_depth)
+        return True
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until the reader is loaded and warmed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready_event.is_set():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def _await_ready(self) -> bool:
+        """Wait for a starting sidecar (up to `startup_timeout_s`); recycle it if it died loading."""
+        proc = self._proc
+        deadline = time.monotonic() + self.startup_timeout_s
+        while not self._ready_event.is_set():
+            if proc is not self._proc:
+                return False  # recycled meanwhile
+            if not proc.is_alive():
+                logger.warning("ocr.sidecar_died", exitcode=proc.exitcode)
+                await self._recycle()
+                return False
+            if time.monotonic() > deadline:
+                self.counts["notReady"] += 1
+                logger.warning("ocr.sidecar_not_ready", startup_timeout_s=self.startup_timeout_s)
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def read(self, image: bytes) -> str:
+        """Text of one encoded image; "" when unavailable, not ready, dropped, failed or timed out."""
+        if not image or not self.start() or not await self._await_ready():
+            return ""
+        job_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        shm = shared_memory.SharedMemory(create=True, size=len(image))
+        try:
+            shm.buf[: len(image)] = image
+            self._pending[job_id] = (fut, time.time())
+            try:
+                self._requests.put_nowait((job_id, shm.name, len(image)))
+            except queue.Full:
+                self.counts["dropped"] += 1
+                logger.warning("ocr.queue_full", depth=self.queue_depth)
+                return ""
+            self.counts["submitted"] += 1
+            try:
+                return await asyncio.wait_for(fut, self.timeout_s)
+            except asyncio.TimeoutError:
+                self.counts["timedOut"] += 1
+                logger.warning("ocr.sidecar_timeout", job_id=job_id, timeout_s=self.timeout_s)
+                await self._recycle()
+                return ""
+        finally:
+            self._pending.pop(job_id, None)
+            shm.close()
+            shm.unlink()  # the sidecar's own mapping (if any) stays valid until it closes it
+
+    def _read_results(self, results: Any) -> None:
+        while True:
+            try:
+                msg = results.get()
+            except (EOFError, OSError, ValueError):
+                return
+            if msg is None:
+                return
+            if msg[0] == "ready":
+                self._ready_event.set()
+                logger.info("ocr.sidecar_ready", pid=msg[1])
+                continue
+            job_id, text, started, infer_s, error = msg
+            entry = self._pending.get(job_id)
+            if entry is None:
+                continue  # timed out already
+            fut, enqueued = entry
+            try:
+                fut.get_loop().call_soon_threadsafe(
+                    self._resolve, fut, text, max(0.0, started - enqueued), infer_s, error
+                )
+            except RuntimeError:  # loop already closed (shutdown)
+                continue
+
+    def _resolve(self, fut: asyncio.Future, text: str, wait_s: float, infer_s: float, error: str | None) -> None:
+        self.queue_wait.observe(wait_s)
+        self.inference.observe(infer_s)
+        if error:
+            self.counts["failed"] += 1
+            logger.warning("ocr.sidecar_failed", error=error)
+        else:
+            self.counts["completed"] += 1
+        if not fut.done():
+            fut.set_result(text)
+
+    async def _recycle(self) -> None:
+        """Kill a stuck sidecar; jobs still waiting end with "" and the next one respawns it."""
+        proc, results = self._proc, self._results
+        if proc is None:
+            return
+        self._proc = self._reader = None
+        self._ready_event.clear()
+        self.counts["restarts"] += 1
+        for fut, _ in list(self._pending.values()):
+            if not fut.done():
+                fut.set_result("")
+        await asyncio.to_thread(_kill, proc, results)  # join() would block the loop
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._proc is None:
+            return
+        try:
+            self._requests.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._proc.join(timeout)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._results.put(None)
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self._proc, self._reader = None, None
+        self._ready_event.clear()
+
+    def stats(self) -> dict:
+        return {
+            "available": not self.unavailable,
+            "ready": self._ready_event.is_set(),
+            "alive": bool(self._proc and self._proc.is_alive()),
+            "languages": list(self.languages),
+            "queueDepth": self.queue_depth,
+            "inFlight": len(self._pending),
+            **self.counts,
+            "queueWait": self.queue_wait.summary(),
+            "inference": self.inference.summary(),
+        }
+
+
+ocr_sidecar = OcrSidecar()
@@ -0,0 +1,159 @@
+"""Registry of live per-session in-process state, with an explicit lifecycle.
+
+Modules that keep per-session memory (context buffer, last OCR, live quiz games)
+register a release hook here and report byte deltas as they grow or shrink. A
+session's state is released when the session ends, when it has had no sockets
+and no activity for `session_idle_timeout_s`, or — least-recently-active first —
+when the instance-wide total exceeds `session_state_max_bytes`. Byte counts are
+estimates (payload lengths plus a fixed per-record overhead), not exact heap size.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("aura.state")
+
+RECORD_OVERHEAD = 96  # rough per-record bookkeeping estimate, bytes
+
+
+class SessionRecord:
+    __slots__ = ("session_id", "nbytes", "sids", "created", "last_active")
+
+    def __init__(self, session_id: str, now: float) -> None:
+        self.session_id = session_id
+        self.nbytes = 0
+        self.sids: set[str] = set()
+        self.created = now
+        self.last_active = now
+
+
+class SessionRegistry:
+    """LRU-ordered live sessions (oldest activity first) with byte accounting."""
+
+    def __init__(self, idle_timeout_s: float | None = None, max_bytes: int | None = None) -> None:
+        self.idle_timeout_s = idle_timeout_s if idle_timeout_s is not None else settings.session_idle_timeout_s
+        self.max_bytes = max_bytes if max_bytes is not None else settings.session_state_max_bytes
+        self._live: OrderedDict[str, SessionRecord] = OrderedDict()
+        self._hooks: list[Callable[[str], None]] = []
+        self._total = 0
+        self.released = {"ended": 0, "idle": 0, "evicted": 0}
+
+    def on_release(self, hook: Callable[[str], None]) -> None:
+        """Register a callback that drops a session's state from its owner."""
+        self._hooks.append(hook)
+
+    # ---- lifecycle ----
+    def touch(self, session_id: str, delta_bytes: int = 0) -> None:
+        """Mark activity (moves the session to most-recent) and account bytes."""
+        now = time.monotonic()
+        rec = self._live.get(session_id)
+        if rec is None:
+            rec = self._live[session_id] = SessionRecord(session_id, now)
+        else:
+            self._live.move_to_end(session_id)
+        rec.last_active = now
+        if delta_bytes:
+            delta_bytes = max(delta_bytes, -rec.nbytes)
+            rec.nbytes += delta_bytes
+            self._total += delta_bytes
+        if self._total > self.max_bytes:
+            self._enforce_ceiling(keep=session_id)
+
+    def connect(self, session_id: str, sid: str) -> None:
+        self.touch(session_id)
+        self._live[session_id].sids.add(sid)
+
+    def disconnect(self, session_id: str, sid: str) -> None:
+        rec = self._live.get(session_id)
+        if rec is not None:
+            rec.sids.discard(sid)
+            rec.last_active = time.monotonic()  # idle clock starts at the last disconnect
+
+    def end_session(self, session_id: str) -> None:
+        self._release(session_id, "ended")
+
+    def sweep(self, now: float | None = None) -> int:
+        """Release sessions with no sockets that have been idle past the timeout."""
+        now = time.monotonic() if now is None else now
+        idle = [
+            sid
+            for sid, rec in self._live.items()
+            if not rec.sids and now - rec.last_active >= self.idle_timeout_s
+        ]
+        for sid in idle:
+            self._release(sid, "idle")
+        return len(idle)
+
+    async def run_sweeper(self, interval_s: float = 60.0) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                self.sweep()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("state.sweep_failed", error=str(exc))
+
+    # ---- internals ----
+    def _enforce_ceiling(self, keep: str) -> None:
+        # Disconnected sessions go first; live ones only if that is not enough.
+        for only_idle in (True, False):
+            victims = [s for s, r in self._live.items() if s != keep and (not only_idle or not r.sids)]
+            for sid in victims:
+                if self._total <= self.max_bytes:
+                    return
+                self._release(sid, "evicted")
+        if self._total > self.max_bytes:
+            logger.warning("state.ceiling_exceeded", session_id=keep, bytes=self._total)
+
+    def _release(self, session_id: str, reason: str) -> None:
+        rec = self._live.pop(session_id, None)
+        if rec is None:
+            return
+        self._total -= rec.nbytes
+        self.released[reason] += 1
+        for hook in self._hooks:
+            try:
+                hook(session_id)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("state.release_hook_failed", session_id=session_id, error=str(exc))
+        logger.info("state.released", session_id=session_id, reason=reason, bytes=rec.nbytes)
+
+    # ---- introspection ----
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._live
+
+    def bytes_for(self, session_id: str) -> int:
+        rec = self._live.get(session_id)
+        return rec.nbytes if rec else 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "liveSessions": len(self._live),
+            "totalBytes": self._total,
+            "maxBytes": self.max_bytes,
+            "idleTimeoutS": self.idle_timeout_s,
+            "released": dict(self.released),
+            "sessions": [
+                {
+                    "sessionId": rec.session_id,
+                    "bytes": rec.nbytes,
+                    "connections": len(rec.sids),
+                    "ageS": round(now - rec.created, 1),
+                    "idleS": round(now - rec.last_active, 1),
+                }
+                for rec in reversed(self._live.values())  # most recently active first
+            ],
+        }
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,181 @@
+"""Incremental term-frequency index behind the topic word cloud.
+
+Each persisted transcript is tokenized once (stopwords dropped; unigrams plus
+bigrams inside content runs) and its counts are upserted into `topic_terms` for
+the session, its unit and its course in a single statement, inside the same
+transaction as the Transcript row. Reads are then plain indexed sums — no
+rescanning of transcript text at any hierarchy level.
+"""
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+
+import sqlalchemy as sa
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.session import Session
+from app.models.topic_term import TopicTerm
+from app.models.unit import Unit
+from app.services.keyphrases import content_runs
+
+_TERM_MAX = 64
+
+_UPSERT_SQL = sa.text(
+    """
+    WITH scope AS (
+        SELECT s.id AS session_id, s.unit_id, u.course_id
+        FROM sessions s LEFT JOIN units u ON u.id = s.unit_id
+        WHERE s.id = :sid
+    ), t AS (
+        SELECT * FROM unnest(CAST(:terms AS text[]), CAST(:counts AS integer[])) AS t(term, n)
+    )
+    INSERT INTO topic_terms (scope, scope_id, term, count)
+    SELECT 'session', session_id, term, n FROM scope, t
+    UNION ALL SELECT 'unit', unit_id, term, n FROM scope, t WHERE unit_id IS NOT NULL
+    UNION ALL SELECT 'course', course_id, term, n FROM scope, t WHERE course_id IS NOT NULL
+    ON CONFLICT (scope, scope_id, term) DO UPDATE SET count = topic_terms.count + EXCLUDED.count
+    """
+)
+
+# Unit + course rollup rows a session contributes to, for a given unit.
+_TARGETS = """
+    tgt AS (
+        SELECT 'unit' AS scope, CAST(:unit AS uuid) AS scope_id
+        UNION ALL SELECT 'course', course_id FROM units WHERE id = :unit
+    ), src AS (
+        SELECT term, count FROM topic_terms WHERE scope = 'session' AND scope_id = :sid
+    )
+"""
+_ATTACH_SQL = sa.text(
+    f"""
+    WITH {_TARGETS}
+    INSERT INTO topic_terms (scope, scope_id, term, count)
+    SELECT tgt.scope, tgt.scope_id, src.term, src.count FROM tgt, src
+    ON CONFLICT (scope, scope_id, term) DO UPDATE SET count = topic_terms.count + EXCLUDED.count
+    """
+)
+_DETACH_SQL = sa.text(
+    f"""
+    WITH {_TARGETS}
+    UPDATE topic_terms t SET count = t.count - src.count
+    FROM tgt, src
+    WHERE t.scope = tgt.scope AND t.scope_id = tgt.scope_id AND t.term = src.term
+    """
+)
+
+# A deleted unit's rollup is exactly its sessions' share of the course rollup.
+_FORGET_UNIT_SQL = sa.text(
+    """
+    WITH u AS (
+        SELECT term, count FROM topic_terms WHERE scope = 'unit' AND scope_id = :unit
+    )
+    UPDATE topic_terms t SET count = t.count - u.count
+    FROM u, units
+    WHERE units.id = :unit AND t.scope = 'course' AND t.scope_id = units.course_id AND t.term = u.term
+    """
+)
+
+
+def term_counts(text: str) -> Counter[str]:
+    """Unigram + adjacent-bigram counts of content words in one text."""
+    counts: Counter[str] = Counter()
+    for run in content_runs(text):
+        counts.update(w[:_TERM_MAX] for w in run)
+        counts.update(f"{a} {b}"[:_TERM_MAX] for a, b in zip(run, run[1:]))
+    return counts
+
+
+def index_transcript(db: DBSession, session_id: str | uuid.UUID, text: str) -> None:
+    """Add one transcript's terms to the session/unit/course rollups."""
+    index_counts(db, session_id, term_counts(text))
+
+
+def index_counts(db: DBSession, session_id: str | uuid.UUID, counts: Counter[str]) -> None:
+    """Add term counts to the session/unit/course rollups (one statement)."""
+    if not counts:
+        return
+    db.execute(
+        _UPSERT_SQL,
+        {"sid": uuid.UUID(str(session_id)), "terms": list(counts), "counts": list(counts.values())},
+    )
+
+
+def attach_session(db: DBSession, session_id: uuid.UUID, unit_id: uuid.UUID) -> None:
+    """Add a session's counts to a unit (and its course) rollup."""
+    db.execute(_ATTACH_SQL, {"sid": session_id, "unit": unit_id})
+
+
+def detach_session(db: DBSession, session_id: uuid.UUID, unit_id: uuid.UUID) -> None:
+    """Remove a session's counts from a unit (and its course) rollup."""
+    db.execute(_DETACH_SQL, {"sid": session_id, "unit": unit_id})
+    course_id = db.scalar(select(Unit.course_id).where(Unit.id == unit_id))
+    db.execute(
+        sa.delete(TopicTerm).where(
+            TopicTerm.scope.in_(("unit", "course")),
+            TopicTerm.scope_id.in_([unit_id, course_id]),
+            TopicTerm.count <= 0,
+        )
+    )
+
+
+def forget_session(db: DBSession, session_id: uuid.UUID, unit_id: uuid.UUID | None) -> None:
+    """Drop a deleted session's rows and its share of the rollups."""
+    if unit_id is not None:
+        detach_session(db, session_id, unit_id)
+    db.execute(sa.delete(TopicTerm).where(TopicTerm.scope == "session", TopicTerm.scope_id == session_id))
+
+
+def forget_unit(db: DBSession, unit_id: uuid.UUID) -> None:
+    """Drop a unit's rows, its sessions' rows and its share of the course rollup.
+
+    Call before deleting the unit: its sessions go by FK cascade, not through
+    `forget_session`."""
+    db.execute(_FORGET_UNIT_SQL, {"unit": unit_id})
+    course_id = db.scalar(select(Unit.course_id).where(Unit.id == unit_id))
+    db.execute(
+        sa.delete(TopicTerm).where(TopicTerm.scope == "course", TopicTerm.scope_id == course_id, TopicTerm.count <= 0)
+    )
+    db.execute(
+        sa.delete(TopicTerm).where(
+            TopicTerm.scope == "session", TopicTerm.scope_id.in_(select(Session.id).where(Session.unit_id == unit_id))
+        )
+    )
+    db.execute(sa.delete(TopicTerm).where(TopicTerm.scope == "unit", TopicTerm.scope_id == unit_id))
+
+
+def forget_courses(db: DBSession, course_ids: list[uuid.UUID]) -> None:
+    """Drop every row under courses about to be deleted (course, semester, ... deletes)."""
+    if not course_ids:
+        return
+    unit_ids = select(Unit.id).where(Unit.course_id.in_(course_ids))
+    session_ids = select(Session.id).where(Session.unit_id.in_(unit_ids))
+    db.execute(
+        sa.delete(TopicTerm).where(
+            sa.or_(
+                sa.and_(TopicTerm.scope == "session", TopicTerm.scope_id.in_(session_ids)),
+                sa.and_(TopicTerm.scope == "unit", TopicTerm.scope_id.in_(unit_ids)),
+                sa.and_(TopicTerm.scope == "course", TopicTerm.scope_id.in_(course_ids)),
+            )
+        )
+    )
+
+
+def topics(db: DBSession, scope: str, scope_ids: list[uuid.UUID], words: int = 60, phrases: int = 10) -> dict:
+    """Word cloud (single words) + top topics (two-word phrases) for a scope."""
+    if not scope_ids:
+        return {"wordCloud": [], "topTopics": []}
+    total = func.sum(TopicTerm.count).label("n")
+    base = (
+        select(TopicTerm.term, total)
+        .where(TopicTerm.scope == scope, TopicTerm.scope_id.in_(scope_ids))
+        .group_by(TopicTerm.term)
+        .order_by(total.desc(), TopicTerm.term)
+    )
+    cloud = db.execute(base.where(~TopicTerm.term.contains(" ")).limit(words)).all()
+    top = db.execute(base.where(TopicTerm.term.contains(" ")).limit(phrases)).all()
+    return {
+        "wordCloud": [{"text": t, "value": int(n)} for t, n in cloud],
+        "topTopics": [{"topic": t, "count": int(n)} for t, n in top],
+    }
@@ -0,0 +1,141 @@
+"""Voice-activity gate in front of Whisper (energy + zero-crossing rate, NumPy).
+
+A chunk is cut into 30 ms frames. A frame is speech when its RMS level is above
+`vad_energy_db` (dBFS) and its zero-crossing rate is below `vad_zcr_max` (broadband
+hiss and fan noise cross zero far more often than voiced speech). Speech frames
+are padded by `vad_pad_ms` on both sides so word onsets/tails survive, and a
+chunk with less than `vad_min_speech_ms` of speech is dropped before inference.
+Speech chunks are trimmed to the padded speech span and resampled to 16 kHz.
+
+Per session we count audio seconds received vs seconds sent to Whisper; the
+difference is the inference compute the gate saved.
+"""
+from __future__ import annotations
+
+import io
+import wave
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.session_state import session_registry
+
+try:
+    import numpy as np
+except ImportError:  # ships with faster-whisper; without it the gate passes audio through
+    np = None
+
+logger = get_logger("aura.stt.vad")
+
+WHISPER_RATE = 16000
+_FRAME_MS = 30
+
+
+def decode_wav(wav_bytes: bytes) -> tuple[Any, int] | None:
+    """16-bit PCM WAV -> (mono float32 samples in [-1, 1], sample rate); None otherwise."""
+    if np is None:
+        return None
+    try:
+        with wave.open(io.BytesIO(wav_bytes)) as w:
+            if w.getsampwidth() != 2:
+                return None
+            rate, channels = w.getframerate(), w.getnchannels()
+            raw = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def to_whisper_rate(samples: Any, rate: int) -> Any:
+    if rate == WHISPER_RATE or not len(samples):
+        return samples
+    n = int(round(len(samples) * WHISPER_RATE / rate))
+    return np.interp(np.linspace(0, len(samples) - 1, n), np.arange(len(samples)), samples).astype(np.float32)
+
+
+def speech_frames(samples: Any, rate: int) -> Any:
+    """Boolean mask, one entry per frame: energy above threshold and low ZCR."""
+    size = max(1, rate * _FRAME_MS // 1000)
+    frames = samples[: len(samples) // size * size].reshape(-1, size)
+    if not len(frames):
+        return np.zeros(0, dtype=bool)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    level_db = 20 * np.log10(np.maximum(rms, 1e-10))
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+    return (level_db > settings.vad_energy_db) & (zcr < settings.vad_zcr_max)
+
+
+def trim_to_speech(samples: Any, rate: int) -> Any | None:
+    """Padded speech span of a chunk, or None when it holds too little speech."""
+    mask = speech_frames(samples, rate)
+    if mask.sum() * _FRAME_MS < settings.vad_min_speech_ms:
+        return None
+    idx = np.flatnonzero(mask)
+    pad = settings.vad_pad_ms // _FRAME_MS
+    size = max(1, rate * _FRAME_MS // 1000)
+    start = max(0, (int(idx[0]) - pad) * size)
+    end = min(len(samples), (int(idx[-1]) + 1 + pad) * size)
+    return samples[start:end]
+
+
+class VadSavings:
+    __slots__ = ("chunks", "skipped", "audio_s", "sent_s")
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self.skipped = 0
+        self.audio_s = 0.0
+        self.sent_s = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "chunks": self.chunks,
+            "skippedChunks": self.skipped,
+            "audioS": round(self.audio_s, 1),
+            "sentS": round(self.sent_s, 1),
+            "savedFraction": round(1 - self.sent_s / self.audio_s, 3) if self.audio_s else 0.0,
+        }
+
+
+_savings: dict[str, VadSavings] = {}
+
+
+def _release(session_id: str) -> None:
+    stats = _savings.pop(session_id, None)
+    if stats is not None:
+        logger.info("stt.vad_summary", session_id=session_id, **stats.as_dict())
+
+
+session_registry.on_release(_release)
+
+
+def gate(session_id: str, wav_bytes: bytes) -> Any | None:
+    """What to send to Whisper for one WAV chunk: trimmed 16 kHz samples, the
+    original bytes (gate disabled / undecodable), or None when it is silence."""
+    decoded = decode_wav(wav_bytes) if settings.vad_enabled else None
+    if decoded is None:
+        return wav_bytes
+    return gate_samples(session_id, *decoded)
+
+
+def gate_samples(session_id: str, samples: Any, rate: int) -> Any | None:
+    """Trimmed 16 kHz speech of decoded samples (a view when no resampling is
+    needed), or None when the chunk is silence."""
+    if not settings.vad_enabled:
+        return to_whisper_rate(samples, rate)
+    stats = _savings.setdefault(session_id, VadSavings())
+    stats.chunks += 1
+    stats.audio_s += len(samples) / rate
+    speech = trim_to_speech(samples, rate)
+    if speech is None:
+        stats.skipped += 1
+        return None
+    stats.sent_s += len(speech) / rate
+    return to_whisper_rate(speech, rate)
+
+
+def savings() -> dict:
+    return {sid: s.as_dict() for sid, s in _savings.items()}
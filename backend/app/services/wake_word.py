@@ -0,0 +1,130 @@
+"""Server-side "Hey Aura" detection on the transcript stream, plus command dedupe.
+
+The matcher mirrors the client's (AudioCapture WAKE_RE): an anchor word
+("hey"/"hi"/"ok"…) followed by one of a fixed list of ASR spellings of "Aura"
+("ora", "aurora", "or a"…). No fuzzy matching: names like "Laura" or "Maura"
+are close to "aura" too. The command is the text after the match.
+
+Commands from both sides (server detection, client `voice_command`) go through
+`recent_commands`: a command nearly identical to one seen for the same session
+within `wake_dedupe_s` is a duplicate and is not dispatched again.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from difflib import SequenceMatcher
+
+from app.core.config import settings
+from app.services.session_state import session_registry
+
+_ANCHORS = frozenset({"hey", "hay", "hei", "hi", "ok", "okay"})
+# Keep in sync with WAKE_RE in frontend/src/components/audio/AudioCapture.tsx.
+_NAMES = frozenset({"aura", "aurra", "aurora", "ora", "oora", "orra", "hora", "era", "aro", "arrow", "aira"})
+_SPLIT_NAMES = frozenset({("or", "a"), ("are", "a"), ("hour", "a"), ("our", "a")})
+_TOKEN = re.compile(r"[A-Za-z']+")
+_EDGE = " ,.:;!?-–"
+_FINAL = (".", "?", "!")
+
+
+def split_wake(text: str) -> tuple[str, str] | None:
+    """(text before the wake phrase, command after it), or None without one."""
+    toks = [(m.group().lower(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+    for i, (tok, start, _) in enumerate(toks[:-1]):
+        if tok not in _ANCHORS:
+            continue
+        end = None
+        if toks[i + 1][0] in _NAMES:
+            end = toks[i + 1][2]
+        elif i + 2 < len(toks) and (toks[i + 1][0], toks[i + 2][0]) in _SPLIT_NAMES:
+            end = toks[i + 2][2]
+        if end is not None:
+            return text[:start].strip(), text[end:].strip(_EDGE)
+    return None
+
+
+class WakeTracker:
+    """Per-session wake state over one utterance of the streaming transcript.
+
+    Committed text before the wake phrase is transcript; everything after it in
+    the same utterance is the command. The command is dispatched early once two
+    consecutive partial hypotheses agree on it and it ends a sentence, otherwise
+    when the utterance ends (a pause)."""
+
+    __slots__ = ("utterance", "in_command", "last_command", "dispatched")
+
+    def __init__(self) -> None:
+        self.utterance = ""
+        self.in_command = False
+        self.last_command = ""
+        self.dispatched = False
+
+    def commit(self, text: str) -> str:
+        """Committed text -> the part that is lecture transcript (may be "")."""
+        self.utterance = f"{self.utterance} {text}".strip()
+        if self.in_command:
+            return ""
+        hit = split_wake(self.utterance)
+        if hit is None:
+            return text
+        self.in_command = True
+        before = hit[0]
+        # Only this commit's share of the pre-wake text is new.
+        already = len(self.utterance) - len(text)
+        return before[already:].strip() if len(before) > already else ""
+
+    def partial(self, text: str) -> str | None:
+        """Interim hypothesis -> a command to dispatch now, if it is stable."""
+        hypothesis = f"{self.utterance} {text}".strip()
+        hit = split_wake(hypothesis)
+        if hit is None or self.dispatched:
+            return None
+        command = hit[1]
+        stable = command and command == self.last_command and hypothesis.endswith(_FINAL)
+        self.last_command = command
+        if stable:
+            self.dispatched = True
+            return command
+        return None
+
+    def end(self) -> str | None:
+        """Utterance over -> its command, unless already dispatched. Resets."""
+        hit = split_wake(self.utterance)
+        command = hit[1] if hit and not self.dispatched else None
+        self.utterance, self.in_command, self.last_command, self.dispatched = "", False, "", False
+        return command or None
+
+
+def _norm(command: str) -> str:
+    hit = split_wake(command)
+    body = hit[1] if hit else command
+    return " ".join(_TOKEN.findall(body.lower()))
+
+
+class RecentCommands:
+    def __init__(self) -> None:
+        self._seen: dict[str, deque[tuple[float, str]]] = {}
+
+    def is_duplicate(self, session_id: str, command: str, now: float | None = None) -> bool:
+        """Record `command`; True if a near-identical one was seen within the window.
+
+        A longer command that merely starts like an earlier one ("explain" then
+        "explain the second law") is a new command, not a duplicate."""
+        now = time.monotonic() if now is None else now
+        norm = _norm(command)
+        seen = self._seen.setdefault(session_id, deque(maxlen=16))
+        while seen and now - seen[0][0] > settings.wake_dedupe_s:
+            seen.popleft()
+        for _, prior in seen:
+            if SequenceMatcher(None, prior, norm).ratio() >= 0.85:
+                return True
+        seen.append((now, norm))
+        return False
+
+    def drop(self, session_id: str) -> None:
+        self._seen.pop(session_id, None)
+
+
+recent_commands = RecentCommands()
+session_registry.on_release(recent_commands.drop)
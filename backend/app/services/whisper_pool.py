@@ -0,0 +1,318 @@
+"""Dedicated Whisper inference processes, preloaded and warmed at startup.
+
+`stt_workers` spawned processes each load one faster-whisper model
+(`stt_model_size` / `stt_compute_type` / `stt_cpu_threads`), transcribe a second
+of silence so the first real chunk doesn't pay for lazy initialisation, then
+serve jobs from one shared request queue. The queue is bounded at
+`stt_queue_depth`: when every worker is busy and the queue is full, new chunks
+are dropped (live audio goes stale faster than it can be caught up) and counted.
+
+Spawned at startup (`stt_preload`, on by default), else on the first chunk.
+Importing torch and loading (or downloading) the model takes a while, so a
+chunk's `stt_timeout_s` deadline only starts once a worker is ready; until
+then chunks wait up to `stt_startup_timeout_s` and come back empty past it.
+A worker that dies, while loading or serving, is respawned by the next chunk.
+
+Audio is passed as WAV bytes, float32 samples, or a `SharedAudio` window into a
+shared-memory buffer owned by the caller (no sample copy through the queue).
+
+Per chunk we record queue wait (enqueue → a worker picks it up) and inference
+time (inside the worker); both are served by `GET /debug/stt`.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import io
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+import wave
+from collections import OrderedDict
+from collections.abc import Callable
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import LatencyStats
+
+logger = get_logger("aura.stt.pool")
+
+_ATTACH_CACHE = 32  # shared segments a worker keeps mapped
+
+
+class SharedAudio(NamedTuple):
+    """float32 samples [start, stop) of a shared-memory segment."""
+
+    name: str
+    start: int
+    stop: int
+
+
+def _silence_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buf.getvalue()
+
+
+def load_faster_whisper(model_size: str, compute_type: str, cpu_threads: int) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _shared_view(audio: SharedAudio, attached: OrderedDict) -> Any:
+    import numpy as np
+
+    shm = attached.pop(audio.name, None) or shared_memory.SharedMemory(name=audio.name)
+    attached[audio.name] = shm
+    while len(attached) > _ATTACH_CACHE:
+        attached.popitem(last=False)[1].close()
+    return np.ndarray((audio.stop - audio.start,), dtype=np.float32, buffer=shm.buf, offset=audio.start * 4)
+
+
+def _transcribe(model: Any, audio: Any, language: str | None, word_timestamps: bool = False) -> Any:
+    """Text of one chunk, or [(start, end, word), ...] with `word_timestamps`."""
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = io.BytesIO(audio)
+    segments, _ = model.transcribe(audio, beam_size=1, language=language, word_timestamps=word_timestamps)
+    if word_timestamps:
+        return [(w.start, w.end, w.word) for seg in segments for w in (seg.words or [])]
+    return " ".join(seg.text.strip() for seg in segments).strip()
+
+
+def _serve(requests: Any, results: Any, loader: Callable[..., Any], model_args: tuple) -> None:
+    """Worker process body: load + warm the model, then serve until a None job."""
+    import os
+
+    model = loader(*model_args)
+    _transcribe(model, _silence_wav(), None)
+    results.put(("ready", os.getpid()))
+    attached: OrderedDict[str, Any] = OrderedDict()
+    while True:
+        job = requests.get()
+        if job is None:
+            return
+        job_id, audio, language, words = job
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            if isinstance(audio, SharedAudio):
+                audio = _shared_view(audio, attached)
+            text, error = _transcribe(model, audio, language, words), None
+        except Exception as exc:  # noqa: BLE001
+            text, error = ([] if words else ""), str(exc)
+        audio = None  # drop any shared view before a later close
+        results.put((job_id, text, started, time.perf_counter() - t0, error))
+
+
+class WhisperPool:
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_depth: int | None = None,
+        model_args: tuple | None = None,
+        loader: Callable[..., Any] = load_faster_whisper,
+        timeout_s: float | None = None,
+        startup_timeout_s: float | None = None,
+    ) -> None:
+        self.workers = workers or settings.stt_workers
+        self.queue_depth = queue_depth or settings.stt_queue_depth
+        self.model_args = model_args or (settings.stt_model_size, settings.stt_compute_type, settings.stt_cpu_threads)
+        self.timeout_s = timeout_s or settings.stt_timeout_s
+        self.startup_timeout_s = startup_timeout_s or settings.stt_startup_timeout_s
+        self._loader = loader
+        self._ctx: Any = None
+        self._procs: list[Any] = []
+        self._requests: Any = None
+        self._results: Any = None
+        self._reader: threading.Thread | None = None
+        self._pending: dict[int, tuple[asyncio.Future, float]] = {}
+        self._ids = itertools.count(1)
+        self._ready: set[int] = set()
+        self._ready_event = threading.Event()
+        self.unavailable = False
+        self.counts = {
+            "submitted": 0,
+            "completed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "timedOut": 0,
+            "notReady": 0,
+            "restarts": 0,
+        }
+        self.queue_wait = LatencyStats()
+        self.inference = LatencyStats()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._procs)
+
+    def start(self) -> bool:
+        """Spawn the workers (idempotent). False when faster-whisper isn't installed."""
+        if self._procs:
+            return True
+        if self._loader is load_faster_whisper and importlib.util.find_spec("faster_whisper") is None:
+            if not self.unavailable:
+                logger.warning("stt.whisper_unavailable", hint="pip install faster-whisper")
+            self.unavailable = True
+            return False
+        self._ctx = mp.get_context("spawn")  # never fork the event loop / DB pool
+        self._requests = self._ctx.Queue(maxsize=self.queue_depth)
+        self._results = self._ctx.Queue()
+        self._procs = [self._spawn(i) for i in range(self.workers)]
+        self._reader = threading.Thread(target=self._read_results, name="aura-whisper-results", daemon=True)
+        self._reader.start()
+        logger.info("stt.pool_started", workers=self.workers, model=self.model_args[0], depth=self.queue_depth)
+        return True
+
+    def _spawn(self, i: int) -> Any:
+        proc = self._ctx.Process(
+            target=_serve,
+            args=(self._requests, self._results, self._loader, self.model_args),
+            name=f"aura-whisper-{i}",
+            daemon=True,
+        )
+        proc.start()
+        return proc
+
+    def _reap(self) -> None:
+        """Respawn workers that died (while loading or serving)."""
+        for i, proc in enumerate(self._procs):
+            if proc.is_alive():
+                continue
+            logger.warning("stt.worker_died", pid=proc.pid, exitcode=proc.exitcode)
+            self._ready.discard(proc.pid)
+            self._ready_event.clear()
+            self.counts["restarts"] += 1
+            self._procs[i] = self._spawn(i)
+
+    async def _await_ready(self) -> bool:
+        """Wait until a worker is ready (up to `startup_timeout_s`); a chunk's deadline starts after."""
+        deadline = time.monotonic() + self.startup_timeout_s
+        while True:
+            self._reap()
+            if self._ready:
+                return True
+            if time.monotonic() > deadline:
+                self.counts["notReady"] += 1
+                logger.warning("stt.pool_not_ready", startup_timeout_s=self.startup_timeout_s)
+                return False
+            await asyncio.sleep(0.05)
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until every worker has loaded and warmed its model."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready_event.is_set():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def transcribe(
+        self, audio: bytes | Any, language: str | None = None, word_timestamps: bool = False
+    ) -> Any:
+        """Queue one chunk (WAV bytes, float32 samples or SharedAudio). Returns its text, or its
+        [(start, end, word), ...] with `word_timestamps`; None when not ready, dropped, timed out or
+        failed (an empty result means the audio had no words)."""
+        if not self.start() or not await self._await_ready():
+            return None
+        job_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = (fut, time.time())
+        try:
+            self._requests.put_nowait((job_id, audio, language, word_timestamps))
+        except queue.Full:
+            self._pending.pop(job_id, None)
+            self.counts["dropped"] += 1
+            logger.warning("stt.queue_full", depth=self.queue_depth)
+            return None
+        self.counts["submitted"] += 1
+        try:
+            return await asyncio.wait_for(fut, self.timeout_s)
+        except asyncio.TimeoutError:
+            self.counts["timedOut"] += 1
+            logger.warning("stt.inference_timeout", job_id=job_id, timeout_s=self.timeout_s)
+            return None
+        finally:
+            self._pending.pop(job_id, None)
+
+    def _read_results(self) -> None:
+        while True:
+            try:
+                msg = self._results.get()
+            except (EOFError, OSError):
+                return
+            if msg is None:
+                return
+            if msg[0] == "ready":
+                self._ready.add(msg[1])
+                if len(self._ready) >= self.workers:
+                    self._ready_event.set()
+                logger.info("stt.worker_ready", pid=msg[1])
+                continue
+            job_id, text, started, infer_s, error = msg
+            entry = self._pending.get(job_id)
+            if entry is None:
+                continue  # timed out already
+            fut, enqueued = entry
+            try:
+                fut.get_loop().call_soon_threadsafe(
+                    self._resolve, fut, text, max(0.0, started - enqueued), infer_s, error
+                )
+            except RuntimeError:  # loop already closed (shutdown)
+                continue
+
+    def _resolve(self, fut: asyncio.Future, text: Any, wait_s: float, infer_s: float, error: str | None) -> None:
+        self.queue_wait.observe(wait_s)
+        self.inference.observe(infer_s)
+        if error:
+            self.counts["failed"] += 1
+            logger.warning("stt.inference_failed", error=error)
+        else:
+            self.counts["completed"] += 1
+        if not fut.done():
+            fut.set_result(None if error else text)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if not self._procs:
+            return
+        for _ in self._procs:
+            try:
+                self._requests.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._results.put(None)
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self._procs, self._reader = [], None
+        self._ready.clear()
+        self._ready_event.clear()
+
+    def stats(self) -> dict:
+        return {
+            "available": not self.unavailable,
+            "workers": self.workers,
+            "workersReady": len(self._ready),
+            "workersAlive": sum(p.is_alive() for p in self._procs),
+            "model": {"size": self.model_args[0], "computeType": self.model_args[1], "cpuThreads": self.model_args[2]},
+            "queueDepth": self.queue_depth,
+            "inFlight": len(self._pending),
+            **self.counts,
+            "queueWait": self.queue_wait.summary(),
+            "inference": self.inference.summary(),
+        }
+
+
+whisper_pool = WhisperPool()
@@ -5,18 +5,22 @@ are registered in later phases; this module owns connection lifecycle + helpers.
 """
 from __future__ import annotations
 
+import asyncio
 import uuid
 from urllib.parse import parse_qs
 
 import socketio
 
 from app.core.config import settings
-from app.core.database import session_scope
+from app.core.database import async_session_scope
 from app.core.logging import get_logger
 from app.core.security import decode_token
 from sqlalchemy import select
 
 from app.models.session import Session
+from app.services.board_mirror import tier_of
+from app.services.catchup import catchup_log
+from app.services.session_state import session_registry
 
 logger = get_logger("aura.ws")
 
@@ -28,7 +32,7 @@ sio = socketio.AsyncServer(
     engineio_logger=False,
 )
 
-# sid -> {"user_id": str, "session_id": str, "role": "teacher"|"student"}
+# sid -> {"user_id": str, "session_id": str, "role": "teacher"|"student"[, "tier": board quality]}
 active_connections: dict[str, dict[str, str]] = {}
 
 
@@ -37,6 +41,11 @@ def live_room(session_id: str) -> str:
     return f"live:{session_id}"
 
 
+def board_room(session_id: str, tier: str) -> str:
+    """Students of a session receiving board frames at one quality tier."""
+    return f"live:{session_id}:board:{tier}"
+
+
 def _extract_session_id(environ: dict) -> str | None:
     qs = parse_qs(environ.get("QUERY_STRING", ""))
     vals = qs.get("session_id")
@@ -50,24 +59,38 @@ async def _connect_student(sid: str, auth: dict) -> bool:
     if not code:
         logger.warning("ws.connect.student.no_code", sid=sid)
         return False
-    with session_scope() as db:
-        sess = db.scalar(select(Session).where(Session.join_code == str(code).upper()))
-        if sess is None:
-            logger.warning("ws.connect.student.bad_code", sid=sid)
-            return False
-        session_id = str(sess.id)
-        subject = sess.subject
+    async with async_session_scope() as db:
+        row = (
+            await db.execute(select(Session.id, Session.subject).where(Session.join_code == str(code).upper()))
+        ).first()
+    if row is None:
+        logger.warning("ws.connect.student.bad_code", sid=sid)
+        return False
+    session_id, subject = str(row.id), row.subject
 
     await sio.enter_room(sid, session_id)
     await sio.enter_room(sid, live_room(session_id))
-    active_connections[sid] = {"user_id": "", "session_id": session_id, "role": "student"}
+    tier = tier_of((auth or {}).get("quality"))
+    await sio.enter_room(sid, board_room(session_id, tier))
+    active_connections[sid] = {"user_id": "", "session_id": session_id, "role": "student", "tier": tier}
+    session_registry.connect(session_id, sid)
     logger.info("ws.connect.student", sid=sid, session_id=session_id)
     await sio.emit(
-        "connected", {"sessionId": session_id, "subject": subject, "role": "student"}, to=sid
+        "connected", {"sessionId": session_id, "subject": subject, "role": "student", "quality": tier}, to=sid
     )
+    asyncio.create_task(_send_catchup(sid, session_id, tier))
     return True
 
 
+async def _send_catchup(sid: str, session_id: str, tier: str) -> None:
+    """One `catchup` {board, transcripts, commands} so a late joiner needn't wait
+    for the next snapshot or fetch history over REST."""
+    from app.workers.mirror_worker import current_frame  # mirror_worker imports this module
+
+    board = await current_frame(session_id, tier)
+    await sio.emit("catchup", {"board": board, **catchup_log.snapshot(session_id)}, to=sid)
+
+
 @sio.event
 async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
     """Teacher: JWT + owned session_id. Student: join code, read-only."""
@@ -93,11 +116,11 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
         return False
 
     # Verify the session exists and belongs to this user.
-    with session_scope() as db:
-        sess = db.get(Session, sess_uuid)
-        if sess is None or sess.teacher_id != user_id:
-            logger.warning("ws.connect.session_denied", sid=sid, session_id=session_id)
-            return False
+    async with async_session_scope() as db:
+        teacher_id = await db.scalar(select(Session.teacher_id).where(Session.id == sess_uuid))
+    if teacher_id is None or teacher_id != user_id:
+        logger.warning("ws.connect.session_denied", sid=sid, session_id=session_id)
+        return False
 
     await sio.enter_room(sid, session_id)
     active_connections[sid] = {
@@ -105,6 +128,7 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
         "session_id": session_id,
         "role": "teacher",
     }
+    session_registry.connect(session_id, sid)
     logger.info("ws.connect", sid=sid, session_id=session_id, user_id=str(user_id))
     await sio.emit("connected", {"sessionId": session_id}, to=sid)
     return True
@@ -114,9 +138,11 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
 async def disconnect(sid: str) -> None:
     info = active_connections.pop(sid, None)
     if info:
+        session_registry.disconnect(info["session_id"], sid)
         await sio.leave_room(sid, info["session_id"])
         if info.get("role") == "student":
             await sio.leave_room(sid, live_room(info["session_id"]))
+            await sio.leave_room(sid, board_room(info["session_id"], info["tier"]))
     logger.info("ws.disconnect", sid=sid)
 
 
@@ -127,7 +153,8 @@ async def ping(sid: str, data: dict | None = None) -> None:
 
 # ---- broadcast helpers used by workers in later phases ----
 async def broadcast_to_session(session_id: str, event: str, data: dict) -> None:
-    """Emit an event to everyone in a session room."""
+    """Emit an event to everyone in a session room (recorded for late joiners)."""
+    catchup_log.record(session_id, event, data)
     await sio.emit(event, data, room=session_id)
 
 
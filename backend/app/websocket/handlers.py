@@ -5,10 +5,14 @@ from __future__ import annotations
 import asyncio
 
 from app.core.logging import get_logger
-from app.websocket.connection import active_connections, live_room, sio
+from app.services.audio_codec import pcm_rate
+from app.services.board_mirror import tier_of
+from app.services.wake_word import recent_commands
+from app.websocket.connection import active_connections, board_room, sio
 from app.workers.llm_worker import process_command
-from app.workers.stt_worker import save_transcript_text, transcribe_audio
-from app.workers.vision_worker import process_snapshot
+from app.workers.mirror_worker import publish, send_keyframe
+from app.workers.stt_worker import ingest_opus, ingest_pcm16, save_transcript_text, transcribe_audio
+from app.workers.vision_worker import submit_snapshot
 
 logger = get_logger("aura.ws.handlers")
 
@@ -22,6 +26,12 @@ def _session_for(sid: str) -> str | None:
     return None
 
 
+def _student(sid: str) -> dict | None:
+    """Connection info for a read-only student viewer (board quality, resync)."""
+    info = active_connections.get(sid)
+    return info if info and info.get("role") == "student" else None
+
+
 @sio.on("transcript_text")
 async def handle_transcript_text(sid: str, data: dict) -> None:
     session_id = _session_for(sid)
@@ -33,12 +43,30 @@ async def handle_transcript_text(sid: str, data: dict) -> None:
 
 
 @sio.on("audio_chunk")
-async def handle_audio_chunk(sid: str, data: dict) -> None:
+async def handle_audio_chunk(sid: str, data: dict | bytes) -> None:
+    """Binary attachments: raw bytes (16 kHz PCM16), or {format: "pcm16", data,
+    sampleRate?} / {format: "opus", data: [packet, ...]}. A base64 string in
+    `data`/`audio` is the legacy WAV path."""
     session_id = _session_for(sid)
     if not session_id:
         return
+    if isinstance(data, (bytes, bytearray)):
+        asyncio.create_task(ingest_pcm16(session_id, data))
+        return
     audio = (data or {}).get("data") or (data or {}).get("audio")
-    if audio:
+    if not audio:
+        return
+    fmt = data.get("format")
+    if fmt == "opus":
+        packets = audio if isinstance(audio, list) else [audio]
+        asyncio.create_task(ingest_opus(session_id, [p for p in packets if isinstance(p, (bytes, bytearray))]))
+    elif isinstance(audio, (bytes, bytearray)):
+        rate = pcm_rate(data.get("sampleRate"))
+        if rate is None:
+            logger.warning("ws.audio_bad_rate", session_id=session_id, rate=repr(data.get("sampleRate"))[:32])
+            return
+        asyncio.create_task(ingest_pcm16(session_id, audio, rate))
+    elif isinstance(audio, str):
         asyncio.create_task(transcribe_audio(session_id, audio))
 
 
@@ -50,6 +78,8 @@ async def handle_voice_command(sid: str, data: dict) -> None:
     command = (data or {}).get("command", "")
     if not command.strip():
         return
+    if recent_commands.is_duplicate(session_id, command):
+        return  # already dispatched from the transcript stream (or a double send)
     await sio.emit("command_processing", {"message": "Processing…"}, to=sid)
     asyncio.create_task(process_command(session_id, command))
 
@@ -61,14 +91,29 @@ async def handle_canvas_snapshot(sid: str, data: dict) -> None:
         return
     image = (data or {}).get("imageData") or (data or {}).get("image")
     if image:
-        # Mirror the board to read-only student viewers (live room only — the
-        # teacher already has the canvas locally).
-        await sio.emit("board_update", {"image": image}, room=live_room(session_id))
-        asyncio.create_task(
-            process_snapshot(
-                session_id,
-                image,
-                (data or {}).get("tldrawState"),
-                (data or {}).get("pageNumber", 1),
-            )
-        )
+        # Mirror the board to read-only student viewers (student rooms only —
+        # the teacher already has the canvas locally).
+        publish(session_id, image)
+        submit_snapshot(session_id, image, (data or {}).get("tldrawState"), (data or {}).get("pageNumber", 1))
+
+
+@sio.on("board_quality")
+async def handle_board_quality(sid: str, data: dict) -> None:
+    """Student switches board quality tier; the new tier's current frame follows."""
+    info = _student(sid)
+    if not info:
+        return
+    tier = tier_of((data or {}).get("quality"))
+    if tier != info["tier"]:
+        await sio.leave_room(sid, board_room(info["session_id"], info["tier"]))
+        await sio.enter_room(sid, board_room(info["session_id"], tier))
+        info["tier"] = tier
+    await send_keyframe(sid, info["session_id"], tier)
+
+
+@sio.on("board_resync")
+async def handle_board_resync(sid: str, data: dict | None = None) -> None:
+    """Student has no frame (just joined) or missed a delta: send a full frame."""
+    info = _student(sid)
+    if info:
+        await send_keyframe(sid, info["session_id"], info["tier"])
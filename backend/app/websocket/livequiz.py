@@ -5,23 +5,29 @@ resetting on restart is acceptable for a classroom. Teacher events are guarded b
 the teacher-only connection role; student events resolve the session from the
 student's authenticated connection. All student-facing emits target the live room
 ONLY, and the teacher (host) is addressed by its own sid — so a socket that sits in
-both rooms never receives an event twice.
+both rooms never receives an event twice. Games are released with the session
+(see app.services.session_state).
 """
 from __future__ import annotations
 
+import json
 import time
 import uuid
 
-from app.core.database import session_scope
+from sqlalchemy import select
+
+from app.core.database import async_session_scope
 from app.core.logging import get_logger
 from app.models.quiz import Quiz
 from app.models.session import Session
+from app.services.session_state import RECORD_OVERHEAD, session_registry
 from app.websocket.connection import active_connections, live_room, sio
 
 logger = get_logger("aura.ws.livequiz")
 
 # session_id -> game state
 _games: dict[str, dict] = {}
+session_registry.on_release(lambda session_id: _games.pop(session_id, None))
 
 
 def _role_session(sid: str, role: str) -> str | None:
@@ -31,6 +37,13 @@ def _role_session(sid: str, role: str) -> str | None:
     return None
 
 
+def _drop_game(session_id: str) -> dict | None:
+    game = _games.pop(session_id, None)
+    if game is not None:
+        session_registry.touch(session_id, -game["bytes"])
+    return game
+
+
 def _leaderboard(game: dict) -> list[dict]:
     players = [{"name": p["name"], "score": p["score"]} for p in game["players"].values()]
     players.sort(key=lambda p: -p["score"])
@@ -49,21 +62,27 @@ async def livequiz_start(sid: str, data: dict) -> None:
         qid = uuid.UUID(str(quiz_id))
     except ValueError:
         return
-    with session_scope() as db:
-        quiz = db.get(Quiz, qid)
-        if quiz is None:
-            return
-        sess = db.get(Session, quiz.session_id) if quiz.session_id else None
-        # Only the owning teacher may host this quiz live.
-        if sess is None or str(sess.teacher_id) != active_connections[sid]["user_id"]:
-            return
-        questions = (quiz.quiz_data or {}).get("questions", [])
-        subject = sess.subject
+    async with async_session_scope() as db:
+        row = (
+            await db.execute(
+                select(Quiz.quiz_data, Session.teacher_id, Session.subject)
+                .join(Session, Session.id == Quiz.session_id)
+                .where(Quiz.id == qid)
+            )
+        ).first()
+    # Only the owning teacher may host this quiz live.
+    if row is None or str(row.teacher_id) != active_connections[sid]["user_id"]:
+        return
+    questions = (row.quiz_data or {}).get("questions", [])
+    subject = row.subject
     if not questions:
         return
 
+    _drop_game(session_id)
+    size = RECORD_OVERHEAD + len(json.dumps(questions))
     _games[session_id] = {
         "host": sid,
+        "bytes": size,
         "questions": questions,
         "subject": subject,
         "current": -1,
@@ -71,6 +90,7 @@ async def livequiz_start(sid: str, data: dict) -> None:
         "players": {},  # sid -> {name, score}
         "answers": {},  # qindex -> {sid: choice}
     }
+    session_registry.touch(session_id, size)
     await sio.emit(
         "livequiz_started", {"subject": subject, "total": len(questions)}, room=live_room(session_id)
     )
@@ -87,6 +107,10 @@ async def livequiz_join(sid: str, data: dict) -> None:
     if not game:
         return
     name = ((data or {}).get("name") or "Player").strip()[:40] or "Player"
+    if sid not in game["players"]:
+        size = RECORD_OVERHEAD + len(name)
+        game["bytes"] += size
+        session_registry.touch(session_id, size)
     game["players"][sid] = {"name": name, "score": 0}
     await sio.emit("livequiz_joined", {"name": name}, to=sid)
     await sio.emit("livequiz_players", {"count": len(game["players"])}, to=game["host"])
@@ -172,7 +196,7 @@ async def livequiz_end(sid: str, data: dict) -> None:
     session_id = _role_session(sid, "teacher")
     if not session_id:
         return
-    game = _games.pop(session_id, None)
+    game = _drop_game(session_id)
     if not game:
         return
     leaderboard = _leaderboard(game)
@@ -1,6 +1,12 @@
 """Compression worker — summarize the live buffer into compressed_history.
 
-Auto-triggered when the ContextManager buffer crosses the token limit.
+Auto-triggered when the ContextManager buffer crosses the token limit. The whole
+buffer is compressed as a tiered leaf (see app.services.compression), then folded
+into the session's logarithmic history.
+
+Single-flight per session: at most one compression runs at a time. Triggers that
+arrive mid-compression are coalesced into one follow-up pass, and the buffer is
+snapshotted up to a watermark so items added during the LLM call survive.
 Emits compression_started / compression_complete for the UI token chip.
 """
 from __future__ import annotations
@@ -8,56 +14,111 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
+from sqlalchemy import select
+
 from app.core.logging import get_logger
-from app.core.database import session_scope
+from app.core.database import async_session_scope
 from app.models.session import Session
-from app.services.ai_service import ai_service
+from app.services.compression import compress_leaf, fold
 from app.services.context_manager import context_manager
 from app.websocket.connection import broadcast_to_session
 
 logger = get_logger("aura.compression")
 
 
+class CompressionCoordinator:
+    """Per-session single-flight gate around run_compression.
+
+    The first trigger runs the compression inline; triggers that land while it is
+    in flight only set a rerun flag and return. When the run finishes, one
+    follow-up pass runs if the buffer is (still) over the limit. The asyncio loop
+    is single-threaded, so the check-and-claim below needs no lock; across worker
+    processes the context manager's lease provides the same guarantee.
+    """
+
+    def __init__(self) -> None:
+        self._running: set[str] = set()
+        self._rerun: set[str] = set()
+
+    def in_flight(self, session_id: str) -> bool:
+        return session_id in self._running
+
+    async def trigger(self, session_id: str) -> None:
+        if not await context_manager.should_compress(session_id):
+            return
+        if session_id in self._running:
+            self._rerun.add(session_id)
+            return
+        self._running.add(session_id)
+        try:
+            # Shared buffer mode: another worker process may hold the session.
+            if not await context_manager.acquire_lease(session_id):
+                return
+            try:
+                while True:
+                    self._rerun.discard(session_id)
+                    await run_compression(session_id)
+                    if session_id not in self._rerun or not await context_manager.should_compress(session_id):
+                        break
+            finally:
+                await context_manager.release_lease(session_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("compression.failed", session_id=session_id, error=str(exc))
+        finally:
+            self._running.discard(session_id)
+            self._rerun.discard(session_id)
+
+
+coordinator = CompressionCoordinator()
+
+
 async def maybe_compress(session_id: str) -> None:
-    if context_manager.should_compress(session_id):
-        await run_compression(session_id)
+    await coordinator.trigger(session_id)
 
 
 async def run_compression(session_id: str) -> None:
-    text = context_manager.snapshot_text(session_id)
+    text, token_count, watermark = await context_manager.snapshot(session_id)
     if not text.strip():
         return
 
-    token_count = context_manager.tokens(session_id)
     await broadcast_to_session(
         session_id, "compression_started", {"status": "started", "message": "Compressing context…"}
     )
 
-    summary = await ai_service.compress_context(text)
-    method = "fallback" if summary.pop("_fallback", False) else "llm"
+    summary, method = await compress_leaf(text)
+    sid = uuid.UUID(session_id)
 
-    segment_num = 0
-    with session_scope() as db:
-        sess = db.get(Session, uuid.UUID(session_id))
+    async with async_session_scope() as db:
+        history = list(await db.scalar(select(Session.compressed_history).where(Session.id == sid)) or [])
+
+    segment_num = (int(history[-1].get("segment_num", 0)) if history else 0) + 1
+    history = await fold(
+        history,
+        {
+            "segment_num": segment_num,
+            "time_range": datetime.now(timezone.utc).isoformat(),
+            "token_count": token_count,
+            "compression_method": method,
+            "summary": summary,
+        },
+    )
+    async with async_session_scope() as db:
+        sess = await db.get(Session, sid)
         if sess is not None:
-            history = list(sess.compressed_history or [])
-            segment_num = len(history) + 1
-            history.append(
-                {
-                    "segment_num": segment_num,
-                    "time_range": datetime.now(timezone.utc).isoformat(),
-                    "token_count": token_count,
-                    "compression_method": method,
-                    "summary": summary,
-                }
-            )
             sess.compressed_history = history
-            sess.active_buffer_tokens = 0
+            sess.active_buffer_tokens = max(0, await context_manager.tokens(session_id) - token_count)
 
-    context_manager.clear(session_id)
+    remaining = await context_manager.clear_through(session_id, watermark)
     await broadcast_to_session(
         session_id,
         "compression_complete",
         {"status": "complete", "method": method, "segmentNum": segment_num},
     )
-    logger.info("compression.done", session_id=session_id, method=method, segment=segment_num)
+    await broadcast_to_session(session_id, "context_update", {"tokens": remaining})
+    logger.info(
+        "compression.done",
+        session_id=session_id,
+        method=method,
+        segment=segment_num,
+        segments=len(history),
+    )
@@ -2,17 +2,31 @@
 
 Create a Command row, classify intent, assemble fused context, execute the
 intent, persist the response (+ Quiz for quizzes), and broadcast command_response.
+
+Persistence is two units of work per command, whatever the intent:
+
+1. one transaction, run while the intent is classified: INSERT the Command
+   (RETURNING its id and the session's language) and read the fused context;
+2. one statement at the end: UPDATE the Command, with the Quiz INSERT riding
+   along as a data-modifying CTE (the share code is drawn beforehand, so the
+   response can carry it).
+
+Time spent in both is recorded per command (`command_stats`, /debug/llm).
 """
 from __future__ import annotations
 
+import asyncio
 import time
 import uuid
 
+from sqlalchemy import insert, select, update
+
 from app.core.logging import get_logger
-from app.core.database import session_scope
+from app.core.database import async_session_scope
+from app.core.metrics import LatencyStats
 from app.models.command import Command
 from app.models.enums import CommandIntent, CommandStatus
-from app.models.quiz import Quiz
+from app.models.quiz import Quiz, generate_share_code
 from app.models.session import Session
 from app.services.ai_service import ai_service
 from app.services.command_payload import response_type_for
@@ -23,6 +37,14 @@ logger = get_logger("aura.llm")
 
 _WAKE = "hey aura"
 
+_db_time = LatencyStats()
+_total_time = LatencyStats()
+
+
+def command_stats() -> dict:
+    """Per-command DB time (both units of work) against end-to-end time."""
+    return {"commands": _total_time.count, "dbTime": _db_time.summary(), "total": _total_time.summary()}
+
 
 def _strip_wake(raw: str) -> str:
     low = raw.lower()
@@ -38,37 +60,46 @@ async def process_command(session_id: str, raw_command: str) -> None:
     command = _strip_wake(raw_command)
     ai_service.reset_tokens()  # count LLM tokens for this command (classify + generate)
 
-    with session_scope() as db:
-        row = Command(
-            session_id=uuid.UUID(session_id),
-            raw_command=raw_command,
-            status=CommandStatus.PROCESSING,
-        )
-        db.add(row)
-        db.flush()
-        command_id = row.id
+    sid = uuid.UUID(session_id)
+
+    async def begin() -> tuple[uuid.UUID, str, str, float]:
+        t0 = time.perf_counter()
+        async with async_session_scope() as db:
+            command_id, language = (
+                await db.execute(
+                    insert(Command)
+                    .values(session_id=sid, raw_command=raw_command, status=CommandStatus.PROCESSING)
+                    .returning(Command.id, select(Session.language).where(Session.id == sid).scalar_subquery())
+                )
+            ).one()
+            context = await get_context(session_id, db=db)
+        return command_id, language or "English", context, time.perf_counter() - t0
 
+    # Classify in this task (the token counter is per task); the DB work overlaps it.
+    started = asyncio.create_task(begin())
     intent = await ai_service.classify_intent(command)
-    context = get_context(session_id)
-    with session_scope() as db:
-        sess = db.get(Session, uuid.UUID(session_id))
-        language = sess.language if sess else "English"
+    command_id, language, context, db_s = await started
     logger.info("llm.classified", session_id=session_id, intent=intent.value, command=command[:60])
 
     data: dict
     response_type = response_type_for(intent)
     status = CommandStatus.COMPLETED
     error: str | None = None
+    quiz: dict | None = None  # Quiz row to insert with the final write
 
     try:
         if intent == CommandIntent.GENERATE_QUIZ:
             data = await ai_service.generate_quiz(context, language=language)
             if "questions" in data:
-                with session_scope() as db:
-                    quiz = Quiz(session_id=uuid.UUID(session_id), command_id=command_id, quiz_data=data)
-                    db.add(quiz)
-                    db.flush()
-                    data = {**data, "shareCode": quiz.share_code}
+                code = generate_share_code()
+                quiz = {
+                    "id": uuid.uuid4(),
+                    "session_id": sid,
+                    "command_id": command_id,
+                    "share_code": code,
+                    "quiz_data": data,
+                }
+                data = {**data, "shareCode": code}
         elif intent == CommandIntent.SUMMARIZE:
             data = await ai_service.summarize(context, language=language)
         elif intent == CommandIntent.EXPLAIN:
@@ -96,15 +127,26 @@ async def process_command(session_id: str, raw_command: str) -> None:
         data, status, error = {"error": "Generation failed. Please try again."}, CommandStatus.FAILED, str(exc)
 
     ms = int((time.time() - start) * 1000)
-    with session_scope() as db:
-        row = db.get(Command, command_id)
-        if row:
-            row.intent = intent
-            row.llm_response = data
-            row.status = status
-            row.processing_time_ms = ms
-            row.tokens_used = ai_service.tokens_used()
-            row.error_message = error
+    finish = (
+        update(Command)
+        .where(Command.id == command_id)
+        .values(
+            intent=intent,
+            llm_response=data,
+            status=status,
+            processing_time_ms=ms,
+            tokens_used=ai_service.tokens_used(),
+            error_message=error,
+        )
+    )
+    if quiz is not None:
+        finish = finish.add_cte(insert(Quiz).values(**quiz).cte("new_quiz"))
+    t0 = time.perf_counter()
+    async with async_session_scope() as db:
+        await db.execute(finish)
+    db_s += time.perf_counter() - t0
+    _db_time.observe(db_s)
+    _total_time.observe(time.time() - start)
 
     await broadcast_to_session(
         session_id,
@@ -117,4 +159,4 @@ async def process_command(session_id: str, raw_command: str) -> None:
             "processingTime": ms,
         },
     )
-    logger.info("llm.responded", session_id=session_id, intent=intent.value, ms=ms)
+    logger.info("llm.responded", session_id=session_id, intent=intent.value, ms=ms, db_ms=round(db_s * 1000, 1))
@@ -0,0 +1,102 @@
+"""Board mirror publisher: student-grade frames for the live rooms.
+
+The teacher's snapshot is encoded once per quality tier (app.services.board_mirror)
+and each tier's payload is emitted once to that tier's room, so a 200-student
+room costs one encode and one (small) payload per tier, not 200 full PNGs.
+
+Latest-wins per session, like the vision slots: while a snapshot is being
+encoded, a newer one replaces any that is waiting. Without the image stack
+the original image is mirrored as before.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+
+from app.core.logging import get_logger
+from app.services import board_mirror
+from app.services.board_mirror import MirrorState
+from app.services.session_state import session_registry
+from app.websocket.connection import board_room, live_room, sio
+
+logger = get_logger("aura.mirror")
+
+_states: dict[str, MirrorState] = {}
+_pending: dict[str, str] = {}  # session -> newest image waiting
+_raw: dict[str, str] = {}  # session -> last image, when mirroring without the image stack
+_running: set[str] = set()
+stats = {"frames": 0, "keyframes": 0, "deltas": 0, "sourceBytes": 0, "sentBytes": 0, "superseded": 0}
+
+
+def _release(session_id: str) -> None:
+    _states.pop(session_id, None)
+    _pending.pop(session_id, None)
+    _raw.pop(session_id, None)
+
+
+session_registry.on_release(_release)
+
+
+def mirror_stats() -> dict:
+    src = stats["sourceBytes"]
+    return {**stats, "sentRatio": round(stats["sentBytes"] / src, 3) if src else None}
+
+
+def publish(session_id: str, image_data: str) -> None:
+    """Queue the teacher's newest board image for the student rooms."""
+    if session_id in _pending:
+        stats["superseded"] += 1
+    _pending[session_id] = image_data
+    if session_id not in _running:
+        _running.add(session_id)
+        asyncio.create_task(_run(session_id))
+
+
+async def _run(session_id: str) -> None:
+    try:
+        while session_id in _pending:
+            image = _pending.pop(session_id)
+            try:
+                await _publish_one(session_id, image)
+            except Exception as exc:  # noqa: BLE001 — the next snapshot retries
+                logger.warning("mirror.publish_failed", session_id=session_id, error=str(exc))
+    finally:
+        _running.discard(session_id)
+
+
+async def _publish_one(session_id: str, image: str) -> None:
+    b64 = image.split(",", 1)[1] if image.startswith("data:") else image
+    if not board_mirror.available():
+        _raw[session_id] = image
+        await sio.emit("board_update", {"image": image}, room=live_room(session_id))
+        return
+    state = _states.setdefault(session_id, MirrorState())
+    before = state.nbytes
+    payloads = await asyncio.to_thread(board_mirror.encode, state, base64.b64decode(b64))
+    session_registry.touch(session_id, state.nbytes - before)
+    if payloads is None:
+        logger.warning("mirror.bad_image", session_id=session_id)
+        return
+    stats["frames"] += 1
+    stats["sourceBytes"] += len(b64)
+    for tier, payload in payloads.items():
+        stats["keyframes" if payload["key"] else "deltas"] += 1
+        stats["sentBytes"] += len(payload.get("image", "")) + sum(len(t["image"]) for t in payload.get("tiles", ()))
+        await sio.emit("board_update", {**payload, "tier": tier}, room=board_room(session_id, tier))
+
+
+async def current_frame(session_id: str, tier: str) -> dict | None:
+    """Full `board_update` payload of the session's board at `tier`, if any yet."""
+    state = _states.get(session_id)
+    if state is None:
+        raw = _raw.get(session_id)
+        return {"image": raw} if raw else None
+    payload = await asyncio.to_thread(board_mirror.keyframe, state, tier)
+    return {**payload, "tier": tier} if payload else None
+
+
+async def send_keyframe(sid: str, session_id: str, tier: str) -> None:
+    """Current full frame of `tier` to one viewer (tier switch, resync)."""
+    payload = await current_frame(session_id, tier)
+    if payload is not None:
+        await sio.emit("board_update", payload, to=sid)
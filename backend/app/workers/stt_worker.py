@@ -2,23 +2,51 @@
 
 Two paths:
   * save_transcript_text  — browser Web Speech API sends finalized text (default path).
-  * transcribe_audio      — raw audio chunks run through Whisper (faster-whisper),
-                            lazy-loaded; no-ops gracefully if Whisper isn't installed.
-Both persist a Transcript and broadcast `transcript_update` to the session room.
+  * transcribe_audio      — raw audio chunks run through Whisper (faster-whisper) in
+                            the dedicated worker pool (app.services.whisper_pool);
+                            no-ops gracefully if Whisper isn't installed.
+Both queue finalized text on the write-behind transcript writer, which persists
+Transcript rows in bulk and broadcasts them as `transcript_batch`.
+
+Raw audio arrives as binary Socket.IO attachments (16 kHz PCM16 or Opus packets,
+see app.services.audio_codec) or, for older clients, as base64 WAV. It is
+streamed per session (app.services.asr_stream): interim hypotheses
+go out as `transcript_partial` {text}, and only text two passes agree on (or
+that a pause finalises) becomes a Transcript row. Chunks that arrive while a
+pass is running are queued and folded into the next pass together.
+
+Both paths also listen for "Hey Aura" (app.services.wake_word): the command
+after it is dispatched to process_command straight from the transcript, and
+text from the wake phrase on is not stored as lecture transcript.
 """
 from __future__ import annotations
 
 import asyncio
 import base64
 import uuid
-from datetime import datetime, timezone
+from typing import Any
 
+from sqlalchemy import select
+
+from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.database import session_scope
-from app.models.transcript import Transcript
-from app.services.context_manager import context_manager
+from app.core.database import async_session_scope
+from app.models.session import Session
+from app.services import vad
+from app.services.asr_stream import AsrStream, whisper_language
+from app.services.audio_codec import (
+    OPUS_RATE,
+    OpusDecoder,
+    binary_audio_available,
+    opus_available,
+    pcm16_to_float32,
+)
+from app.services.session_state import session_registry
+from app.services.wake_word import WakeTracker, recent_commands, split_wake
+from app.services.whisper_pool import whisper_pool
 from app.websocket.connection import broadcast_to_session
-from app.workers.compression_worker import maybe_compress
+from app.workers.llm_worker import process_command
+from app.workers.transcript_writer import transcript_writer
 
 logger = get_logger("aura.stt")
 
@@ -28,75 +56,159 @@ _NOISE = {
     "bye.", "bye", ".", "okay.", "so", "uh", "um",
 }
 
-_whisper_model = None  # lazy singleton
 
+_streams: dict[str, AsrStream] = {}
+_opus: dict[str, OpusDecoder] = {}
+_wake: dict[str, WakeTracker] = {}
 
-def is_noise(text: str) -> bool:
-    return text.strip().lower() in _NOISE
 
+def _release_stream(session_id: str) -> None:
+    _opus.pop(session_id, None)
+    _wake.pop(session_id, None)
+    stream = _streams.pop(session_id, None)
+    if stream is not None and not stream.running:
+        stream.close()  # a running pass closes it when it finishes
 
-async def _persist_and_broadcast(session_id: str, text: str, confidence: float) -> None:
-    text = (text or "").strip()
-    if not text:
-        return
-    ts = datetime.now(timezone.utc)
-    with session_scope() as db:
-        row = Transcript(
-            session_id=uuid.UUID(session_id),
-            text=text,
-            confidence=confidence,
-            is_processed=True,
-            timestamp=ts,
-        )
-        db.add(row)
-        db.flush()
-        payload = {"id": str(row.id), "text": text, "timestamp": ts.isoformat(), "confidence": confidence}
-    await broadcast_to_session(session_id, "transcript_update", payload)
-    logger.info("stt.transcript_saved", session_id=session_id, chars=len(text))
-
-    tokens = context_manager.add(session_id, "speech", text)
-    await broadcast_to_session(session_id, "context_update", {"tokens": tokens})
-    await maybe_compress(session_id)
+
+session_registry.on_release(_release_stream)
+
+
+def is_noise(text: str) -> bool:
+    return text.strip().lower() in _NOISE
 
 
 async def save_transcript_text(session_id: str, text: str, confidence: float = 0.9) -> None:
-    """Web Speech API path — text is already clean."""
-    await _persist_and_broadcast(session_id, text, confidence)
+    """Web Speech API path — text is already clean. Catches wake phrases the
+    browser's own matcher missed."""
+    await _final_text(session_id, text, confidence)
 
 
-def _get_whisper():
-    global _whisper_model
-    if _whisper_model is not None:
-        return _whisper_model
-    try:
-        from faster_whisper import WhisperModel
-    except ImportError:
-        logger.warning("stt.whisper_unavailable", hint="pip install faster-whisper")
-        return None
-    # tiny/base are CPU-friendly; configurable later.
-    _whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-    return _whisper_model
+async def _final_text(session_id: str, text: str, confidence: float) -> None:
+    """One finished utterance: transcript before any wake phrase, command after."""
+    hit = split_wake(text) if settings.wake_detection_enabled else None
+    if hit is None:
+        transcript_writer.add(session_id, text, confidence)
+        return
+    before, command = hit
+    if before:
+        transcript_writer.add(session_id, before, confidence)
+    await _dispatch_command(session_id, command)
 
 
-def _run_whisper(wav_bytes: bytes) -> str:
-    model = _get_whisper()
-    if model is None:
-        return ""
-    import io
+async def _dispatch_command(session_id: str, command: str | None) -> None:
+    if not command or recent_commands.is_duplicate(session_id, command):
+        return
+    logger.info("stt.wake_command", session_id=session_id, command=command[:60])
+    await broadcast_to_session(session_id, "command_processing", {"message": "Processing…", "command": command})
+    asyncio.create_task(process_command(session_id, f"hey aura {command}"))
+
 
-    segments, _ = model.transcribe(io.BytesIO(wav_bytes), beam_size=1)
-    return " ".join(seg.text.strip() for seg in segments).strip()
+async def _session_language(session_id: str) -> str | None:
+    async with async_session_scope() as db:
+        language = await db.scalar(select(Session.language).where(Session.id == uuid.UUID(session_id)))
+    return whisper_language(language)
 
 
 async def transcribe_audio(session_id: str, audio_b64: str) -> None:
-    """Raw-audio path — decode base64 WAV, run Whisper in an executor, filter noise."""
+    """Legacy raw-audio path — base64 WAV. Decoded WAV joins the stream; audio
+    that can't be decoded here (no NumPy, not PCM16) is transcribed one-shot."""
     try:
         wav_bytes = base64.b64decode(audio_b64)
     except Exception:
         logger.warning("stt.bad_audio_payload", session_id=session_id)
         return
-    loop = asyncio.get_running_loop()
-    text = await loop.run_in_executor(None, _run_whisper, wav_bytes)
+    decoded = vad.decode_wav(wav_bytes)
+    if decoded is not None:
+        await _ingest(session_id, *decoded)
+        return
+    audio = vad.gate(session_id, wav_bytes)
+    if audio is None:
+        return
+    text = await whisper_pool.transcribe(audio, language=await _session_language(session_id))
+    if text and not is_noise(text):
+        await _final_text(session_id, text, confidence=0.85)
+
+
+async def ingest_pcm16(session_id: str, payload: bytes, rate: int = 16000) -> None:
+    """Binary path — little-endian 16-bit mono PCM (16 kHz preferred)."""
+    if not binary_audio_available():
+        logger.warning("stt.binary_audio_unavailable", hint="pip install numpy")
+        return
+    await _ingest(session_id, pcm16_to_float32(payload), rate)
+
+
+async def ingest_opus(session_id: str, packets: list[bytes]) -> None:
+    """Binary path — raw Opus packets (e.g. WebCodecs AudioEncoder output)."""
+    decoder = _opus.get(session_id)
+    if decoder is None:
+        if not opus_available():
+            logger.warning("stt.opus_unavailable", hint="pip install opuslib (needs libopus)")
+            return
+        decoder = _opus[session_id] = OpusDecoder()
+    await _ingest(session_id, decoder.decode(packets), OPUS_RATE)
+
+
+async def _ingest(session_id: str, samples: Any, rate: int) -> None:
+    audio = vad.gate_samples(session_id, samples, rate)
+    stream = _streams.get(session_id)
+    if stream is None:
+        if audio is None:
+            return  # silence before any speech
+        language = await _session_language(session_id)
+        stream = _streams.get(session_id)  # another chunk may have started it meanwhile
+        if stream is None:
+            stream = _streams[session_id] = AsrStream(language)
+            session_registry.touch(session_id, stream.nbytes)
+    stream.inbox.append(audio)
+    if stream.running:
+        return  # the running pass picks it up
+    stream.running = True
+    try:
+        await _run_stream(session_id, stream)
+    finally:
+        stream.running = False
+        if _streams.get(session_id) is not stream:
+            stream.close()  # released mid-pass
+
+
+async def _run_stream(session_id: str, stream: AsrStream) -> None:
+    while stream.inbox:
+        batch, stream.inbox = stream.inbox, []
+        dirty = False
+        for item in batch:
+            if item is not None:
+                stream.append(item)
+                dirty = True
+                continue
+            if not (dirty or stream.pending or stream.buffered_s):
+                continue  # already idle
+            if dirty:
+                await _stream_pass(session_id, stream)
+                dirty = False
+            await _commit(session_id, stream.end_utterance())
+            await broadcast_to_session(session_id, "transcript_partial", {"text": ""})
+            if session_id in _wake:
+                await _dispatch_command(session_id, _wake[session_id].end())
+        if dirty:
+            await _stream_pass(session_id, stream)
+        session_registry.touch(session_id)
+
+
+async def _stream_pass(session_id: str, stream: AsrStream) -> None:
+    words = await whisper_pool.transcribe(stream.window(), language=stream.language, word_timestamps=True)
+    if words is None:  # dropped / timed out / failed: not a hypothesis; keep the buffer for the next pass
+        return
+    committed, partial = stream.advance(words)
+    await _commit(session_id, committed)
+    await broadcast_to_session(session_id, "transcript_partial", {"text": partial})
+    if settings.wake_detection_enabled:
+        await _dispatch_command(session_id, _wake.setdefault(session_id, WakeTracker()).partial(partial))
+
+
+async def _commit(session_id: str, text: str) -> None:
     if not text or is_noise(text):
         return
-    await _persist_and_broadcast(session_id, text, confidence=0.85)
+    if settings.wake_detection_enabled:
+        text = _wake.setdefault(session_id, WakeTracker()).commit(text)
+    if text:
+        transcript_writer.add(session_id, text, confidence=0.85)
@@ -0,0 +1,98 @@
+"""Thumbnail worker: builds the timeline thumbnails of stored board snapshots.
+
+`submit` is called once a snapshot row is stored and returns immediately; a
+single background task renders the thumbnails (app.services.board_thumbs) in a
+worker thread, puts them in the blob store and records their keys on the row
+(`thumb_keys`). An image already thumbnailed for another row (a board flipped
+back to) reuses that row's keys instead of rendering again.
+
+The queue is bounded (`thumb_queue_max`); a job beyond it is dropped and its
+row simply has no thumbnails (the timeline links the full image instead).
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import async_session_scope
+from app.core.logging import get_logger
+from app.core.metrics import LatencyStats
+from app.models.whiteboard import WhiteboardLog
+from app.services import board_thumbs
+from app.services.blob_store import blob_store
+
+logger = get_logger("aura.thumbs")
+
+_queue: asyncio.Queue[tuple[uuid.UUID, str]] | None = None
+_runner: asyncio.Task | None = None
+_latency = LatencyStats()
+stats = {"built": 0, "reused": 0, "dropped": 0, "failed": 0, "bytes": 0}
+
+
+def thumb_stats() -> dict:
+    return {**stats, "waiting": _queue.qsize() if _queue else 0, "latency": _latency.summary()}
+
+
+def submit(row_id: uuid.UUID, image_key: str) -> None:
+    """Queue thumbnails for a stored snapshot (dropped if the queue is full)."""
+    global _queue, _runner
+    if not board_thumbs.available():
+        return
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.thumb_queue_max)
+    try:
+        _queue.put_nowait((row_id, image_key))
+    except asyncio.QueueFull:
+        stats["dropped"] += 1
+        logger.warning("thumbs.dropped", row_id=str(row_id))
+        return
+    if _runner is None or _runner.done():
+        _runner = asyncio.create_task(_run(_queue))
+
+
+async def _run(queue: asyncio.Queue) -> None:
+    while not queue.empty():
+        row_id, image_key = queue.get_nowait()
+        try:
+            await build(row_id, image_key)
+        except Exception as exc:  # noqa: BLE001 — one bad image must not stop the queue
+            stats["failed"] += 1
+            logger.warning("thumbs.failed", row_id=str(row_id), error=str(exc))
+
+
+async def _known(image_key: str) -> dict | None:
+    async with async_session_scope() as db:
+        return await db.scalar(
+            select(WhiteboardLog.thumb_keys)
+            .where(WhiteboardLog.image_key == image_key, WhiteboardLog.thumb_keys.is_not(None))
+            .limit(1)
+        )
+
+
+async def _store(row_id: uuid.UUID, keys: dict) -> None:
+    async with async_session_scope() as db:
+        await db.execute(update(WhiteboardLog).where(WhiteboardLog.id == row_id).values(thumb_keys=keys))
+
+
+async def build(row_id: uuid.UUID, image_key: str) -> dict | None:
+    """Thumbnail keys of one snapshot, rendered (or reused) and saved on its row."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    keys = await _known(image_key)
+    if keys is not None:
+        stats["reused"] += 1
+    else:
+        data = await asyncio.to_thread(blob_store.get, image_key)
+        thumbs = await asyncio.to_thread(board_thumbs.render, data) if data else None
+        if thumbs is None:
+            stats["failed"] += 1
+            return None
+        keys = {name: await asyncio.to_thread(blob_store.put, blob) for name, blob in thumbs.items()}
+        stats["built"] += 1
+        stats["bytes"] += sum(len(b) for b in thumbs.values())
+    await _store(row_id, keys)
+    _latency.observe(loop.time() - started)
+    return keys
@@ -0,0 +1,152 @@
+"""Write-behind transcript persistence: per-session buffers flushed in bulk.
+
+Finalized speech is queued per session and written every
+`transcript_flush_ms` (sooner once `transcript_batch_max` rows are waiting) as
+one multi-row INSERT plus one topic-index upsert, in one transaction. After the
+commit the rows go out as a single `transcript_batch` {items: [...]} event,
+followed by one `context_update` and one compression check.
+
+Ordering: ids and timestamps are assigned when a fragment is queued; a session
+has at most one flush in flight, and fragments queued meanwhile go in the next
+batch — so rows, batch items and batches are all in arrival order.
+
+Crash safety: a fragment is durable only once its batch commits. A process
+crash can lose at most the last flush interval of text per session; a graceful
+shutdown flushes everything (`flush_all` in the app lifespan). A failed write is
+retried with the next batch (`_MAX_ATTEMPTS` times) before it is dropped and logged.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import async_session_scope
+from app.core.logging import get_logger
+from app.models.transcript import Transcript
+from app.services.context_manager import context_manager
+from app.services.topic_index import index_transcript
+from app.websocket.connection import broadcast_to_session
+from app.workers.compression_worker import maybe_compress
+
+logger = get_logger("aura.stt.writer")
+
+_MAX_ATTEMPTS = 3
+
+
+class _Pending:
+    __slots__ = ("rows", "timer", "flushing", "attempts")
+
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.flushing = False
+        self.attempts = 0
+
+
+class TranscriptWriter:
+    def __init__(self, interval_ms: int | None = None, max_batch: int | None = None) -> None:
+        self.interval_s = (interval_ms or settings.transcript_flush_ms) / 1000
+        self.max_batch = max_batch or settings.transcript_batch_max
+        self._pending: dict[str, _Pending] = {}
+
+    def add(self, session_id: str, text: str, confidence: float) -> None:
+        """Queue one finalized fragment; it is written and broadcast on the next flush."""
+        text = (text or "").strip()
+        if not text:
+            return
+        p = self._pending.setdefault(session_id, _Pending())
+        p.rows.append(
+            {
+                "id": uuid.uuid4(),
+                "session_id": uuid.UUID(session_id),
+                "text": text,
+                "confidence": confidence,
+                "is_processed": True,
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+        if len(p.rows) >= self.max_batch:
+            self._schedule(session_id, p, 0)
+        elif p.timer is None:
+            self._schedule(session_id, p, self.interval_s)
+
+    def pending(self, session_id: str) -> int:
+        p = self._pending.get(session_id)
+        return len(p.rows) if p else 0
+
+    def _schedule(self, session_id: str, p: _Pending, delay: float) -> None:
+        if p.timer is not None:
+            p.timer.cancel()
+        loop = asyncio.get_running_loop()
+
+        def fire() -> None:
+            p.timer = None  # fired: the next add() may schedule again
+            asyncio.ensure_future(self.flush(session_id))
+
+        p.timer = loop.call_later(delay, fire)
+
+    async def flush(self, session_id: str) -> None:
+        """Write everything queued for a session (no-op if a flush is in flight;
+        that flush picks up the new rows before it returns)."""
+        p = self._pending.get(session_id)
+        if p is None or p.flushing:
+            return
+        p.flushing = True
+        if p.timer is not None:
+            p.timer.cancel()
+            p.timer = None
+        try:
+            while p.rows:
+                batch, p.rows = p.rows, []
+                if not await self._write(session_id, batch):
+                    p.attempts += 1
+                    if p.attempts < _MAX_ATTEMPTS:
+                        p.rows[:0] = batch  # keep order: retry ahead of newer rows
+                        self._schedule(session_id, p, self.interval_s)
+                        return
+                    logger.error("stt.transcript_batch_dropped", session_id=session_id, rows=len(batch))
+                p.attempts = 0
+        finally:
+            p.flushing = False
+            if p.timer is None:
+                if p.rows:  # e.g. the write raised: don't strand them
+                    self._schedule(session_id, p, self.interval_s)
+                else:
+                    self._pending.pop(session_id, None)
+
+    async def flush_all(self) -> None:
+        for session_id in list(self._pending):
+            await self.flush(session_id)
+
+    async def _write(self, session_id: str, batch: list[dict]) -> bool:
+        texts = [row["text"] for row in batch]
+        try:
+            async with async_session_scope() as db:
+                await db.execute(insert(Transcript), batch)
+                await db.run_sync(index_transcript, session_id, "\n".join(texts))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("stt.transcript_flush_failed", session_id=session_id, rows=len(batch), error=str(exc))
+            return False
+        items = [
+            {
+                "id": str(row["id"]),
+                "text": row["text"],
+                "timestamp": row["timestamp"].isoformat(),
+                "confidence": row["confidence"],
+            }
+            for row in batch
+        ]
+        await broadcast_to_session(session_id, "transcript_batch", {"items": items})
+        logger.info("stt.transcript_batch_saved", session_id=session_id, rows=len(batch))
+
+        tokens = await context_manager.add(session_id, "speech", "\n".join(texts))
+        await broadcast_to_session(session_id, "context_update", {"tokens": tokens})
+        asyncio.create_task(maybe_compress(session_id))  # don't hold the next batch behind a compression
+        return True
+
+
+transcript_writer = TranscriptWriter()
@@ -1,23 +1,69 @@
 """Vision worker: store a board snapshot, OCR it, and surface board insights.
 
-OCR provider order (best available): Groq vision -> Gemini vision -> EasyOCR.
-The snapshot row is persisted BEFORE OCR so storage never depends on OCR success.
+OCR provider order (best available): Groq vision -> Gemini vision -> EasyOCR
+(in its own process, app.services.ocr_sidecar).
+The snapshot row is persisted BEFORE OCR so storage never depends on OCR success;
+the image itself goes to the blob store as raw bytes and the row keeps its key.
+
+Each snapshot is fingerprinted on arrival (app.services.board_image). A board
+unchanged since the last snapshot of the same page is neither stored nor
+OCR'd: either its bytes are identical (same SHA-256), or its dHash matches,
+its scene document is the same and the region diff finds no changed tile (a
+dHash alone collides on small edits). A changed board already OCR'd in the
+same session (e.g. flipping back to an earlier page) is stored but reuses the
+cached text; that cache is per session and keyed by the exact image hash.
+
+A changed board is OCR'd by region (app.services.board_regions): only the tiles
+that differ from the page's previous snapshot are cropped and sent to OCR, and
+the crops' text replaces the matching regions of the page's text layout. The
+page text is that layout in reading order; a large change OCRs the full page.
+
+Typed text (text shapes, notes, dropped text cards) is read from the scene
+document sent with the snapshot (app.services.board_doc) rather than OCR'd:
+those boxes are blanked on the image before diffing, so OCR only sees freehand
+ink, and the document texts are merged into the layout by position.
+
+Every image sent to a provider is normalized first (app.services.ocr_image:
+ink crop, downsample, grayscale, re-encode) off the event loop; a crop with
+no ink is not sent at all.
+
+The scene document is stored as a keyframe or a JSON patch against the page's
+previous one (app.services.board_scene). Timeline thumbnails of the stored
+image are built in the background (app.workers.thumbnail_worker).
+
+Snapshots enter through `submit_snapshot`: each (session, page) has one slot
+holding the newest snapshot not yet processed and at most one runner. A
+snapshot that arrives while the page is being processed replaces whatever is
+waiting (the superseded one is dropped: students already got it as a
+`board_update`), so OCR never queues up behind a fast client, runs in arrival
+order per page, and the board insight is always computed on the newest image.
 """
 from __future__ import annotations
 
 import asyncio
 import base64
+import time
 import uuid
 from datetime import datetime, timezone
+from typing import Callable
 
 import httpx
+from sqlalchemy import update
 
 from app.core.config import settings
-from app.core.database import session_scope
+from app.core.database import async_session_scope
 from app.core.logging import get_logger
+from app.core.metrics import LatencyStats
 from app.models.whiteboard import WhiteboardLog
+from app.services import board_doc, board_regions, ocr_image
+from app.services.blob_store import blob_key, blob_store
+from app.services.board_scene import SceneChain
+from app.services.board_image import OcrCache, fingerprint, same_board
 from app.services.context_manager import context_manager
+from app.services.ocr_sidecar import ocr_sidecar
+from app.services.session_state import session_registry
 from app.websocket.connection import broadcast_to_session
+from app.workers import thumbnail_worker
 from app.workers.compression_worker import maybe_compress
 
 logger = get_logger("aura.vision")
@@ -28,6 +74,81 @@ _OCR_PROMPT = (
 )
 
 _last_ocr: dict[str, str] = {}
+_ocr_caches: dict[str, OcrCache] = {}  # session -> blob key -> layout regions
+_OCR_CACHE_ENTRIES = 64
+stats = {
+    "snapshots": 0,
+    "unchanged": 0,
+    "cacheHits": 0,
+    "ocrCalls": 0,
+    "bytesSaved": 0,
+    "ocrPixels": 0,
+    "boardPixels": 0,
+    "docTexts": 0,
+    "superseded": 0,
+    "ocrBytesIn": 0,  # image payload before normalization
+    "ocrBytesOut": 0,  # ... and after (what providers receive)
+    "blankSkipped": 0,  # images with no ink, not sent
+}
+_prep_latency = LatencyStats()
+_ocr_latency = LatencyStats()
+
+
+class _Page:
+    """Last snapshot of one board page: hashes, diff image, ink text layout."""
+
+    __slots__ = ("key", "fp", "gray", "size", "layout", "scene")
+
+    def __init__(self) -> None:
+        self.key: str | None = None  # SHA-256 of the image bytes (its blob key)
+        self.fp: str | None = None
+        self.gray = None  # half-resolution grayscale array (board_regions.load)
+        self.size: tuple[int, int] | None = None
+        self.layout = board_regions.PageLayout()
+        self.scene = SceneChain()
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.gray.nbytes) if self.gray is not None else 0
+
+
+_pages: dict[str, dict[int, _Page]] = {}  # session -> page number -> state
+
+
+class _Slot:
+    __slots__ = ("latest", "running")
+
+    def __init__(self) -> None:
+        self.latest: tuple | None = None  # process_snapshot args of the newest waiting snapshot
+        self.running = False
+
+
+_slots: dict[tuple[str, int], _Slot] = {}
+
+
+def _release(session_id: str) -> None:
+    _last_ocr.pop(session_id, None)
+    _pages.pop(session_id, None)
+    _ocr_caches.pop(session_id, None)
+    for key in [k for k in _slots if k[0] == session_id]:
+        _slots[key].latest = None  # a running pass finishes; nothing after it
+
+
+session_registry.on_release(_release)
+
+
+def vision_stats() -> dict:
+    board = stats["boardPixels"]
+    return {
+        **stats,
+        "ocrSkipped": stats["unchanged"] + stats["cacheHits"],
+        "cacheEntries": sum(len(c) for c in _ocr_caches.values()),
+        "ocrPixelShare": round(stats["ocrPixels"] / board, 3) if board else None,
+        "pagesInFlight": sum(1 for slot in _slots.values() if slot.running),
+        "ocrPayloadRatio": round(stats["ocrBytesOut"] / stats["ocrBytesIn"], 3) if stats["ocrBytesIn"] else None,
+        "prepLatency": _prep_latency.summary(),
+        "ocrLatency": _ocr_latency.summary(),
+    }
 
 
 def _strip_data_url(data: str) -> str:
@@ -92,25 +213,37 @@ async def _ocr_gemini(b64: str) -> str:
     return ""
 
 
-_easyocr_reader = None
+async def _prepare(b64: str) -> str | None:
+    """Normalized image for the providers (base64); None if there is no ink."""
+    if not settings.ocr_prep_enabled:
+        return b64
+    try:
+        raw = base64.b64decode(b64)
+    except Exception:  # noqa: BLE001
+        return b64
+    started = time.perf_counter()
+    out = await asyncio.to_thread(ocr_image.prepare, raw, settings.ocr_max_side)
+    _prep_latency.observe(time.perf_counter() - started)
+    stats["ocrBytesIn"] += len(raw)
+    if out is None:
+        stats["blankSkipped"] += 1
+        return None
+    stats["ocrBytesOut"] += len(out)
+    return base64.b64encode(out).decode() if out is not raw else b64
 
 
-def _ocr_easyocr_sync(png_bytes: bytes) -> str:
-    global _easyocr_reader
-    try:
-        import easyocr  # type: ignore
-        import numpy as np
-        from PIL import Image
-        import io
-    except ImportError:
+async def _run_ocr(b64: str) -> str:
+    prepared = await _prepare(b64)
+    if prepared is None:
         return ""
-    if _easyocr_reader is None:
-        _easyocr_reader = easyocr.Reader(["en"], gpu=False)
-    img = np.array(Image.open(io.BytesIO(png_bytes)).convert("RGB"))
-    return " ".join(_easyocr_reader.readtext(img, detail=0, paragraph=True)).strip()
+    started = time.perf_counter()
+    try:
+        return await _run_providers(prepared)
+    finally:
+        _ocr_latency.observe(time.perf_counter() - started)
 
 
-async def _run_ocr(b64: str) -> str:
+async def _run_providers(b64: str) -> str:
     text = await _ocr_groq(b64)
     if text:
         return text
@@ -118,13 +251,100 @@ async def _run_ocr(b64: str) -> str:
     if text:
         return text
     try:
-        png = base64.b64decode(b64)
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, _ocr_easyocr_sync, png)
+        return await ocr_sidecar.read(base64.b64decode(b64))
     except Exception:  # noqa: BLE001
         return ""
 
 
+def _blank(board: board_doc.BoardDoc | None) -> Callable[[tuple[int, int]], list[board_doc.Rect]] | None:
+    return board.pixel_rects if board is not None and board.texts else None
+
+
+def _page_text(page: _Page, board: board_doc.BoardDoc | None) -> str:
+    """Ink OCR layout merged with the document's texts, in reading order."""
+    if board is None or not board.texts:
+        return page.layout.text()
+    placed = board.regions(page.size)
+    if placed is not None:
+        return board_regions.PageLayout(page.layout.regions + placed).text()
+    ink = page.layout.text()  # can't place the texts (no image stack): texts first
+    typed = [t.text for t in board.texts if t.text not in ink]
+    return "\n".join([*typed, ink] if ink else typed)
+
+
+def _unchanged(page: _Page, raw: bytes, blank, doc: dict | None) -> tuple[bool, tuple | None]:  # noqa: ANN001
+    """For a dHash match: (whether nothing changed on the page, the loaded image).
+
+    Same scene document and no changed tile in the region diff."""
+    if doc is not None and doc != page.scene.doc:
+        return False, None
+    loaded = board_regions.load(raw, blank)
+    if loaded is None or page.gray is None:
+        return False, loaded
+    return board_regions.changed_rects(page.gray, loaded[1], loaded[0].size) == [], loaded
+
+
+async def _ocr_board(
+    raw: bytes, b64: str, page: _Page, board: board_doc.BoardDoc | None, loaded: tuple | None = None
+) -> None:
+    """OCR the ink that changed on the page since its last snapshot; updates `page`."""
+    blank = _blank(board)
+    if loaded is None:
+        loaded = await asyncio.to_thread(board_regions.load, raw, blank)
+    if loaded is None:  # no image stack (or undecodable): whole board, no layout
+        stats["ocrCalls"] += 1
+        text = await _run_ocr(b64)
+        page.layout = board_regions.PageLayout([((0, 0, 0, 0), text)] if text.strip() else [])
+        page.size = None
+        return
+    img, gray = loaded
+    width, height = page.size = img.size
+    stats["boardPixels"] += width * height
+    rects = board_regions.plan(page.gray, gray, img.size, page.layout)
+    if rects is None:
+        stats["ocrCalls"] += 1
+        stats["ocrPixels"] += width * height
+        if blank is not None:  # OCR the blanked image, not the original
+            b64 = await asyncio.to_thread(board_regions.crop_b64, img, (0, 0, width, height))
+        text = await _run_ocr(b64)
+        page.layout = board_regions.PageLayout([((0, 0, width, height), text)] if text.strip() else [])
+    elif rects:
+        crops = await asyncio.to_thread(lambda: [board_regions.crop_b64(img, r) for r in rects])
+        stats["ocrCalls"] += len(rects)
+        stats["ocrPixels"] += sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects)
+        texts = await asyncio.gather(*(_run_ocr(c) for c in crops))
+        for rect, text in zip(rects, texts):
+            page.layout.replace(rect, text)
+    page.gray = gray
+
+
+def submit_snapshot(session_id: str, image_data: str, tldraw_snapshot: dict | None = None, page_number: int = 1) -> None:
+    """Latest-wins entry point: queue the snapshot for its page, replacing any
+    snapshot of that page still waiting, and start the page's runner if idle."""
+    key = (session_id, page_number)
+    slot = _slots.setdefault(key, _Slot())
+    if slot.latest is not None:
+        stats["superseded"] += 1
+    slot.latest = (session_id, image_data, tldraw_snapshot, page_number)
+    if not slot.running:
+        slot.running = True
+        asyncio.create_task(_run_slot(key, slot))
+
+
+async def _run_slot(key: tuple[str, int], slot: _Slot) -> None:
+    try:
+        while slot.latest is not None:
+            args, slot.latest = slot.latest, None
+            try:
+                await process_snapshot(*args)
+            except Exception as exc:  # noqa: BLE001 — keep serving the page
+                logger.warning("vision.snapshot_failed", session_id=key[0], page=key[1], error=str(exc))
+    finally:
+        slot.running = False
+        if _slots.get(key) is slot:
+            del _slots[key]
+
+
 async def process_snapshot(
     session_id: str,
     image_data: str,
@@ -135,40 +355,91 @@ async def process_snapshot(
     if not b64:
         return
     ts = datetime.now(timezone.utc)
+    stats["snapshots"] += 1
+
+    # 0) Fingerprint; an unchanged page costs neither a row nor an OCR call.
+    try:
+        raw = base64.b64decode(b64)
+    except Exception:  # noqa: BLE001
+        logger.warning("vision.bad_image_payload", session_id=session_id)
+        return
+    fp, key = await asyncio.to_thread(lambda: (fingerprint(raw, settings.board_hash_size), blob_key(raw)))
+    pages = _pages.setdefault(session_id, {})
+    page = pages.get(page_number)
+    board = board_doc.extract(tldraw_snapshot, page_number)
+    loaded = None
+    if page is not None:
+        unchanged = page.key == key
+        if not unchanged and same_board(page.fp, fp, settings.board_hash_threshold):
+            unchanged, loaded = await asyncio.to_thread(_unchanged, page, raw, _blank(board), tldraw_snapshot)
+        if unchanged:
+            stats["unchanged"] += 1
+            stats["bytesSaved"] += len(b64)
+            logger.info("vision.snapshot_unchanged", session_id=session_id, page=page_number)
+            return
+    if page is None:
+        page = pages[page_number] = _Page()
+        session_registry.touch(session_id, len(fp) + len(key) + 16)
+    page.fp, page.key = fp, key
+    if board is not None:
+        stats["docTexts"] += len(board.texts)
 
     # 1) Persist the snapshot first (storage independent of OCR).
-    with session_scope() as db:
+    image_key = await asyncio.to_thread(blob_store.put, raw)
+    scene_bytes = page.scene.nbytes
+    scene = await asyncio.to_thread(page.scene.fields, tldraw_snapshot)  # whole document or patch
+    async with async_session_scope() as db:
         row = WhiteboardLog(
             session_id=uuid.UUID(session_id),
-            tldraw_snapshot=tldraw_snapshot,
-            image_data=b64,
+            **scene,
+            image_key=image_key,
             ocr_text="",
             page_number=page_number,
             timestamp=ts,
         )
         db.add(row)
-        db.flush()
+        await db.flush()
         row_id = row.id
+    page.scene.committed(row_id)
+    session_registry.touch(session_id, page.scene.nbytes - scene_bytes)
+    thumbnail_worker.submit(row_id, image_key)
     logger.info("vision.snapshot_saved", session_id=session_id, row_id=str(row_id))
 
-    # 2) OCR (best effort) and update the row.
-    ocr = await _run_ocr(b64)
+    # 2) OCR (best effort: cached layout, else changed regions) and update the row.
+    before = page.nbytes
+    cache = _ocr_caches.get(session_id)
+    if cache is None:
+        cache = _ocr_caches[session_id] = OcrCache(_OCR_CACHE_ENTRIES)
+    cache_bytes = cache.nbytes
+    regions = cache.get(image_key)
+    if regions is not None:
+        stats["cacheHits"] += 1
+        page.layout = board_regions.PageLayout(regions)
+        if loaded is None:
+            loaded = await asyncio.to_thread(board_regions.load, raw, _blank(board))
+        page.gray, page.size = (loaded[1], loaded[0].size) if loaded else (None, None)
+    else:
+        await _ocr_board(raw, b64, page, board, loaded)
+        if page.layout.regions:
+            regions = list(page.layout.regions)
+            cache.put(image_key, regions, len(image_key) + sum(len(t) + 32 for _, t in regions))
+    session_registry.touch(session_id, page.nbytes - before + cache.nbytes - cache_bytes)
+    ocr = _page_text(page, board)
     if not ocr:
         return
-    with session_scope() as db:
-        row = db.get(WhiteboardLog, row_id)
-        if row:
-            row.ocr_text = ocr
+    async with async_session_scope() as db:
+        await db.execute(update(WhiteboardLog).where(WhiteboardLog.id == row_id).values(ocr_text=ocr))
 
     # 3) Surface a board insight when the content meaningfully changed.
     last = _last_ocr.get(session_id, "")
     if abs(len(ocr) - len(last)) > 30 or (ocr and ocr not in last):
         _last_ocr[session_id] = ocr
+        session_registry.touch(session_id, len(ocr) - len(last))
         await broadcast_to_session(
             session_id, "board_insight", {"description": ocr[:500], "timestamp": ts.isoformat()}
         )
     logger.info("vision.ocr_done", session_id=session_id, chars=len(ocr))
 
-    tokens = context_manager.add(session_id, "board", ocr)
+    tokens = await context_manager.add(session_id, "board", ocr)
     await broadcast_to_session(session_id, "context_update", {"tokens": tokens})
     await maybe_compress(session_id)
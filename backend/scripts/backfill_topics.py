@@ -0,0 +1,70 @@
+"""Build the topic word-cloud index for transcripts stored before it existed.
+
+The index (`topic_terms`) is maintained as transcripts are written, so sessions
+recorded before it was deployed have no counts and their word clouds are
+empty. This reads each such session's transcript text once, sums its term
+counts and upserts them for the session, its unit and its course in one
+statement, --batch sessions per transaction.
+
+A session is backfilled only while it has no session rows in the index yet,
+so re-running after an interruption skips what is done. Run it once right
+after deploying the index, before new transcripts reach old sessions.
+
+    cd backend && .venv/bin/python scripts/backfill_topics.py [--batch 50]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# allow running as a plain script (so `app` is importable)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import exists, select  # noqa: E402
+
+from app.core.database import session_scope  # noqa: E402
+from app.models.session import Session  # noqa: E402
+from app.models.topic_term import TopicTerm  # noqa: E402
+from app.models.transcript import Transcript  # noqa: E402
+from app.services.topic_index import index_counts, term_counts  # noqa: E402
+
+
+def backfill(batch: int = 50) -> int:
+    """Index every session that has transcripts but no index rows; returns how many."""
+    done, after = 0, None
+    while True:
+        with session_scope() as db:
+            q = select(Session.id).where(
+                exists().where(Transcript.session_id == Session.id),
+                ~exists().where(TopicTerm.scope == "session", TopicTerm.scope_id == Session.id),
+            )
+            if after is not None:  # keyset: sessions with no terms at all stay unindexed
+                q = q.where(Session.id > after)
+            sids = db.scalars(q.order_by(Session.id).limit(batch)).all()
+            if not sids:
+                return done
+            for sid in sids:
+                counts: Counter[str] = Counter()
+                for text in db.scalars(
+                    select(Transcript.text).where(Transcript.session_id == sid).execution_options(yield_per=500)
+                ):
+                    counts.update(term_counts(text))
+                index_counts(db, sid, counts)
+        done, after = done + len(sids), sids[-1]
+        print(f"indexed {done} session(s)…")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=50, help="sessions per transaction")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    n = backfill(args.batch)
+    print(f"done: {n} session(s) indexed in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Event-loop stall from DB access in coroutines: sync session vs AsyncSession.
+
+Runs the same workload twice on one event loop: `--jobs` concurrent coroutines,
+each doing `--queries` round trips (`SELECT pg_sleep(rtt)`, i.e. a query on a
+DB `--rtt-ms` away), first through the sync `session_scope()` called straight
+from the coroutine (how workers used to do it), then through
+`async_session_scope()`. A ticker wakes every `--tick-ms` and records how late
+it runs: that lateness is time every socket on the instance would have waited.
+
+    cd backend && .venv/bin/python scripts/bench_loop_stall.py [--jobs 20] [--queries 5] [--rtt-ms 2]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# allow running as a plain script (so `app` is importable)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import async_engine, async_session_scope, session_scope  # noqa: E402
+from app.core.metrics import LatencyStats  # noqa: E402
+
+
+async def _sync_job(queries: int, rtt: float) -> None:
+    for _ in range(queries):
+        with session_scope() as db:
+            db.execute(text("SELECT pg_sleep(:s)"), {"s": rtt})
+
+
+async def _async_job(queries: int, rtt: float) -> None:
+    for _ in range(queries):
+        async with async_session_scope() as db:
+            await db.execute(text("SELECT pg_sleep(:s)"), {"s": rtt})
+
+
+async def _ticker(tick: float, lag: LatencyStats, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        due = loop.time() + tick
+        await asyncio.sleep(tick)
+        lag.observe(max(0.0, loop.time() - due))
+
+
+async def measure(job, jobs: int, queries: int, rtt: float, tick: float) -> dict:  # noqa: ANN001
+    await asyncio.gather(*(job(1, 0) for _ in range(jobs)))  # open the pool's connections first
+    lag, stop = LatencyStats(window=100_000), asyncio.Event()
+    ticker = asyncio.create_task(_ticker(tick, lag, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(job(queries, rtt) for _ in range(jobs)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return {"wallMs": round(wall * 1000), "stallMs": round(lag.total * 1000), **lag.summary()}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20, help="concurrent coroutines")
+    parser.add_argument("--queries", type=int, default=5, help="round trips per coroutine")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="emulated DB round trip")
+    parser.add_argument("--tick-ms", type=float, default=1.0, help="ticker interval")
+    args = parser.parse_args()
+    rtt, tick = args.rtt_ms / 1000, args.tick_ms / 1000
+    print(f"{args.jobs} jobs x {args.queries} queries, rtt {args.rtt_ms} ms, tick {args.tick_ms} ms")
+    for name, job in (("sync session", _sync_job), ("AsyncSession", _async_job)):
+        r = await measure(job, args.jobs, args.queries, rtt, tick)
+        print(
+            f"{name:>13}: wall {r['wallMs']} ms, loop stalled {r['stallMs']} ms"
+            f" (lag p50 {r['p50Ms']} / p95 {r['p95Ms']} / max {r['maxMs']} ms)"
+        )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
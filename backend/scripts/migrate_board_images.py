@@ -0,0 +1,111 @@
+"""Move whiteboard images out of Postgres into the blob store, in batches.
+
+Each batch reads up to --batch rows that still hold base64 `image_data`
+(`FOR UPDATE SKIP LOCKED`, so several copies can run side by side), writes
+the decoded bytes to the blob store, sets `image_key` and clears
+`image_data`, then commits. Safe to stop and re-run at any point: a blob is
+written before its row is updated, and writing an existing blob is a no-op.
+
+    cd backend && .venv/bin/python scripts/migrate_board_images.py [--batch 200] [--thumbs] [--prune]
+
+--thumbs builds the timeline thumbnails of rows that have none (rows stored
+before thumbnails existed, or whose job was dropped). --prune afterwards
+deletes blobs no row references any more (deleted sessions). Run VACUUM FULL whiteboard_logs (or pg_repack) once done to
+give the space back to the OS.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import binascii
+import sys
+import time
+from pathlib import Path
+
+# allow running as a plain script (so `app` is importable)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, update  # noqa: E402
+
+from app.core.database import session_scope  # noqa: E402
+from app.models.whiteboard import WhiteboardLog  # noqa: E402
+from app.services.blob_store import LocalBlobStore, blob_store  # noqa: E402
+from app.workers import thumbnail_worker  # noqa: E402
+
+
+def migrate(batch: int = 200, store: LocalBlobStore = blob_store) -> int:
+    """Move every remaining row; returns how many were moved."""
+    moved = 0
+    while True:
+        with session_scope() as db:
+            rows = db.execute(
+                select(WhiteboardLog.id, WhiteboardLog.image_data)
+                .where(WhiteboardLog.image_data.is_not(None))
+                .limit(batch)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return moved
+            for row_id, b64 in rows:
+                try:
+                    key = store.put(base64.b64decode(b64.split(",", 1)[-1]))
+                except (binascii.Error, ValueError):
+                    key = None  # unreadable payload: drop it rather than retry forever
+                db.execute(
+                    update(WhiteboardLog).where(WhiteboardLog.id == row_id).values(image_key=key, image_data=None)
+                )
+        moved += len(rows)
+        print(f"moved {moved} snapshot image(s)…")
+
+
+def prune(store: LocalBlobStore = blob_store, min_age_s: float = 3600) -> int:
+    """Delete blobs no whiteboard row references; returns how many. Blobs newer
+    than `min_age_s` are kept (a snapshot's blob is written before its row)."""
+    cutoff = time.time() - min_age_s
+    with session_scope() as db:
+        live = set(db.scalars(select(WhiteboardLog.image_key).where(WhiteboardLog.image_key.is_not(None))))
+        for keys in db.scalars(select(WhiteboardLog.thumb_keys).where(WhiteboardLog.thumb_keys.is_not(None))):
+            live.update(keys.values())
+    orphans = [
+        key for key in store.keys() if key not in live and store.path(key).stat().st_mtime < cutoff
+    ]
+    for key in orphans:
+        store.delete(key)
+    return len(orphans)
+
+
+async def thumbnails(batch: int = 200) -> int:
+    """Build missing thumbnails; returns how many rows got them."""
+    done, after = 0, None
+    while True:
+        with session_scope() as db:
+            q = select(WhiteboardLog.id, WhiteboardLog.image_key).where(
+                WhiteboardLog.image_key.is_not(None), WhiteboardLog.thumb_keys.is_(None)
+            )
+            if after is not None:
+                q = q.where(WhiteboardLog.id > after)
+            rows = db.execute(q.order_by(WhiteboardLog.id).limit(batch)).all()
+        if not rows:
+            return done
+        for row_id, key in rows:
+            done += await thumbnail_worker.build(row_id, key) is not None
+        after = rows[-1].id
+        print(f"thumbnailed {done} snapshot(s)…")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=200, help="rows per transaction")
+    parser.add_argument("--thumbs", action="store_true", help="also build missing timeline thumbnails")
+    parser.add_argument("--prune", action="store_true", help="also delete unreferenced blobs")
+    args = parser.parse_args()
+    print(f"done: {migrate(args.batch)} image(s) moved to {blob_store.root}")
+    if args.thumbs:
+        print(f"done: {asyncio.run(thumbnails(args.batch))} snapshot(s) thumbnailed")
+    if args.prune:
+        print(f"pruned {prune()} unreferenced blob(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from sqlalchemy import text
 
 import app.models  # noqa: F401  (register all models on Base.metadata)
 from app.core.database import Base, engine
+from app.services.blob_store import blob_store
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -14,3 +15,10 @@ def reset_database():
         conn.execute(text("CREATE SCHEMA public"))
     Base.metadata.create_all(bind=engine)
     yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def blob_root(tmp_path_factory):
+    """Board images go to a throwaway blob store, not ./data/blobs."""
+    blob_store.root = tmp_path_factory.mktemp("blobs")
+    return blob_store.root
@@ -0,0 +1,152 @@
+"""Streaming ASR: local-agreement commits, partials, overlap trimming, pipeline."""
+import asyncio
+import base64
+import io
+import uuid
+import wave
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.transcript import Transcript
+from app.services.asr_stream import RATE, AsrStream, whisper_language
+from app.services.whisper_pool import SharedAudio
+from app.websocket import connection, handlers
+from app.workers import stt_worker, transcript_writer
+from tests.util import admin_token, auth, make_hierarchy
+
+np = pytest.importorskip("numpy")  # optional; ships with faster-whisper
+
+
+def _second() -> "np.ndarray":
+    return np.zeros(RATE, dtype=np.float32)
+
+
+def test_whisper_language_codes():
+    assert whisper_language("English") == "en"
+    assert whisper_language("hi") == "hi"
+    assert whisper_language("Klingon") is None and whisper_language(None) is None
+
+
+def test_agreement_commits_prefix_and_trims_with_overlap():
+    s = AsrStream("en", overlap_s=1.0, shared=False)
+    s.append(_second())
+    assert s.advance([(0.0, 0.4, " The"), (0.5, 0.9, " cat")]) == ("", "The cat")
+    s.append(_second())
+    assert s.advance([(0.0, 0.4, "the"), (0.5, 0.9, "cat,"), (1.0, 1.4, "sat")]) == ("the cat,", "sat")
+    s.append(_second())
+    # words ending before the commit point are not re-emitted from the overlap
+    assert s.advance([(0.0, 0.4, "the"), (0.5, 0.9, "cat"), (1.0, 1.4, "sat"), (2.0, 2.5, "down")]) == ("sat", "down")
+    assert s.committed_until == pytest.approx(1.4)
+    assert s.offset == pytest.approx(0.4) and s.buffered_s == pytest.approx(2.6)
+    assert s.end_utterance() == "down"
+    assert s.buffered_s == 0 and s.pending == []
+
+
+def test_long_buffer_without_agreement_is_forced():
+    s = AsrStream(None, max_buffer_s=2.0, shared=False)
+    s.append(_second())
+    s.advance([(0.1, 0.5, "alpha")])
+    s.append(_second())
+    assert s.advance([(0.1, 0.5, "beta"), (1.2, 1.6, "gamma")]) == ("beta gamma", "")
+
+
+def _wav(samples: "np.ndarray") -> str:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes((samples * 32767).astype("<i2").tobytes())
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+async def test_pipeline_emits_partials_and_commits_rows(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    t = np.arange(RATE) / RATE
+    speech = _wav((0.3 * np.sin(2 * np.pi * 180 * t)).astype(np.float32))
+    silence = _wav(np.zeros(RATE, dtype=np.float32))
+    hypotheses = iter([
+        [(0.0, 0.4, "hello"), (0.5, 0.9, "class")],
+        [(0.0, 0.4, "hello"), (0.5, 0.9, "class"), (1.2, 1.6, "today")],
+    ])
+    events: list[tuple[str, dict]] = []
+
+    async def fake_transcribe(audio, language=None, word_timestamps=False):  # noqa: ANN001
+        assert language == "en" and word_timestamps and isinstance(audio, SharedAudio)
+        return next(hypotheses)
+
+    async def capture(session_id, event, payload):  # noqa: ANN001
+        events.append((event, payload))
+
+    monkeypatch.setattr(stt_worker.whisper_pool, "transcribe", fake_transcribe)
+    monkeypatch.setattr(stt_worker, "broadcast_to_session", capture)
+    monkeypatch.setattr(transcript_writer, "broadcast_to_session", capture)
+
+    await stt_worker.transcribe_audio(sid, speech)  # legacy base64 WAV
+    await stt_worker.ingest_pcm16(sid, base64.b64decode(speech)[44:])  # binary PCM16 (WAV body)
+    await stt_worker.transcribe_audio(sid, silence)
+    await transcript_writer.transcript_writer.flush(sid)
+
+    partials = [p["text"] for e, p in events if e == "transcript_partial"]
+    assert partials == ["hello class", "today", ""]
+    batches = [[i["text"] for i in p["items"]] for e, p in events if e == "transcript_batch"]
+    assert batches == [["hello class", "today"]]  # both commits landed in one write
+    with session_scope() as db:
+        rows = db.scalars(select(Transcript.text).where(Transcript.session_id == uuid.UUID(sid))).all()
+    assert sorted(rows) == ["hello class", "today"]
+    stt_worker._release_stream(sid)
+
+
+def test_shared_buffer_appends_and_trims_in_place():
+    s = AsrStream(None, overlap_s=0.0, max_buffer_s=1.0)
+    try:
+        s.append(np.full(RATE, 0.25, dtype=np.float32))
+        s.append(np.full(RATE // 2, 0.5, dtype=np.float32))
+        win = s.window()
+        assert isinstance(win, SharedAudio) and (win.start, win.stop) == (0, RATE + RATE // 2)
+        s._trim(1.0)
+        assert s.offset == 1.0 and s.audio.tolist() == [0.5] * (RATE // 2)
+        s.append(np.zeros(11 * RATE, dtype=np.float32))  # past capacity: oldest audio dropped
+        assert s.buffered_s == pytest.approx(11.0) and s.offset == pytest.approx(1.5)
+    finally:
+        s.close()
+
+
+async def test_audio_chunk_rejects_bad_sample_rates(monkeypatch):
+    calls: list[int] = []
+
+    async def fake_ingest(session_id, payload, rate=16000):  # noqa: ANN001
+        calls.append(rate)
+
+    monkeypatch.setattr(handlers, "ingest_pcm16", fake_ingest)
+    connection.active_connections["t-rate"] = {"session_id": str(uuid.uuid4()), "role": "teacher"}
+    try:
+        for rate in (None, 48000, "44100", "fast", 0, -16000, 12345):
+            await handlers.handle_audio_chunk("t-rate", {"format": "pcm16", "data": b"\0\0", "sampleRate": rate})
+        await asyncio.sleep(0)
+    finally:
+        connection.active_connections.pop("t-rate", None)
+    assert calls == [16000, 48000, 44100]
+
+
+async def test_failed_pass_keeps_the_hypothesis_and_the_audio(monkeypatch):
+    results = iter([[(0.1, 0.5, "alpha")], None])  # second pass dropped / timed out
+    partials: list[str] = []
+
+    async def fake_transcribe(audio, language=None, word_timestamps=False):  # noqa: ANN001
+        return next(results)
+
+    async def capture(session_id, event, payload):  # noqa: ANN001
+        partials.append(payload["text"])
+
+    monkeypatch.setattr(stt_worker.whisper_pool, "transcribe", fake_transcribe)
+    monkeypatch.setattr(stt_worker, "broadcast_to_session", capture)
+    s = AsrStream("en", max_buffer_s=2.0, shared=False)
+    s.append(_second())
+    await stt_worker._stream_pass("s", s)
+    s.append(_second())  # the window is full: an empty hypothesis would trim it
+    await stt_worker._stream_pass("s", s)
+    assert partials == ["alpha"]
+    assert [w[2] for w in s.pending] == ["alpha"] and s.buffered_s == pytest.approx(2.0)
@@ -0,0 +1,143 @@
+"""Coroutine DB paths on the async engine: command pipeline, compression, sockets, live ask."""
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select
+
+from app.core.database import async_engine, session_scope
+from app.core.security import decode_token
+from app.models.command import Command
+from app.models.enums import CommandIntent, CommandStatus
+from app.models.quiz import Quiz
+from app.models.session import Session
+from app.models.transcript import Transcript
+from app.services import ai_service as ai_module
+from app.services.ai_service import ai_service
+from app.services.context_manager import context_manager, get_context
+from app.websocket import connection, livequiz
+from app.workers import compression_worker, llm_worker
+from tests.util import admin_token, auth, client, make_hierarchy
+
+
+def _events(monkeypatch, *modules) -> list[tuple[str, dict]]:
+    sent: list[tuple[str, dict]] = []
+
+    async def fake_broadcast(session_id, event, data):  # noqa: ANN001
+        sent.append((event, data))
+
+    async def fake_emit(event, data, **_kw):  # noqa: ANN001, ANN003
+        sent.append((event, data))
+
+    async def fake_room(*_a):  # noqa: ANN002
+        return None
+
+    for module in modules:
+        monkeypatch.setattr(module, "broadcast_to_session", fake_broadcast)
+    monkeypatch.setattr(connection.sio, "emit", fake_emit)
+    monkeypatch.setattr(connection.sio, "enter_room", fake_room)
+    return sent
+
+
+async def test_command_quiz_and_live_game(monkeypatch):
+    token = admin_token()
+    sid = make_hierarchy(auth(token))["session"]["id"]
+    sent = _events(monkeypatch, llm_worker)
+
+    async def classify(command):  # noqa: ANN001
+        ai_module._add_tokens(5)
+        return CommandIntent.GENERATE_QUIZ
+
+    async def quiz(context, language=None):  # noqa: ANN001
+        assert language == "English" and context
+        ai_module._add_tokens(7)
+        return {"questions": [{"question": "2+2?", "options": ["3", "4"], "answer": 1}]}
+
+    monkeypatch.setattr(ai_service, "classify_intent", classify)
+    monkeypatch.setattr(ai_service, "generate_quiz", quiz)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *_a):  # noqa: ANN001, ANN002
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await llm_worker.process_command(sid, "hey aura quiz us")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert statements == ["INSERT", "SELECT", "WITH"]  # command + context, then update + quiz
+
+    (data,) = [d for e, d in sent if e == "command_response"]
+    assert data["data"]["shareCode"] and data["command"] == "quiz us"
+    with session_scope() as db:
+        cmd = db.get(Command, uuid.UUID(data["commandId"]))
+        assert cmd.status == CommandStatus.COMPLETED and cmd.intent == CommandIntent.GENERATE_QUIZ
+        assert cmd.tokens_used == 12 and cmd.llm_response["shareCode"] == data["data"]["shareCode"]
+        quiz_id, code = db.execute(select(Quiz.id, Quiz.share_code).where(Quiz.command_id == cmd.id)).one()
+        assert code == data["data"]["shareCode"]
+    stats = client.get("/debug/llm", headers=auth(token)).json()
+    assert stats["commands"] >= 1 and 0 < stats["dbTime"]["maxMs"] <= stats["total"]["maxMs"]
+
+    connection.active_connections["host-1"] = {
+        "user_id": decode_token(token, expected_type="access")["sub"],
+        "session_id": sid,
+        "role": "teacher",
+    }
+    try:
+        await livequiz.livequiz_start("host-1", {"quizId": str(quiz_id)})
+        assert livequiz._games[sid]["questions"][0]["question"] == "2+2?"
+        connection.active_connections["host-1"]["user_id"] = str(uuid.uuid4())  # not the owner
+        livequiz._drop_game(sid)
+        await livequiz.livequiz_start("host-1", {"quizId": str(quiz_id)})
+        assert sid not in livequiz._games
+    finally:
+        connection.active_connections.pop("host-1", None)
+
+
+async def test_compression_reads_and_writes_history(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    _events(monkeypatch, compression_worker)
+
+    async def leaf(text):  # noqa: ANN001
+        return {"summary": text[:20]}, "fallback"
+
+    monkeypatch.setattr(compression_worker, "compress_leaf", leaf)
+    await context_manager.add(sid, "speech", "momentum is conserved in collisions")
+    await compression_worker.run_compression(sid)
+    await compression_worker.run_compression(sid)  # nothing buffered: no-op
+    with session_scope() as db:
+        history = db.get(Session, uuid.UUID(sid)).compressed_history
+    assert [seg["segment_num"] for seg in history] == [1]
+
+
+async def test_teacher_connect_checks_ownership(monkeypatch):
+    token = admin_token()
+    sid = make_hierarchy(auth(token))["session"]["id"]
+    sent = _events(monkeypatch)
+    environ = {"QUERY_STRING": f"session_id={sid}"}
+    try:
+        assert await connection.connect("t-1", environ, {"token": token})
+        assert ("connected", {"sessionId": sid}) in sent
+        assert not await connection.connect("t-2", {"QUERY_STRING": f"session_id={uuid.uuid4()}"}, {"token": token})
+    finally:
+        await connection.disconnect("t-1")
+
+
+def test_live_ask_answers_from_the_transcript(monkeypatch):
+    sess = make_hierarchy(auth(admin_token()))["session"]
+
+    async def answer(context, question, language=None):  # noqa: ANN001
+        return {"answer": f"{question} / {context}"}
+
+    monkeypatch.setattr(ai_service, "answer_question", answer)
+    r = client.post(f"/live/{sess['join_code'].lower()}/ask", json={"question": "why?"})
+    assert r.status_code == 200 and r.json()["answer"] == "why? / This is a class about S1."
+
+
+async def test_context_is_newest_lines_oldest_first():
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    assert await get_context(sid) == "(no lecture content captured yet)"
+    with session_scope() as db:
+        for i in range(5):
+            ts = datetime(2026, 1, 1, 9, i, tzinfo=timezone.utc)
+            db.add(Transcript(session_id=uuid.UUID(sid), text=f"line {i}", timestamp=ts))
+    assert await get_context(sid, n_transcripts=3) == "[Spoken]\nline 2\nline 3\nline 4"
@@ -0,0 +1,80 @@
+"""Whiteboard images in the content-addressed blob store (+ serving, migration)."""
+import base64
+import importlib.util
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services.blob_store import LocalBlobStore, blob_key, blob_store
+from app.services.context_manager import get_context
+from tests.util import admin_token, auth, client, make_hierarchy
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+
+_spec = importlib.util.spec_from_file_location(
+    "migrate_board_images", Path(__file__).resolve().parent.parent / "scripts" / "migrate_board_images.py"
+)
+migrate_board_images = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migrate_board_images)
+
+
+def test_blobs_are_stored_once_by_content(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    key = store.put(PNG)
+    assert key == blob_key(PNG) and store.put(PNG) == key
+    assert store.path(key) == tmp_path / key[:2] / key[2:4] / key
+    assert store.get(key) == PNG and list(store.keys()) == [key]
+    assert store.path("../../etc/passwd") is None
+    store.delete(key)
+    assert not store.exists(key)
+
+
+def _row(sid: str, **image) -> uuid.UUID:
+    with session_scope() as db:
+        row = WhiteboardLog(session_id=uuid.UUID(sid), ocr_text="F = ma", **image)
+        db.add(row)
+        db.flush()
+        return row.id
+
+
+def test_image_endpoint_streams_blob_with_ranges():
+    h = auth(admin_token())
+    sid = make_hierarchy(h)["session"]["id"]
+    log_id = _row(sid, image_key=blob_store.put(PNG))
+    url = f"/sessions/{sid}/whiteboard/{log_id}/image"
+
+    r = client.get(url, headers=h)
+    assert r.status_code == 200 and r.content == PNG
+    assert r.headers["content-type"] == "image/png" and "immutable" in r.headers["cache-control"]
+    part = client.get(url, headers={**h, "Range": "bytes=8-15"})
+    assert part.status_code == 206 and part.content == PNG[8:16]
+    assert client.get(f"/sessions/{sid}/whiteboard/{uuid.uuid4()}/image", headers=h).status_code == 404
+
+
+async def test_migration_moves_base64_rows_into_the_store():
+    h = auth(admin_token())
+    sid = make_hierarchy(h)["session"]["id"]
+    legacy = [_row(sid, image_data=base64.b64encode(PNG + bytes([i])).decode()) for i in range(5)]
+    assert client.get(f"/sessions/{sid}/whiteboard/{legacy[0]}/image", headers=h).content == PNG + b"\x00"
+
+    assert migrate_board_images.migrate(batch=2) >= 5
+    with session_scope() as db:
+        rows = db.execute(
+            select(WhiteboardLog.image_key, WhiteboardLog.image_data).where(WhiteboardLog.id.in_(legacy))
+        ).all()
+    assert all(data is None and blob_store.get(key)[:-1] == PNG for key, data in rows)
+    assert client.get(f"/sessions/{sid}/whiteboard/{legacy[3]}/image", headers=h).content == PNG + b"\x03"
+    assert "F = ma" in await get_context(sid)
+
+    orphan = blob_store.put(b"no row points here")
+    assert migrate_board_images.prune(min_age_s=-1) >= 1
+    assert not blob_store.exists(orphan) and blob_store.exists(rows[0].image_key)
+
+
+@pytest.mark.parametrize("key", ["", "zz" * 32])
+def test_bad_keys_are_rejected(key):
+    assert blob_store.path(key) is None
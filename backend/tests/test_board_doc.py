@@ -0,0 +1,108 @@
+"""Typed board text read from the scene document instead of OCR."""
+import base64
+import io
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services import board_doc
+from app.workers import vision_worker
+from tests.util import admin_token, auth, make_hierarchy
+
+TLDRAW = {
+    "store": {
+        "page:b": {"typeName": "page", "id": "page:b", "index": "a2", "name": "Second"},
+        "page:a": {"typeName": "page", "id": "page:a", "index": "a1", "name": "First"},
+        "shape:title": {
+            "typeName": "shape", "id": "shape:title", "type": "text", "parentId": "page:a", "x": 10, "y": 20,
+            "props": {"richText": {"type": "doc", "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "Newton's laws"}]},
+                {"type": "paragraph", "content": [{"type": "text", "text": "F = ma"}]},
+            ]}, "w": 300},
+        },
+        "shape:frame": {
+            "typeName": "shape", "id": "shape:frame", "type": "frame", "parentId": "page:a", "x": 500, "y": 400,
+            "props": {"w": 400, "h": 300},
+        },
+        "shape:note": {
+            "typeName": "shape", "id": "shape:note", "type": "note", "parentId": "shape:frame", "x": 20, "y": 30,
+            "props": {"text": "remember units"},
+        },
+        "shape:ink": {
+            "typeName": "shape", "id": "shape:ink", "type": "draw", "parentId": "page:a", "x": 0, "y": 800,
+            "props": {"segments": [{"points": [{"x": 0, "y": 0}, {"x": 120, "y": 40}]}]},
+        },
+        "shape:other": {
+            "typeName": "shape", "id": "shape:other", "type": "geo", "parentId": "page:b", "x": 0, "y": 0,
+            "props": {"w": 100, "h": 100, "text": "page two"},
+        },
+    }
+}
+
+
+def test_tldraw_walker_reads_text_shapes_per_page():
+    first = board_doc.extract(TLDRAW, 1)
+    assert [(t.text, t.x, t.y) for t in first.texts] == [("Newton's laws\nF = ma", 10, 20), ("remember units", 520, 430)]
+    assert first.bounds == (0, 20, 900, 840)
+    assert [t.text for t in board_doc.extract({"document": TLDRAW}, 2).texts] == ["page two"]
+    assert board_doc.extract({"snapshot": "garbage"}) is None and board_doc.extract(None) is None
+
+
+def test_excalidraw_texts_map_onto_the_exported_image():
+    doc = {
+        "format": "excalidraw",
+        "exportPadding": 10,
+        "elements": [
+            {"type": "text", "x": 100, "y": 50, "width": 80, "height": 20, "text": "Title", "originalText": "Title"},
+            {"type": "text", "x": 0, "y": 0, "width": 10, "height": 10, "text": "gone", "isDeleted": True},
+            {"type": "freedraw", "x": 100, "y": 150, "width": 0, "height": 0, "points": [[0, 0], [200, 50]]},
+        ],
+    }
+    board = board_doc.extract(doc)
+    assert [t.text for t in board.texts] == ["Title"] and board.bounds == (100, 50, 300, 200)
+    # export = (200 + 2*10) scene units wide; at 2x that is 440 px
+    assert board.pixel_rect(board.texts[0], (440, 340)) == (16, 16, 185, 65)
+
+
+async def test_snapshot_ocr_only_sees_ink_and_merges_typed_text(monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    ImageDraw = pytest.importorskip("PIL.ImageDraw")
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    seen: list[tuple[int, int]] = []
+
+    async def fake_ocr(b64):  # noqa: ANN001
+        with Image.open(io.BytesIO(base64.b64decode(b64))) as img:
+            seen.append(img.size)
+            assert min(img.convert("L").crop((0, 0, img.width, 40)).getdata()) == 255  # title blanked
+        return "ink scribble"
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    scene = {
+        "format": "excalidraw",
+        "exportPadding": 16,
+        "elements": [
+            {"type": "text", "x": 0, "y": 0, "width": 200, "height": 20, "text": "Typed title"},
+            {"type": "freedraw", "x": 0, "y": 300, "points": [[0, 0], [400, 20]]},
+        ],
+    }
+    img = Image.new("RGB", (432, 352), "white")
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((16, 16, 216, 36), fill="black")  # rendered title
+    draw.rectangle((16, 316, 416, 336), fill="black")  # ink
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+
+    before = vision_worker.stats["docTexts"]
+    await vision_worker.process_snapshot(sid, base64.b64encode(buf.getvalue()).decode(), scene, 1)
+
+    assert len(seen) == 1 and vision_worker.stats["docTexts"] - before == 1
+    with session_scope() as db:
+        text = db.scalar(select(WhiteboardLog.ocr_text).where(WhiteboardLog.session_id == uuid.UUID(sid)))
+    assert text == "Typed title\nink scribble"
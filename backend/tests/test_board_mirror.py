@@ -0,0 +1,87 @@
+"""Student board mirror: per-tier frames encoded once, tile deltas, resync keyframes."""
+import asyncio
+import base64
+import io
+
+import pytest
+
+from app.services import board_mirror
+from app.services.board_mirror import MirrorState
+from app.workers import mirror_worker
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _png(*boxes, size=(2400, 1350)) -> bytes:
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for box in boxes:
+        draw.rectangle(box, fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _decoded(data_url: str):
+    return Image.open(io.BytesIO(base64.b64decode(data_url.split(",", 1)[1])))
+
+
+def test_keyframe_then_tile_deltas_per_tier():
+    state = MirrorState()
+    first = board_mirror.encode(state, _png((100, 100, 900, 160)))
+    assert set(first) == {"high", "low"} and all(p["key"] and p["seq"] == 1 for p in first.values())
+    assert (first["high"]["width"], first["low"]["width"]) == (1600, 800)
+    assert len(first["low"]["image"]) < len(first["high"]["image"])
+
+    second = board_mirror.encode(state, _png((100, 100, 900, 160), (1800, 1100, 2200, 1150)))
+    high = second["high"]
+    assert not high["key"] and high["seq"] == 2 and high["base"] == 1
+    assert 0 < len(high["tiles"]) <= 4 and all(t["x"] >= 1024 and t["y"] >= 640 for t in high["tiles"])
+    tile = _decoded(high["tiles"][0]["image"])
+    assert max(tile.size) <= 128
+
+    assert board_mirror.encode(state, _png((100, 100, 900, 160), (1800, 1100, 2200, 1150))) == {}
+    resized = board_mirror.encode(state, _png(size=(1200, 600)))
+    assert resized["high"]["key"] and resized["high"]["seq"] == 3
+    assert board_mirror.encode(state, b"junk") is None
+
+
+def test_keyframe_for_late_joiners_is_cached_until_next_frame():
+    state = MirrorState()
+    board_mirror.encode(state, _png((0, 0, 50, 50)))
+    board_mirror.encode(state, _png((0, 0, 50, 50), (600, 600, 700, 700)))
+    key = board_mirror.keyframe(state, "low")
+    assert key["key"] and key["seq"] == 2 and board_mirror.keyframe(state, "low") is key
+    assert _decoded(key["image"]).size == (800, 450)
+    assert board_mirror.keyframe(MirrorState(), "low") is None
+
+
+async def test_publish_emits_once_per_tier_room(monkeypatch):
+    sent: list[tuple[str, dict, dict]] = []
+
+    async def fake_emit(event, data, **kw):  # noqa: ANN001, ANN003
+        sent.append((event, data, kw))
+
+    monkeypatch.setattr(mirror_worker.sio, "emit", fake_emit)
+    async def settle():
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if "s-mirror" not in mirror_worker._running:
+                return
+
+    mirror_worker.publish("s-mirror", base64.b64encode(_png((10, 10, 300, 60))).decode())
+    await settle()
+    mirror_worker.publish("s-mirror", base64.b64encode(_png((10, 10, 300, 60), (900, 900, 990, 990))).decode())
+    mirror_worker.publish("s-mirror", "data:image/png;base64," + base64.b64encode(_png((10, 10, 300, 90))).decode())
+    await settle()
+    rooms = [kw["room"] for _, _, kw in sent]
+    assert rooms == ["live:s-mirror:board:high", "live:s-mirror:board:low"] * 2
+    assert [d["key"] for _, d, _ in sent] == [True, True, False, False]
+    assert sent[2][1]["base"] == 1 and mirror_worker.stats["superseded"] >= 1  # the middle board was skipped
+
+    sent.clear()
+    await mirror_worker.send_keyframe("student-sid", "s-mirror", "low")
+    [(event, data, kw)] = sent
+    assert event == "board_update" and data["key"] and data["tier"] == "low" and kw == {"to": "student-sid"}
+    assert mirror_worker.mirror_stats()["sentRatio"] < 1
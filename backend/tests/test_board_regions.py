@@ -0,0 +1,88 @@
+"""Region-diff OCR: changed-tile crops and the per-page text layout."""
+import base64
+import io
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services import board_regions
+from app.services.board_regions import PageLayout
+from app.workers import vision_worker
+from tests.util import admin_token, auth, make_hierarchy
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _board(*boxes: tuple[int, int, int, int], size=(1280, 720)) -> bytes:
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for box in boxes:
+        draw.rectangle(box, fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _gray(data: bytes):
+    return board_regions.load(data)[1]
+
+
+def test_layout_replaces_overlapping_regions_and_reads_in_order():
+    layout = PageLayout([((600, 40, 900, 120), "right"), ((40, 50, 400, 120), "left")])
+    assert layout.text() == "left\nright"
+    assert layout.expand([(380, 100, 500, 200)]) == [(40, 50, 500, 200)]
+    layout.replace((40, 50, 500, 200), "left, longer")
+    layout.replace((40, 400, 300, 500), "below")
+    assert layout.text() == "left, longer\nright\nbelow"
+    layout.replace((0, 380, 320, 520), "  ")  # erased
+    assert layout.text() == "left, longer\nright"
+
+
+def test_new_ink_on_one_side_crops_only_that_region():
+    first = _board((40, 40, 400, 60))
+    second = _board((40, 40, 400, 60), (800, 500, 1100, 520))
+    layout = PageLayout()
+    [r1] = board_regions.plan(None, _gray(first), (1280, 720), layout)
+    assert r1[0] == 0 and r1[2] < 640 and r1[3] < 200
+    layout.replace(r1, "first line")
+    [r2] = board_regions.plan(_gray(first), _gray(second), (1280, 720), layout)
+    assert r2[0] > 640 and r2[1] > 360  # bottom-right only
+    assert board_regions.plan(_gray(second), _gray(second), (1280, 720), layout) == []
+
+
+def test_large_change_falls_back_to_full_page():
+    blank, full = _board(), _board((0, 0, 1279, 600))
+    assert board_regions.plan(_gray(blank), _gray(full), (1280, 720), PageLayout()) is None
+
+
+async def test_snapshot_ocr_sends_changed_crops_and_merges_page_text(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    sizes: list[tuple[int, int]] = []
+
+    async def fake_ocr(b64):  # noqa: ANN001
+        with Image.open(io.BytesIO(base64.b64decode(b64))) as img:
+            sizes.append(img.size)
+        return "top" if len(sizes) == 1 else "bottom"
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    one = _board((40, 40, 400, 60))
+    two = _board((40, 40, 400, 60), (40, 500, 400, 520))
+    for data in (one, two):
+        await vision_worker.process_snapshot(sid, base64.b64encode(data).decode(), None, 1)
+
+    assert len(sizes) == 2 and all(w * h < 1280 * 720 / 4 for w, h in sizes)
+    with session_scope() as db:
+        texts = db.scalars(
+            select(WhiteboardLog.ocr_text)
+            .where(WhiteboardLog.session_id == uuid.UUID(sid))
+            .order_by(WhiteboardLog.timestamp)
+        ).all()
+    assert texts == ["top", "top\nbottom"]
@@ -0,0 +1,117 @@
+"""Board scene history: JSON patch round-trips, keyframe chains, reconstruction API."""
+import base64
+import io
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services import json_patch
+from app.services.board_scene import SceneChain, materialize
+from app.workers import vision_worker
+from tests.util import admin_token, auth, client, make_hierarchy
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _el(i: int, text: str = "") -> dict:
+    return {"id": f"e{i}", "type": "text" if text else "freedraw", "x": i * 40, "y": 20, "text": text,
+            "points": [[0, 0], [i, i + 1], [2 * i, 3]]}
+
+
+def _scene(n: int, **edits: str) -> dict:
+    elements = [_el(i, edits.get(f"e{i}", "")) for i in range(n)]
+    return {"format": "excalidraw", "exportPadding": 16, "elements": elements}
+
+
+def _png(bars: int) -> str:
+    img = Image.new("RGB", (640, 360), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(bars):
+        draw.rectangle((20 + i * 52, 40 + (i % 3) * 90, 56 + i * 52, 120 + (i % 3) * 90), fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        (_scene(3), _scene(4)),  # append
+        (_scene(4), {**_scene(4), "elements": _scene(4)["elements"][:1] + _scene(4)["elements"][2:]}),  # delete
+        (_scene(4), _scene(4, e2="x = 3")),  # edit in place
+        ({"a/b": 1, "c~d": [1, 2]}, {"a/b": 2, "c~d": [2], "new": None}),  # escaping
+        ([1, 2, 3], {"not": "a list"}),  # root replace
+    ],
+)
+def test_patch_round_trip(a, b):
+    patch = json_patch.diff(a, b)
+    assert json_patch.apply(a, patch) == b
+    assert json_patch.apply(a, json_patch.diff(a, a)) == a and json_patch.diff(a, a) == []
+
+
+def test_small_edits_make_small_patches():
+    patch = json_patch.diff(_scene(30), _scene(31, e5="hello"))
+    assert [op["path"] for op in patch] == ["/elements/5/type", "/elements/5/text", "/elements/30"]
+    assert json_patch.apply([1, 2], [{"op": "add", "path": "/-", "value": 3}]) == [1, 2, 3]
+
+
+def test_chain_writes_a_keyframe_then_patches(monkeypatch):
+    monkeypatch.setattr(settings, "scene_keyframe_every", 3)
+    chain = SceneChain()
+    assert chain.fields(None) == {}
+    kinds = []
+    for n in range(1, 8):
+        out = chain.fields(_scene(20 + n))
+        kinds.append("patch" if "scene_patch" in out else "key")
+        chain.committed(uuid.uuid4())
+    assert kinds == ["key", "patch", "patch", "key", "patch", "patch", "key"]
+    assert chain.nbytes > 0
+
+    big = SceneChain()
+    big.fields({"elements": [1]})
+    big.committed(uuid.uuid4())
+    assert "tldraw_snapshot" in big.fields({"elements": [2, 3, 4]})  # patch not worth it
+
+
+async def test_snapshots_store_patches_and_rebuild(monkeypatch):
+    monkeypatch.setattr(settings, "scene_keyframe_every", 4)
+    token = auth(admin_token())
+    sid = make_hierarchy(token)["session"]["id"]
+
+    async def fake_ocr(b64):  # noqa: ANN001
+        return "board"
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    docs = [_scene(10 + i, e3=f"step {i}") for i in range(6)]
+    for i, doc in enumerate(docs):
+        await vision_worker.process_snapshot(sid, _png(i + 1), doc, 1)
+
+    with session_scope() as db:
+        rows = db.execute(
+            select(WhiteboardLog.id, WhiteboardLog.scene_key_id, WhiteboardLog.scene_seq)
+            .where(WhiteboardLog.session_id == uuid.UUID(sid))
+            .order_by(WhiteboardLog.timestamp)
+        ).all()
+        assert len(rows) == len(docs)
+        assert [r.scene_seq for r in rows] == [0, 1, 2, 3, 0, 1]
+        assert rows[1].scene_key_id == rows[0].id and rows[4].scene_key_id is None
+        for row, doc in zip(reversed(rows), reversed(docs)):  # newest first: cold cache walks
+            assert materialize(db, row.id) == doc
+        ids = [str(r.id) for r in rows]
+
+    r = client.get(f"/sessions/{sid}/whiteboard/{ids[2]}/scene", headers=token)
+    assert r.status_code == 200 and r.json()["scene"] == docs[2]
+    r = client.get(f"/sessions/{sid}/whiteboard/scene", params={"page": 1}, headers=token)
+    assert r.json() == {"logId": ids[-1], "scene": docs[-1]}
+    assert client.get(f"/sessions/{sid}/whiteboard/scene", params={"page": 2}, headers=token).status_code == 404
+    other = make_hierarchy(token)["session"]["id"]
+    assert client.get(f"/sessions/{other}/whiteboard/{ids[2]}/scene", headers=token).status_code == 404
@@ -0,0 +1,67 @@
+"""Late-joiner catch-up: latest board frame + recent transcript/command events on connect."""
+import asyncio
+import base64
+import io
+
+import pytest
+
+from app.core.config import settings
+from app.services.catchup import CatchupLog
+from app.services.session_state import session_registry
+from app.websocket import connection
+from app.workers import mirror_worker
+from tests.util import admin_token, auth, make_hierarchy
+
+
+def test_rings_are_bounded_and_accounted(monkeypatch):
+    monkeypatch.setattr(settings, "catchup_transcripts", 3)
+    log = CatchupLog()
+    for i in range(5):
+        log.record("s-ring", "transcript_batch", {"items": [{"id": str(i), "text": f"line {i}"}]})
+    log.record("s-ring", "command_response", {"type": "summary", "data": {"summary": "x"}})
+    log.record("s-ring", "context_update", {"tokens": 9})  # not replayed
+    snap = log.snapshot("s-ring")
+    assert [t["text"] for t in snap["transcripts"]] == ["line 2", "line 3", "line 4"]
+    assert [c["type"] for c in snap["commands"]] == ["summary"]
+    assert 0 < log._rings["s-ring"].nbytes < 200
+    log.drop("s-ring")
+    assert log.snapshot("s-ring") == {"transcripts": [], "commands": []}
+
+
+async def test_student_connect_gets_one_catchup_payload(monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    sess = make_hierarchy(auth(admin_token()))["session"]
+    sid = sess["id"]
+    sent: list[tuple[str, dict, dict]] = []
+
+    async def fake_emit(event, data, **kw):  # noqa: ANN001, ANN003
+        sent.append((event, data, kw))
+
+    async def fake_room(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(connection.sio, "emit", fake_emit)
+    monkeypatch.setattr(connection.sio, "enter_room", fake_room)
+
+    await connection.broadcast_to_session(sid, "transcript_batch", {"items": [{"id": "t1", "text": "Entropy"}]})
+    await connection.broadcast_to_session(sid, "command_response", {"type": "quiz", "commandId": "c1"})
+    buf = io.BytesIO()
+    Image.new("RGB", (1200, 700), "white").save(buf, "PNG")
+    mirror_worker.publish(sid, base64.b64encode(buf.getvalue()).decode())
+    for _ in range(200):
+        await asyncio.sleep(0.01)
+        if sid not in mirror_worker._running:
+            break
+    sent.clear()
+
+    assert await connection._connect_student("student-1", {"joinCode": sess["join_code"], "quality": "low"})
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if any(e == "catchup" for e, _, _ in sent):
+            break
+    [catchup] = [d for e, d, kw in sent if e == "catchup" and kw == {"to": "student-1"}]
+    assert catchup["board"]["key"] and catchup["board"]["tier"] == "low" and catchup["board"]["width"] == 800
+    assert [t["text"] for t in catchup["transcripts"]] == ["Entropy"]
+    assert [c["commandId"] for c in catchup["commands"]] == ["c1"]
+    connection.active_connections.pop("student-1", None)
+    session_registry.disconnect(sid, "student-1")
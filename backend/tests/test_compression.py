@@ -0,0 +1,118 @@
+"""Tiered compression engine + keyphrase fallback (offline; AI calls patched)."""
+import asyncio
+
+from app.services import compression
+from app.services.ai_service import AIService
+from app.services.compression import chunk_text, fold, merge_summaries, render_history
+from app.services.keyphrases import extract_keyphrases
+from app.workers import compression_worker
+
+
+def test_chunk_text_keeps_everything_and_bounds_size():
+    text = "\n".join(f"[speech] line {i} " + "x" * 50 for i in range(400))
+    chunks = chunk_text(text, limit=1000)
+    assert len(chunks) > 1
+    assert all(len(c) <= 1000 for c in chunks)
+    assert "\n".join(chunks) == text
+
+
+def test_chunk_text_hard_splits_long_line():
+    chunks = chunk_text("y" * 2500, limit=1000)
+    assert [len(c) for c in chunks] == [1000, 1000, 500]
+
+
+def test_merge_summaries_dedupes_and_bounds():
+    a = {"topicFlow": ["a", "b"], "keyConcepts": {"x": "old"}}
+    b = {"topicFlow": ["b", "c"], "keyConcepts": {"x": "new", "y": "why"}}
+    m = merge_summaries(a, b)
+    assert m["topicFlow"] == ["a", "b", "c"]
+    assert m["keyConcepts"] == {"x": "new", "y": "why"}
+    big = merge_summaries(*({"topicFlow": [str(i)]} for i in range(100)))
+    assert len(big["topicFlow"]) <= 24
+
+
+async def test_fold_keeps_history_logarithmic(monkeypatch):
+    async def no_llm(self, older, newer):  # noqa: ANN001
+        return {"error": "offline"}
+
+    monkeypatch.setattr(AIService, "merge_summaries", no_llm)
+    history: list[dict] = []
+    for n in range(1, 65):
+        leaf = {"segment_num": n, "time_range": f"t{n}", "token_count": 10, "summary": {"topicFlow": [f"t{n}"]}}
+        history = await fold(history, leaf)
+    assert len(history) == 1  # 64 leaves -> one level-6 segment
+    top = history[0]
+    assert top["level"] == 6 and top["leaves"] == 64 and top["token_count"] == 640
+    assert top["segment_num"] == 64 and top["time_range"] == "t1/t64"
+    assert top["compression_method"] == "fallback"
+
+    history = await fold(history, {"segment_num": 65, "time_range": "t65", "summary": {}})
+    assert [s["level"] for s in history] == [6, 0]
+
+
+async def test_compress_leaf_maps_chunks_in_parallel(monkeypatch):
+    seen: list[str] = []
+
+    async def fake_compress(self, text):  # noqa: ANN001
+        seen.append(text)
+        return {"topicFlow": [f"part{len(seen)}"], "keyConcepts": {}}
+
+    monkeypatch.setattr(AIService, "compress_context", fake_compress)
+    monkeypatch.setattr(compression, "_CHUNK_CHARS", 100)
+    text = "\n".join("[speech] " + "z" * 60 for _ in range(10))
+    summary, method = await compression.compress_leaf(text)
+    assert method == "llm"
+    assert len(seen) == 10
+    assert summary["topicFlow"] == [f"part{i}" for i in range(1, 11)]
+
+
+def test_render_history_is_compact():
+    out = render_history([{"summary": {"topicFlow": ["a", "b"], "keyConcepts": {"k": "v"}}}])
+    assert out == "- a → b | Concepts: k: v"
+
+
+def test_extract_keyphrases_ranks_content_phrases():
+    text = (
+        "Today we discuss gradient descent. Gradient descent minimizes the loss function. "
+        "The learning rate controls gradient descent step size, and the loss function is convex."
+    )
+    phrases = extract_keyphrases(text, k=4)
+    assert "gradient descent" in phrases
+    assert "loss function" in phrases
+    assert all(w not in {"the", "and", "today"} for p in phrases for w in p.split())
+
+
+async def test_compress_fallback_uses_keyphrases(monkeypatch):
+    async def offline(self, tier, system, user):  # noqa: ANN001
+        return None
+
+    monkeypatch.setattr(AIService, "_complete", offline)
+    out = await AIService().compress_context("[speech] neural networks learn features\n[board] neural networks")
+    assert out["_fallback"] is True
+    assert "neural networks" in out["topicFlow"]
+    assert "speech" not in " ".join(out["topicFlow"])
+
+
+async def test_coordinator_single_flight_and_coalesce(monkeypatch):
+    async def over_limit(session_id):  # noqa: ANN001
+        return True
+
+    monkeypatch.setattr(compression_worker.context_manager, "should_compress", over_limit)
+    gate = asyncio.Event()
+    runs: list[str] = []
+
+    async def fake_run(session_id):  # noqa: ANN001
+        runs.append(session_id)
+        await gate.wait()
+
+    monkeypatch.setattr(compression_worker, "run_compression", fake_run)
+    coord = compression_worker.CompressionCoordinator()
+    first = asyncio.create_task(coord.trigger("s1"))
+    await asyncio.sleep(0)
+    assert coord.in_flight("s1")
+    await asyncio.gather(coord.trigger("s1"), coord.trigger("s1"))  # coalesced, return at once
+    assert runs == ["s1"]
+    gate.set()
+    await first
+    assert runs == ["s1", "s1"]  # exactly one follow-up pass
+    assert not coord.in_flight("s1")
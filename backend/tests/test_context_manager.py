@@ -2,23 +2,34 @@ from app.core.config import settings
 from app.services.context_manager import ContextManager
 
 
-def test_buffer_add_tokens_snapshot_clear():
+async def test_buffer_add_tokens_snapshot_clear():
     cm = ContextManager()
     sid = "sess-a"
-    assert cm.tokens(sid) == 0
-    cm.add(sid, "speech", "x" * 40)  # ~10 tokens
-    assert cm.tokens(sid) >= 10
-    snap = cm.snapshot_text(sid)
+    assert await cm.tokens(sid) == 0
+    await cm.add(sid, "speech", "x" * 40)  # ~10 tokens
+    assert await cm.tokens(sid) >= 10
+    snap = await cm.snapshot_text(sid)
     assert "[speech]" in snap
-    cm.clear(sid)
-    assert cm.tokens(sid) == 0
-    assert cm.snapshot_text(sid) == ""
+    await cm.clear(sid)
+    assert await cm.tokens(sid) == 0
+    assert await cm.snapshot_text(sid) == ""
 
 
-def test_should_compress(monkeypatch):
+async def test_should_compress(monkeypatch):
     monkeypatch.setattr(settings, "compression_token_limit", 5)
     cm = ContextManager()
     sid = "sess-b"
-    assert not cm.should_compress(sid)
-    cm.add(sid, "speech", "z" * 40)
-    assert cm.should_compress(sid)
+    assert not await cm.should_compress(sid)
+    await cm.add(sid, "speech", "z" * 40)
+    assert await cm.should_compress(sid)
+
+
+async def test_snapshot_watermark_keeps_later_items():
+    cm = ContextManager()
+    sid = "sess-c"
+    await cm.add(sid, "speech", "a" * 40)
+    text, tokens, mark = await cm.snapshot(sid)
+    assert "[speech]" in text and tokens == 10
+    await cm.add(sid, "board", "b" * 20)  # arrives while compression is in flight
+    assert await cm.clear_through(sid, mark) == 5
+    assert await cm.snapshot_text(sid) == "[board] " + "b" * 20
@@ -0,0 +1,63 @@
+"""Event-loop lag monitor: histogram buckets, stall capture and attribution, /debug/loop."""
+import asyncio
+import time
+import traceback
+
+from app.core import loop_monitor as lm
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import Histogram
+from tests.util import admin_token, auth, client
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram()
+    for s in (0.0005, 0.003, 0.003, 0.2, 5.0):
+        h.observe(s)
+    summary = h.summary()
+    assert summary["count"] == 5
+    assert summary["le"]["1"] == 1 and summary["le"]["5"] == 3 and summary["le"]["250"] == 4
+    assert summary["le"]["+Inf"] == 5
+
+
+def test_site_labels_are_module_and_function():
+    frame = traceback.FrameSummary(f"{lm._APP_ROOT}/workers/vision_worker.py", 10, "process_snapshot")
+    assert lm._label(frame) == "app.workers.vision_worker:process_snapshot"
+
+
+def _blocking_handler() -> None:
+    time.sleep(0.25)  # a sync call on the loop
+
+
+async def test_stall_is_measured_and_its_stack_captured():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=50, capture=True)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    _blocking_handler()
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    stats = monitor.stats()
+    assert stats["stalls"] >= 1 and stats["lag"]["maxMs"] >= 200
+    assert stats["histogram"]["count"] == stats["lag"]["count"]
+    (site,) = stats["sites"]
+    assert site["count"] == 1 and site["maxMs"] >= 200
+    assert any("_blocking_handler" in line for line in site["stack"])
+
+
+async def test_without_capture_only_lag_is_kept():
+    monitor = LoopMonitor(interval_ms=10, threshold_ms=50, capture=False)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.03)
+    time.sleep(0.1)
+    await asyncio.sleep(0.03)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    stats = monitor.stats()
+    assert stats["stalls"] == 1 and stats["sites"] == []
+
+
+def test_debug_loop_is_admin_only():
+    assert client.get("/debug/loop").status_code in (401, 403)
+    r = client.get("/debug/loop", headers=auth(admin_token()))
+    assert r.status_code == 200 and {"lag", "histogram", "stalls", "sites"} <= r.json().keys()
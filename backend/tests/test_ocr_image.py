@@ -0,0 +1,62 @@
+"""Image normalization before vision OCR (crop, downsample, grayscale, re-encode)."""
+import base64
+import io
+
+import pytest
+
+from app.services import ocr_image
+from app.workers import vision_worker
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _png(size=(2400, 1400), bg="white", ink="navy", box=(1200, 600, 1500, 680)) -> bytes:
+    img = Image.new("RGB", size, bg)
+    ImageDraw.Draw(img).rectangle(box, fill=ink)
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _open(data: bytes):
+    return Image.open(io.BytesIO(data))
+
+
+def test_crops_to_ink_grayscales_and_shrinks():
+    src = _png()
+    out = ocr_image.prepare(src)
+    img = _open(out)
+    assert img.mode == "L" and img.size == (301 + 32, 81 + 32)
+    assert len(out) < len(src) and img.getextrema() == (0, 255)
+
+
+def test_large_ink_area_is_downsampled_and_dark_boards_inverted():
+    out = _open(ocr_image.prepare(_png(bg="#111111", ink="white", box=(0, 0, 2399, 900)), max_side=800))
+    assert max(out.size) == 800
+    assert out.getpixel((out.width // 2, out.height // 4)) == 0  # ink is dark after inversion
+
+
+def test_blank_board_is_not_sent_and_garbage_passes_through():
+    assert ocr_image.prepare(_png(box=(0, 0, 0, 0), ink="white")) is None
+    assert ocr_image.prepare(b"not an image") == b"not an image"
+
+
+async def test_run_ocr_sends_the_normalized_image(monkeypatch):
+    sent: list[bytes] = []
+
+    async def fake_groq(b64):  # noqa: ANN001
+        sent.append(base64.b64decode(b64))
+        return "x = 1"
+
+    monkeypatch.setattr(vision_worker, "_ocr_groq", fake_groq)
+    before = dict(vision_worker.stats)
+    src = _png()
+    assert await vision_worker._run_ocr(base64.b64encode(src).decode()) == "x = 1"
+    assert await vision_worker._run_ocr(base64.b64encode(_png(box=(0, 0, 0, 0), ink="white")).decode()) == ""
+
+    assert len(sent) == 1 and _open(sent[0]).mode == "L"
+    assert vision_worker.stats["blankSkipped"] - before["blankSkipped"] == 1
+    assert vision_worker.stats["ocrBytesOut"] - before["ocrBytesOut"] == len(sent[0])
+    body = vision_worker.vision_stats()
+    assert body["ocrPayloadRatio"] < 1 and body["prepLatency"]["count"] >= 2 and body["ocrLatency"]["count"] >= 1
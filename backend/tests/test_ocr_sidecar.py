@@ -0,0 +1,84 @@
+"""EasyOCR sidecar: spawned reader, shared-memory handoff, drops and timeouts (fake reader)."""
+import io
+import time
+
+import pytest
+
+from app.services.ocr_sidecar import OcrSidecar
+from tests.util import admin_token, auth, client
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("numpy")
+
+
+class _SizeReader:
+    """Reads back the image size; a 13 px wide image hangs, a 7 px one fails."""
+
+    def __init__(self, languages) -> None:  # noqa: ANN001
+        self.languages = languages
+
+    def readtext(self, img, detail=0, paragraph=True):  # noqa: ANN001
+        h, w = img.shape[:2]
+        if w == 13:
+            time.sleep(30)
+        if w == 7:
+            raise ValueError("unreadable")
+        return [f"{w}x{h}", "/".join(self.languages)]
+
+
+def size_loader(languages) -> _SizeReader:  # noqa: ANN001
+    return _SizeReader(languages)
+
+
+def slow_loader(languages) -> _SizeReader:  # noqa: ANN001
+    time.sleep(3)  # a cold model load, longer than a job's deadline
+    return _SizeReader(languages)
+
+
+def _png(w: int, h: int = 10) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (w, h), "white").save(buf, "PNG")
+    return buf.getvalue()
+
+
+async def test_sidecar_reads_images_and_recovers_from_a_stuck_one():
+    sidecar = OcrSidecar(queue_depth=2, timeout_s=3, languages=("en", "de"), loader=size_loader)
+    try:
+        assert sidecar.start()
+        assert await sidecar.wait_ready(timeout=60)
+        assert await sidecar.read(_png(320, 40)) == "320x40 en/de"
+        assert await sidecar.read(_png(7)) == ""
+        assert await sidecar.read(_png(13)) == ""  # times out; the process is replaced
+        assert not sidecar.started
+        assert await sidecar.read(_png(50)) == "50x10 en/de"
+        stats = sidecar.stats()
+        assert stats["completed"] == 2 and stats["failed"] == 1
+        assert stats["timedOut"] == 1 and stats["restarts"] == 1 and stats["inFlight"] == 0
+        assert stats["inference"]["count"] == 3
+    finally:
+        sidecar.stop()
+    assert not sidecar.started
+
+
+async def test_job_deadline_starts_once_the_sidecar_is_ready():
+    sidecar = OcrSidecar(timeout_s=2, startup_timeout_s=0.5, languages=("en",), loader=slow_loader)
+    try:
+        assert await sidecar.read(_png(40)) == ""  # still loading: no text, but not killed
+        assert sidecar.started and sidecar.stats()["notReady"] == 1
+        sidecar.startup_timeout_s = 60
+        assert await sidecar.read(_png(40)) == "40x10 en"
+        stats = sidecar.stats()
+        assert stats["timedOut"] == 0 and stats["restarts"] == 0
+    finally:
+        sidecar.stop()
+
+
+async def test_sidecar_without_easyocr_is_a_noop():
+    sidecar = OcrSidecar()
+    assert await sidecar.read(_png(10)) == ""
+    assert sidecar.stats()["available"] is False and not sidecar.started
+
+
+def test_debug_vision_reports_the_sidecar():
+    body = client.get("/debug/vision", headers=auth(admin_token())).json()
+    assert {"queueWait", "inference", "timedOut"} <= body["easyocr"].keys()
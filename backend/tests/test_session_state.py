@@ -0,0 +1,64 @@
+"""Session-state registry: lifecycle, byte accounting, LRU ceiling, debug endpoint."""
+import asyncio
+
+from app.services.context_manager import ContextManager
+from app.services.session_state import RECORD_OVERHEAD, SessionRegistry, session_registry
+from tests.util import admin_token, auth, client, make_hierarchy
+
+
+async def test_context_buffer_bytes_accounted_and_released_on_end():
+    reg = SessionRegistry(idle_timeout_s=60, max_bytes=10_000)
+    cm = ContextManager(reg)
+    await cm.add("s1", "speech", "a" * 100)
+    assert reg.bytes_for("s1") == RECORD_OVERHEAD + 100
+    _, _, mark = await cm.snapshot("s1")
+    await cm.add("s1", "board", "b" * 10)
+    await cm.clear_through("s1", mark)
+    assert reg.bytes_for("s1") == RECORD_OVERHEAD + 10
+    reg.end_session("s1")
+    assert "s1" not in reg and await cm.tokens("s1") == 0
+    assert reg.total_bytes == 0 and reg.released["ended"] == 1
+
+
+def test_idle_sweep_skips_connected_sessions():
+    reg = SessionRegistry(idle_timeout_s=10, max_bytes=10_000)
+    reg.connect("live", "sid-1")
+    reg.touch("gone")
+    assert reg.sweep(now=10**9) == 1
+    assert "live" in reg and "gone" not in reg
+    reg.disconnect("live", "sid-1")
+    reg.sweep(now=10**9)
+    assert "live" not in reg
+
+
+def test_ceiling_evicts_least_recent_disconnected_first():
+    reg = SessionRegistry(idle_timeout_s=60, max_bytes=1000)
+    dropped: list[str] = []
+    reg.on_release(dropped.append)
+    reg.connect("teaching", "sid-1")
+    reg.touch("teaching", 400)
+    reg.touch("old", 400)
+    reg.touch("new", 400)  # over the ceiling -> "old" goes, not the connected one
+    assert dropped == ["old"]
+    assert reg.total_bytes == 800 and reg.released["evicted"] == 1
+
+
+def test_debug_sessions_admin_only():
+    assert client.get("/debug/sessions").status_code == 401
+    body = client.get("/debug/sessions", headers=auth(admin_token())).json()
+    assert "liveSessions" in body and "totalBytes" in body and isinstance(body["sessions"], list)
+
+
+def test_session_routes_release_state_on_the_event_loop(monkeypatch):
+    h = auth(admin_token())
+    sid = make_hierarchy(h)["session"]["id"]
+    released: list[str] = []
+
+    def end_session(session_id: str) -> None:
+        asyncio.get_running_loop()  # raises off the loop (e.g. in the threadpool)
+        released.append(session_id)
+
+    monkeypatch.setattr(session_registry, "end_session", end_session)
+    assert client.post(f"/sessions/{sid}/end", headers=h).status_code == 200
+    assert client.delete(f"/sessions/{sid}", headers=h).status_code == 204
+    assert released == [sid, sid]
@@ -0,0 +1,88 @@
+"""Postgres-backed shared context buffer (multi-worker mode) against the test DB."""
+import asyncio
+import contextlib
+import uuid
+
+from app.core.config import settings
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.models.session import Session
+from app.services.context_manager import SharedContextManager
+from tests.util import make_user
+
+
+def _session_id() -> str:
+    teacher_id, _ = make_user()
+    db = SessionLocal()
+    try:
+        sess = Session(teacher_id=uuid.UUID(teacher_id), subject="Shared")
+        db.add(sess)
+        db.commit()
+        return str(sess.id)
+    finally:
+        db.close()
+
+
+async def test_two_workers_share_counter_and_watermark():
+    sid = _session_id()
+    a, b = SharedContextManager(), SharedContextManager()  # two "processes"
+    await a.add(sid, "speech", "x" * 40)
+    assert await b.add(sid, "board", "y" * 20) == 15  # counts toward one shared total
+    text, tokens, mark = await a.snapshot(sid)
+    assert tokens == 15 and "[speech]" in text and "[board]" in text
+    await b.add(sid, "speech", "z" * 8)  # lands mid-compression
+    assert await a.clear_through(sid, mark) == 2
+    assert await b.snapshot_text(sid) == "[speech] " + "z" * 8
+
+
+async def test_buffer_never_uses_the_sync_engine():
+    sid = _session_id()
+    cm = SharedContextManager()
+    sync_calls: list[str] = []
+
+    def record(conn, cursor, statement, *_a):  # noqa: ANN001, ANN002
+        sync_calls.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await cm.add(sid, "speech", "x" * 40)
+        await cm.snapshot(sid)
+        assert await cm.acquire_lease(sid)
+        await cm.release_lease(sid)
+        await cm.clear(sid)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert sync_calls == []  # nothing blocks the event loop
+
+
+async def test_lease_is_exclusive_across_workers():
+    sid = _session_id()
+    a, b = SharedContextManager(), SharedContextManager()
+    await a.add(sid, "speech", "hello")
+    assert await a.acquire_lease(sid)
+    assert not await b.acquire_lease(sid)
+    await a.release_lease(sid)
+    assert await b.acquire_lease(sid)
+
+
+async def test_listen_relays_changes_from_other_processes():
+    sid = _session_id()
+    listener, writer = SharedContextManager(), SharedContextManager()
+    writer._suffix = ":other-pid"
+    seen: asyncio.Queue = asyncio.Queue()
+
+    async def on_change(session_id: str, tokens: int) -> None:
+        await seen.put((session_id, tokens))
+
+    task = asyncio.create_task(listener.listen(on_change))
+    try:
+        await asyncio.sleep(0.5)  # let LISTEN register
+        await writer.add(sid, "speech", "w" * 400)
+        assert await asyncio.wait_for(seen.get(), 5) == (sid, 100)
+        assert await listener.tokens(sid) == 100
+        assert await listener.should_compress(sid) == (100 >= settings.compression_token_limit)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,47 @@
+"""Latest-wins snapshot slots: one pass in flight per page, newest image next."""
+import asyncio
+
+from app.workers import vision_worker
+
+
+async def test_fast_snapshots_coalesce_to_the_newest_per_page(monkeypatch):
+    done: list[tuple[int, str]] = []
+    in_flight: dict[int, int] = {}
+    peak = 0
+    gate = asyncio.Event()
+
+    async def slow(session_id, image, doc, page):  # noqa: ANN001
+        nonlocal peak
+        in_flight[page] = in_flight.get(page, 0) + 1
+        peak = max(peak, in_flight[page])
+        await gate.wait()
+        if image == "bad":
+            raise RuntimeError("decoder blew up")
+        done.append((page, image))
+        in_flight[page] -= 1
+
+    monkeypatch.setattr(vision_worker, "process_snapshot", slow)
+    before = vision_worker.stats["superseded"]
+    vision_worker.submit_snapshot("s-coalesce", "a1", None, 1)
+    await asyncio.sleep(0)  # a1's pass starts
+    for image in ("a2", "a3", "a4"):
+        vision_worker.submit_snapshot("s-coalesce", image, None, 1)
+    vision_worker.submit_snapshot("s-coalesce", "b1", None, 2)
+    await asyncio.sleep(0)
+    assert vision_worker.vision_stats()["pagesInFlight"] >= 2
+    gate.set()
+    for _ in range(50):
+        await asyncio.sleep(0)
+        if not any(k[0] == "s-coalesce" for k in vision_worker._slots):
+            break
+
+    # a1 was already running; a2 and a3 were replaced by a4 while it waited.
+    assert sorted(done) == [(1, "a1"), (1, "a4"), (2, "b1")]
+    assert peak == 1 and vision_worker.stats["superseded"] - before == 2
+
+    # A failing pass doesn't wedge the page.
+    vision_worker.submit_snapshot("s-coalesce", "bad", None, 1)
+    vision_worker.submit_snapshot("s-coalesce", "a5", None, 1)
+    for _ in range(50):
+        await asyncio.sleep(0)
+    assert done[-1] == (1, "a5") and not vision_worker._slots
@@ -0,0 +1,113 @@
+"""Whiteboard timeline: thumbnail pyramid + paginated snapshot metadata."""
+import base64
+import importlib.util
+import io
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services import board_thumbs
+from app.services.blob_store import blob_store
+from app.workers import thumbnail_worker, vision_worker
+from tests.util import admin_token, auth, client, make_hierarchy
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+_spec = importlib.util.spec_from_file_location(
+    "migrate_board_images", Path(__file__).resolve().parent.parent / "scripts" / "migrate_board_images.py"
+)
+migrate_board_images = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migrate_board_images)
+
+
+def _png(bars: int, size: tuple[int, int] = (1600, 900)) -> bytes:
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(bars):
+        draw.rectangle((60 + i * 140, 100 + (i % 3) * 220, 150 + i * 140, 280 + (i % 3) * 220), fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def test_render_builds_each_size_without_upscaling():
+    thumbs = board_thumbs.render(_png(2))
+    sides = {name: max(Image.open(io.BytesIO(b)).size) for name, b in thumbs.items()}
+    assert sides == board_thumbs.SIZES
+    small = board_thumbs.render(_png(0, (300, 120)))
+    assert max(Image.open(io.BytesIO(small["lg"])).size) == 300
+    assert board_thumbs.render(b"not an image") is None
+
+
+async def _snapshots(monkeypatch, sid: str, images: list[bytes], page: int = 1) -> None:
+    async def fake_ocr(b64):  # noqa: ANN001
+        return "x" * 400
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    for data in images:
+        await vision_worker.process_snapshot(sid, base64.b64encode(data).decode(), None, page)
+    await thumbnail_worker._runner
+
+
+async def test_timeline_pages_through_history_with_thumbnails(monkeypatch):
+    monkeypatch.setattr(thumbnail_worker, "_queue", None)
+    monkeypatch.setattr(thumbnail_worker, "_runner", None)
+    token = auth(admin_token())
+    sid = make_hierarchy(token)["session"]["id"]
+    before = dict(thumbnail_worker.stats)
+    await _snapshots(monkeypatch, sid, [_png(1), _png(2)])
+    await _snapshots(monkeypatch, sid, [_png(3)], page=2)
+    assert thumbnail_worker.stats["built"] - before["built"] == 3
+
+    url = f"/sessions/{sid}/whiteboard/timeline"
+    first = client.get(url, params={"limit": 2}, headers=token).json()
+    assert [i["page"] for i in first["items"]] == [1, 1] and first["nextCursor"]
+    item = first["items"][0]
+    assert len(item["ocrPreview"]) == 160 and len(item["hash"]) == 64
+    assert set(item["thumbs"]) == set(board_thumbs.SIZES) and first["thumbSizes"] == board_thumbs.SIZES
+    rest = client.get(url, params={"limit": 2, "cursor": first["nextCursor"]}, headers=token).json()
+    assert [i["page"] for i in rest["items"]] == [2] and rest["nextCursor"] is None
+    assert len(client.get(url, params={"page": 1}, headers=token).json()["items"]) == 2
+    assert client.get(url, params={"cursor": "garbage"}, headers=token).status_code == 422
+
+    r = client.get(item["thumbs"]["sm"], headers=token)
+    assert r.status_code == 200 and r.headers["content-type"].startswith("image/")
+    assert max(Image.open(io.BytesIO(r.content)).size) == 160
+    assert client.get(f"/sessions/{sid}/whiteboard/{item['id']}/thumb/xl", headers=token).status_code == 404
+
+    # The same board in another session reuses the stored thumbnails.
+    other = make_hierarchy(token)["session"]["id"]
+    await _snapshots(monkeypatch, other, [_png(1)])
+    assert thumbnail_worker.stats["reused"] - before["reused"] == 1
+    again = client.get(f"/sessions/{other}/whiteboard/timeline", headers=token).json()["items"][0]
+    assert again["hash"] == item["hash"]
+
+    # Rows without thumbnails are backfilled; thumbnails count as referenced blobs.
+    with session_scope() as db:
+        db.execute(update(WhiteboardLog).where(WhiteboardLog.id == uuid.UUID(item["id"])).values(thumb_keys=None))
+    assert client.get(url, headers=token).json()["items"][0]["thumbs"] == {}
+    assert await migrate_board_images.thumbnails() >= 1
+    migrate_board_images.prune(min_age_s=-1)
+    assert client.get(item["thumbs"]["lg"], headers=token).status_code == 200
+
+
+async def test_full_queue_drops_jobs(monkeypatch):
+    monkeypatch.setattr(thumbnail_worker, "_queue", None)
+    monkeypatch.setattr(thumbnail_worker, "_runner", None)
+    monkeypatch.setattr(thumbnail_worker.settings, "thumb_queue_max", 1)
+    dropped = thumbnail_worker.stats["dropped"]
+    key = blob_store.put(b"not an image")
+    thumbnail_worker.submit(uuid.uuid4(), key)
+    thumbnail_worker.submit(uuid.uuid4(), key)  # runner hasn't started: queue is full
+    assert thumbnail_worker.stats["dropped"] == dropped + 1
+    await thumbnail_worker._runner
+    assert thumbnail_worker.thumb_stats()["waiting"] == 0
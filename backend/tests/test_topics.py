@@ -0,0 +1,124 @@
+"""Rolling topic index: incremental counts, hierarchy rollups, unit moves."""
+import importlib.util
+import uuid
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.core.database import session_scope
+from app.models.topic_term import TopicTerm
+from app.models.transcript import Transcript
+from app.services.topic_index import index_transcript, term_counts
+from tests.util import admin_token, auth, client, make_hierarchy
+
+_spec = importlib.util.spec_from_file_location(
+    "backfill_topics", Path(__file__).resolve().parent.parent / "scripts" / "backfill_topics.py"
+)
+backfill_topics = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backfill_topics)
+
+
+def test_term_counts_drops_stopwords_and_adds_bigrams():
+    counts = term_counts("The gradient descent step; gradient descent again.")
+    assert counts["gradient"] == 2 and counts["gradient descent"] == 2
+    assert "the" not in counts and "descent step" in counts
+
+
+def test_topics_roll_up_every_level():
+    h = auth(admin_token())
+    hier = make_hierarchy(h)
+    sid = hier["session"]["id"]
+    with session_scope() as db:
+        index_transcript(db, sid, "Normalization removes redundancy. Normalization uses functional dependencies.")
+        index_transcript(db, sid, "Functional dependencies drive normalization.")
+
+    body = client.get(f"/sessions/{sid}/topics", headers=h).json()
+    assert body["wordCloud"][0] == {"text": "normalization", "value": 3}
+    assert {"topic": "functional dependencies", "count": 2} in body["topTopics"]
+    for path in (
+        f"/units/{hier['unit']['id']}/topics",
+        f"/courses/{hier['course']['id']}/topics",
+        f"/semesters/{hier['semester']['id']}/topics",
+        f"/departments/{hier['department']['id']}/topics",
+        f"/batches/{hier['batch']['id']}/topics",
+        "/stats/topics",
+    ):
+        cloud = client.get(path, headers=h).json()["wordCloud"]
+        assert {"text": "normalization", "value": 3} in cloud, path
+
+
+def test_moving_session_moves_unit_counts():
+    h = auth(admin_token())
+    hier = make_hierarchy(h)
+    sid, old_unit = hier["session"]["id"], hier["unit"]["id"]
+    new_unit = client.post("/units", json={"course_id": hier["course"]["id"], "name": "Unit 2"}, headers=h).json()["id"]
+    with session_scope() as db:
+        index_transcript(db, uuid.UUID(sid), "Transactions need isolation.")
+
+    assert client.patch(f"/sessions/{sid}", json={"unit_id": new_unit}, headers=h).status_code == 200
+    assert client.get(f"/units/{old_unit}/topics", headers=h).json()["wordCloud"] == []
+    assert {"text": "isolation", "value": 1} in client.get(f"/units/{new_unit}/topics", headers=h).json()["wordCloud"]
+    # same course: the course rollup is unchanged by the move
+    course = client.get(f"/courses/{hier['course']['id']}/topics", headers=h).json()["wordCloud"]
+    assert {"text": "isolation", "value": 1} in course
+
+    assert client.delete(f"/sessions/{sid}", headers=h).status_code == 204
+    assert client.get(f"/courses/{hier['course']['id']}/topics", headers=h).json()["wordCloud"] == []
+
+
+def _rows(scope_ids: list) -> int:
+    with session_scope() as db:
+        return db.scalar(select(func.count()).select_from(TopicTerm).where(TopicTerm.scope_id.in_(scope_ids)))
+
+
+def test_deleting_a_unit_drops_its_share_of_the_course():
+    h = auth(admin_token())
+    hier = make_hierarchy(h)
+    course, unit, sid = hier["course"]["id"], hier["unit"]["id"], hier["session"]["id"]
+    other_unit = client.post("/units", json={"course_id": course, "name": "Unit 2"}, headers=h).json()["id"]
+    other_sid = client.post("/sessions", json={"subject": "S2", "unit_id": other_unit}, headers=h).json()["id"]
+    with session_scope() as db:
+        index_transcript(db, sid, "Deadlocks need detection.")
+        index_transcript(db, other_sid, "Deadlocks need prevention.")
+
+    assert client.delete(f"/units/{unit}", headers=h).status_code == 204
+    cloud = client.get(f"/courses/{course}/topics", headers=h).json()["wordCloud"]
+    assert {"text": "deadlocks", "value": 1} in cloud
+    assert not any(w["text"] == "detection" for w in cloud)
+    assert _rows([uuid.UUID(unit), uuid.UUID(sid)]) == 0
+
+
+def test_deleting_a_course_drops_all_its_rows():
+    h = auth(admin_token())
+    hier = make_hierarchy(h)
+    course, unit, sid = hier["course"]["id"], hier["unit"]["id"], hier["session"]["id"]
+    with session_scope() as db:
+        index_transcript(db, sid, "Paging avoids fragmentation.")
+
+    assert client.delete(f"/courses/{course}", headers=h).status_code == 204
+    assert _rows([uuid.UUID(course), uuid.UUID(unit), uuid.UUID(sid)]) == 0
+    cloud = client.get(f"/semesters/{hier['semester']['id']}/topics", headers=h).json()["wordCloud"]
+    assert cloud == []
+
+
+def test_backfill_indexes_old_transcripts_once():
+    h = auth(admin_token())
+    hier = make_hierarchy(h)
+    unit, sid = hier["unit"]["id"], hier["session"]["id"]
+    with session_scope() as db:  # written before the index existed
+        db.add_all(
+            Transcript(session_id=uuid.UUID(sid), text=t)
+            for t in ("Paging avoids fragmentation.", "Paging needs a page table.")
+        )
+
+    assert backfill_topics.backfill(batch=1) >= 1
+    backfill_topics.backfill(batch=1)  # a re-run skips what is indexed: no double counts
+    with session_scope() as db:
+        counts = dict(
+            db.execute(
+                select(TopicTerm.scope, TopicTerm.count).where(
+                    TopicTerm.term == "paging", TopicTerm.scope_id.in_([uuid.UUID(sid), uuid.UUID(unit)])
+                )
+            ).all()
+        )
+    assert counts == {"session": 2, "unit": 2}
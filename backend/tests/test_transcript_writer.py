@@ -0,0 +1,81 @@
+"""Write-behind transcript persistence: bulk flush, ordering, batched events, retry."""
+import uuid
+
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.transcript import Transcript
+from app.workers import transcript_writer as tw
+from tests.util import admin_token, auth, make_hierarchy
+
+
+def _rows(sid: str) -> list[str]:
+    with session_scope() as db:
+        q = select(Transcript.text).where(Transcript.session_id == uuid.UUID(sid)).order_by(Transcript.timestamp)
+        return list(db.scalars(q).all())
+
+
+async def test_fragments_flush_as_one_ordered_batch(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    events: list[tuple[str, dict]] = []
+
+    async def capture(session_id, event, payload):  # noqa: ANN001
+        events.append((event, payload))
+
+    monkeypatch.setattr(tw, "broadcast_to_session", capture)
+    writer = tw.TranscriptWriter(interval_ms=10_000, max_batch=500)
+    for i in range(5):
+        writer.add(sid, f"fragment {i}", 0.9)
+    assert _rows(sid) == [] and writer.pending(sid) == 5  # nothing written yet
+
+    await writer.flush(sid)
+    assert _rows(sid) == [f"fragment {i}" for i in range(5)]
+    assert [e for e, _ in events] == ["transcript_batch", "context_update"]
+    assert [i["text"] for i in events[0][1]["items"]] == [f"fragment {i}" for i in range(5)]
+    assert writer.pending(sid) == 0
+
+
+async def test_batch_max_triggers_early_flush_and_failures_retry(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    calls: list[int] = []
+    real_write = tw.TranscriptWriter._write
+
+    async def flaky(self, session_id, batch):  # noqa: ANN001
+        calls.append(len(batch))
+        return False if len(calls) == 1 else await real_write(self, session_id, batch)
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(tw.TranscriptWriter, "_write", flaky)
+    monkeypatch.setattr(tw, "broadcast_to_session", quiet)
+    writer = tw.TranscriptWriter(interval_ms=10_000, max_batch=3)
+    writer.add(sid, "a", 0.9)
+    writer.add(sid, "b", 0.9)
+    writer.add(sid, "c", 0.9)  # hits max_batch: flush scheduled immediately
+    await tw.asyncio.sleep(0.05)
+    assert calls == [3] and writer.pending(sid) == 3  # first write failed, rows kept in order
+    writer.add(sid, "d", 0.9)
+    await writer.flush(sid)
+    assert calls == [3, 4]
+    assert _rows(sid) == ["a", "b", "c", "d"]
+
+
+async def test_rows_queued_during_a_slow_flush_are_written(monkeypatch):
+    sid = str(uuid.uuid4())
+    writes: list[list[str]] = []
+
+    async def slow(self, session_id, batch):  # noqa: ANN001
+        await tw.asyncio.sleep(0.2)
+        writes.append([row["text"] for row in batch])
+        return True
+
+    monkeypatch.setattr(tw.TranscriptWriter, "_write", slow)
+    writer = tw.TranscriptWriter(interval_ms=50, max_batch=500)
+    writer.add(sid, "a", 0.9)
+    await tw.asyncio.sleep(0.1)  # "a" is being written
+    writer.add(sid, "b", 0.9)  # its timer fires while that flush is in flight
+    await tw.asyncio.sleep(0.4)
+    writer.add(sid, "c", 0.9)
+    await tw.asyncio.sleep(0.4)
+    assert writes == [["a"], ["b"], ["c"]] and writer.pending(sid) == 0
@@ -0,0 +1,59 @@
+"""Voice-activity gate before Whisper: skip silence/noise, trim, account savings."""
+import io
+import wave
+
+import pytest
+
+from app.services import vad
+from app.services.session_state import session_registry
+
+np = pytest.importorskip("numpy")  # optional; ships with faster-whisper
+
+
+def _wav(samples, rate: int = 16000, channels: int = 1) -> bytes:  # noqa: ANN001
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    if channels > 1:
+        pcm = np.repeat(pcm, channels)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def _tone(seconds: float, rate: int = 16000, amp: float = 0.3) -> "np.ndarray":
+    t = np.arange(int(seconds * rate)) / rate
+    return (amp * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+
+
+def _quiet(seconds: float, rate: int = 16000) -> "np.ndarray":
+    return np.random.default_rng(0).normal(0, 0.001, int(seconds * rate)).astype(np.float32)
+
+
+def test_gate_trims_leading_and_trailing_silence():
+    sid = "vad-trim"
+    audio = vad.gate(sid, _wav(np.concatenate([_quiet(1.0), _tone(1.0), _quiet(1.0)])))
+    assert isinstance(audio, np.ndarray) and audio.dtype == np.float32
+    assert 1.0 <= len(audio) / 16000 <= 1.0 + 2 * 0.21 + 0.06
+    assert vad.savings()[sid]["savedFraction"] > 0.5
+
+
+def test_gate_skips_silence_and_hiss():
+    sid = "vad-skip"
+    hiss = np.random.default_rng(1).uniform(-0.3, 0.3, 32000).astype(np.float32)
+    assert vad.gate(sid, _wav(_quiet(2.0))) is None
+    assert vad.gate(sid, _wav(hiss)) is None
+    stats = vad.savings()[sid]
+    assert stats["chunks"] == 2 and stats["skippedChunks"] == 2 and stats["savedFraction"] == 1.0
+
+    session_registry.touch(sid)
+    session_registry.end_session(sid)  # release drops the per-session counters
+    assert sid not in vad.savings()
+
+
+def test_gate_resamples_stereo_44k_and_passes_through_unknown_audio():
+    audio = vad.gate("vad-44k", _wav(_tone(1.0, rate=44100), rate=44100, channels=2))
+    assert abs(len(audio) - 16000) < 16000 * 0.2
+    assert vad.gate("vad-raw", b"not a wav") == b"not a wav"
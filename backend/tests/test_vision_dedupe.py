@@ -0,0 +1,118 @@
+"""Snapshot dedupe by perceptual hash + OCR cache (OCR provider patched)."""
+import base64
+import io
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.database import session_scope
+from app.models.whiteboard import WhiteboardLog
+from app.services.board_image import dhash, fingerprint, same_board
+from app.workers import vision_worker
+from tests.util import admin_token, auth, client, make_hierarchy
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _board(lines: int, compress_level: int = 6) -> bytes:
+    img = Image.new("RGB", (640, 360), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(lines):
+        draw.rectangle((40, 40 + i * 60, 400, 52 + i * 60), fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG", compress_level=compress_level)
+    return buf.getvalue()
+
+
+def test_dhash_ignores_reencoding_but_sees_new_ink():
+    one, one_again, two = _board(1), _board(1, compress_level=1), _board(2)
+    assert one != one_again and dhash(one) == dhash(one_again)
+    assert not same_board(fingerprint(one), fingerprint(two))
+    assert fingerprint(b"not an image").startswith("s:")
+
+
+async def test_unchanged_boards_skip_storage_and_ocr(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    ocr_calls: list[int] = []
+
+    async def fake_ocr(b64):  # noqa: ANN001
+        ocr_calls.append(len(b64))
+        return f"board with {len(ocr_calls)} change(s)"
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    before = dict(vision_worker.stats)
+    one, two = (base64.b64encode(b).decode() for b in (_board(1), _board(2)))
+
+    await vision_worker.process_snapshot(sid, one, None, 1)
+    await vision_worker.process_snapshot(sid, "data:image/png;base64," + one, None, 1)  # unchanged
+    await vision_worker.process_snapshot(sid, two, None, 1)
+    await vision_worker.process_snapshot(sid, one, None, 1)  # back to an earlier board: cached OCR
+    await vision_worker.process_snapshot(sid, one, None, 2)  # same board on another page: cached OCR
+
+    assert len(ocr_calls) == 2
+    with session_scope() as db:
+        rows = db.execute(
+            select(WhiteboardLog.page_number, WhiteboardLog.ocr_text)
+            .where(WhiteboardLog.session_id == uuid.UUID(sid))
+            .order_by(WhiteboardLog.timestamp)
+        ).all()
+        assert db.scalar(select(func.count()).select_from(WhiteboardLog).where(WhiteboardLog.session_id == uuid.UUID(sid))) == 4
+    assert [r.ocr_text for r in rows] == [
+        "board with 1 change(s)", "board with 2 change(s)", "board with 1 change(s)", "board with 1 change(s)"
+    ]
+    delta = {k: vision_worker.stats[k] - before[k] for k in before}
+    assert {k: delta[k] for k in ("snapshots", "unchanged", "cacheHits", "ocrCalls", "bytesSaved")} == {
+        "snapshots": 5, "unchanged": 1, "cacheHits": 2, "ocrCalls": 2, "bytesSaved": len(one)
+    }
+    assert delta["boardPixels"] == 2 * 640 * 360 and 0 < delta["ocrPixels"] < delta["boardPixels"] / 2  # crops only
+
+    body = client.get("/debug/vision", headers=auth(admin_token())).json()
+    assert body["ocrSkipped"] >= 3
+
+
+def _edited(data: bytes) -> bytes:
+    """`data` plus a small mark in the first dHash column: same dHash, new ink."""
+    img = Image.open(io.BytesIO(data)).convert("RGB")
+    ImageDraw.Draw(img).rectangle((6, 6, 18, 18), fill="black")
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+async def test_small_edits_and_other_sessions_are_ocrd(monkeypatch):
+    h = auth(admin_token())
+    sid, other = make_hierarchy(h)["session"]["id"], make_hierarchy(h)["session"]["id"]
+    seen: list[str] = []
+
+    async def fake_ocr(b64):  # noqa: ANN001
+        seen.append(b64)
+        return f"text {len(seen)}"
+
+    async def quiet(*_a):  # noqa: ANN002
+        return None
+
+    monkeypatch.setattr(vision_worker, "_run_ocr", fake_ocr)
+    monkeypatch.setattr(vision_worker, "broadcast_to_session", quiet)
+    one = _board(1)
+    edited = _edited(one)
+    assert fingerprint(one) == fingerprint(edited)  # a dHash collision
+
+    await vision_worker.process_snapshot(sid, base64.b64encode(one).decode(), None, 1)
+    await vision_worker.process_snapshot(sid, base64.b64encode(_board(1, compress_level=1)).decode(), None, 1)
+    await vision_worker.process_snapshot(sid, base64.b64encode(edited).decode(), None, 1)
+    await vision_worker.process_snapshot(other, base64.b64encode(one).decode(), None, 1)
+
+    assert len(seen) == 3  # re-encoding skipped; the edit and the other session's board OCR'd
+    with session_scope() as db:
+        texts = db.scalars(
+            select(WhiteboardLog.ocr_text)
+            .where(WhiteboardLog.session_id.in_([uuid.UUID(sid), uuid.UUID(other)]))
+            .order_by(WhiteboardLog.timestamp)
+        ).all()
+    assert len(texts) == 3 and texts[-1] == "text 3"
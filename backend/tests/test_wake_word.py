@@ -0,0 +1,63 @@
+"""Server-side wake-word detection on transcripts + dedupe against client commands."""
+import uuid
+
+from sqlalchemy import select
+
+from app.core.database import session_scope
+from app.models.transcript import Transcript
+from app.services.wake_word import RecentCommands, WakeTracker, split_wake
+from app.workers import stt_worker
+from tests.util import admin_token, auth, make_hierarchy
+
+
+def test_split_wake_tolerates_asr_variants():
+    assert split_wake("So that is recursion. Hey Aura, give me a quiz.") == ("So that is recursion.", "give me a quiz")
+    assert split_wake("okay ora explain the stack") == ("", "explain the stack")
+    assert split_wake("hey or a draw a diagram")[1] == "draw a diagram"
+    assert split_wake("hi aurra summarize") == ("", "summarize")
+    assert split_wake("hey everyone, open your books") is None
+    assert split_wake("the aura of the room") is None
+    assert split_wake("Hey Laura, can you close the door") is None  # names close to "aura"
+    assert split_wake("Okay Maura read the next line") is None
+
+
+def test_tracker_splits_transcript_from_command_and_dispatches_once():
+    t = WakeTracker()
+    assert t.commit("today we cover graphs") == "today we cover graphs"
+    assert t.commit("hey aura what is") == ""
+    assert t.partial("a graph?") is None  # first sighting
+    assert t.partial("a graph?") == "what is a graph"  # stable + sentence end: early dispatch
+    assert t.commit("a graph?") == ""
+    assert t.end() is None  # already dispatched
+    assert t.commit("next topic") == "next topic"
+    assert t.commit("hey ora quiz me") == "" and t.end() == "quiz me"
+
+
+def test_recent_commands_dedupes_within_window():
+    rc = RecentCommands()
+    assert not rc.is_duplicate("s", "explain recursion", now=0.0)
+    assert rc.is_duplicate("s", "hey aura explain recursion.", now=2.0)
+    assert rc.is_duplicate("s", "explain recursions", now=2.5)  # a slightly different hearing
+    assert not rc.is_duplicate("s", "explain recursion with an example", now=3.0)  # fuller command
+    assert not rc.is_duplicate("s", "give me a quiz", now=4.0)
+    assert not rc.is_duplicate("s", "explain recursion", now=100.0)  # window passed
+    assert not rc.is_duplicate("other", "give me a quiz", now=4.0)
+
+
+async def test_transcript_wake_dispatches_and_client_copy_is_dropped(monkeypatch):
+    sid = make_hierarchy(auth(admin_token()))["session"]["id"]
+    dispatched: list[str] = []
+
+    async def fake_process(session_id, command):  # noqa: ANN001
+        dispatched.append(command)
+
+    monkeypatch.setattr(stt_worker, "process_command", fake_process)
+    await stt_worker.save_transcript_text(sid, "Entropy measures disorder. Hey ora, make a quiz on entropy")
+    await stt_worker.save_transcript_text(sid, "hey aura make a quiz on entropy")  # same command again
+    await stt_worker.asyncio.sleep(0)
+    await stt_worker.transcript_writer.flush(sid)
+    assert dispatched == ["hey aura make a quiz on entropy"]
+    assert stt_worker.recent_commands.is_duplicate(sid, "hey aura make a quiz on entropy")  # client's copy
+    with session_scope() as db:
+        rows = db.scalars(select(Transcript.text).where(Transcript.session_id == uuid.UUID(sid))).all()
+    assert rows == ["Entropy measures disorder."]
@@ -0,0 +1,107 @@
+"""Whisper worker pool: spawned workers, warmup, metrics (fake model, no faster-whisper)."""
+import os
+import time
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.whisper_pool import SharedAudio, WhisperPool
+from tests.util import admin_token, auth, client
+
+
+class _EchoModel:
+    def __init__(self, size: str) -> None:
+        self.size = size
+        self.warmed = False
+
+    def transcribe(self, audio, beam_size=1, language=None, word_timestamps=False):  # noqa: ANN001
+        if not hasattr(audio, "read"):  # samples (e.g. a shared-memory view)
+            return [SimpleNamespace(text=f"{len(audio)} samples, peak {float(audio.max())}", words=[])], None
+        data = audio.read()
+        if not self.warmed:  # first call is the pool's silent warmup clip
+            self.warmed = True
+            return [], None
+        if data == b"boom":
+            raise ValueError("bad audio")
+        words = [SimpleNamespace(start=i * 0.5, end=i * 0.5 + 0.4, word=f" {w}") for i, w in enumerate(data.decode().split())]
+        return [SimpleNamespace(text=f" {data.decode()} [{language}/{self.size}] ", words=words)], None
+
+
+def echo_loader(size: str, compute_type: str, threads: int) -> _EchoModel:
+    return _EchoModel(size)
+
+
+def slow_loader(size: str, compute_type: str, threads: int) -> _EchoModel:
+    time.sleep(3)  # a cold model load, longer than a chunk's deadline
+    return _EchoModel(size)
+
+
+def dies_once_loader(marker: str, compute_type: str, threads: int) -> _EchoModel:
+    if not os.path.exists(marker):  # first load crashes the worker
+        open(marker, "w").close()
+        os._exit(1)
+    return _EchoModel("tiny")
+
+
+async def test_pool_preloads_and_transcribes():
+    pool = WhisperPool(workers=2, queue_depth=4, model_args=("tiny", "int8", 1), loader=echo_loader)
+    try:
+        assert pool.start()
+        assert await pool.wait_ready(timeout=60)
+        assert await pool.transcribe(b"hello", language="en") == "hello [en/tiny]"
+        assert await pool.transcribe(b"two words", word_timestamps=True) == [(0.0, 0.4, " two"), (0.5, 0.9, " words")]
+        assert await pool.transcribe(b"boom") is None  # failed, not "no words"
+        np = pytest.importorskip("numpy")
+        shm = shared_memory.SharedMemory(create=True, size=16000 * 4)
+        try:
+            samples = np.ndarray((16000,), dtype=np.float32, buffer=shm.buf)
+            samples[:] = 0
+            samples[8000] = 0.5
+            assert await pool.transcribe(SharedAudio(shm.name, 4000, 12000)) == "8000 samples, peak 0.5"
+            del samples
+        finally:
+            shm.close()
+            shm.unlink()
+        stats = pool.stats()
+        assert stats["workersReady"] == 2 and stats["workersAlive"] == 2
+        assert stats["completed"] == 3 and stats["failed"] == 1
+        assert stats["inference"]["count"] == 4 and stats["queueWait"]["count"] == 4
+    finally:
+        pool.stop()
+    assert not pool.started
+
+
+async def test_chunk_deadline_starts_once_a_worker_is_ready():
+    pool = WhisperPool(
+        workers=1, model_args=("tiny", "int8", 1), loader=slow_loader, timeout_s=2, startup_timeout_s=0.5
+    )
+    try:
+        assert await pool.transcribe(b"early") is None  # still loading: not counted as a timeout
+        assert pool.stats()["notReady"] == 1
+        pool.startup_timeout_s = 60
+        assert await pool.transcribe(b"hello", language="en") == "hello [en/tiny]"
+        assert pool.stats()["timedOut"] == 0
+    finally:
+        pool.stop()
+
+
+async def test_worker_that_dies_is_respawned(tmp_path):
+    pool = WhisperPool(workers=1, model_args=(str(tmp_path / "crashed"), "int8", 1), loader=dies_once_loader)
+    try:
+        assert await pool.transcribe(b"hello", language="en") == "hello [en/tiny]"
+        assert pool.stats()["restarts"] == 1
+    finally:
+        pool.stop()
+
+
+async def test_pool_without_whisper_is_a_noop():
+    pool = WhisperPool(workers=1)
+    assert await pool.transcribe(b"anything") is None
+    assert pool.stats()["available"] is False and not pool.started
+
+
+def test_debug_stt_requires_admin():
+    assert client.get("/debug/stt").status_code == 401
+    body = client.get("/debug/stt", headers=auth(admin_token())).json()
+    assert {"queueWait", "inference", "workersReady"} <= body.keys()
@@ -1,6 +1,7 @@
 """Shared test helpers for the v5 academic tree + RBAC (no signup endpoint)."""
 from __future__ import annotations
 
+import itertools
 import uuid
 
 from fastapi.testclient import TestClient
@@ -65,15 +66,18 @@ def make_user(role: UserRole = UserRole.TEACHER, semester_ids: tuple = ()) -> tu
     return uid, _login(email)
 
 
-_year_counter = 2000
+_auto_batches = itertools.count()
 
 
 def make_batch(admin_h: dict, start: int | None = None, end: int | None = None) -> dict:
-    """Batches are globally unique by year range — default to a fresh range each call."""
-    global _year_counter
+    """Batches are globally unique by year range — default to a fresh range each call.
+
+    Auto ranges span five or more years, so they never collide with the usual
+    four-year ranges tests pass explicitly."""
     if start is None:
-        start, end = _year_counter, _year_counter + 4
-        _year_counter += 1
+        i = next(_auto_batches)
+        start = 2000 + i % 50
+        end = start + 5 + i // 50
     r = client.post("/batches", json={"start_year": start, "end_year": end}, headers=admin_h)
     assert r.status_code == 201, r.text
     return r.json()
@@ -27,10 +27,11 @@ interface SpeechRecognitionLike {
 }
 
 // Robust wake matcher: browser ASR mangles "Aura" (ora / aurora / era / "or a" …),
-// so we accept a "hey/ok/okay/hi" anchor + an Aura-ish word. The anchor keeps
-// false-positives low while tolerating the common mis-hearings.
+// so we accept a "hey/ok/okay/hi" anchor + a known mis-hearing. The anchor keeps
+// false-positives low while tolerating the common mis-hearings. Same lists as the
+// server's matcher (backend/app/services/wake_word.py).
 const WAKE_RE =
-  /\b(?:hey|hay|hi|ok|okay)[\s,]+(?:aura|aurora|ora|oora|hora|era|aro|arrow|or a|are a|hour a)\b/i;
+  /\b(?:hey|hay|hei|hi|ok|okay)[\s,]+(?:aura|aurra|aurora|ora|oora|orra|hora|era|aro|arrow|aira|or a|are a|hour a|our a)\b/i;
 
 /** Browser Web Speech capture. Detects the "Hey Aura" wake phrase -> voice_command;
  *  otherwise streams finalized text as transcript_text. Renders nothing. */
@@ -118,12 +118,14 @@ export function Workspace({ sessionId }: { sessionId: string }) {
     socket.on("connect", () => setConnected(true));
     socket.on("disconnect", () => setConnected(false));
     socket.on("connected", () => setConnected(true));
-    socket.on("transcript_update", (d: { id?: string; text: string; timestamp?: string }) =>
-      addTranscript({
-        id: d.id ?? crypto.randomUUID(),
-        text: d.text,
-        timestamp: d.timestamp ?? new Date().toISOString(),
-      }),
+    socket.on("transcript_batch", (d: { items?: { id?: string; text: string; timestamp?: string }[] }) =>
+      (d?.items ?? []).forEach((t) =>
+        addTranscript({
+          id: t.id ?? crypto.randomUUID(),
+          text: t.text,
+          timestamp: t.timestamp ?? new Date().toISOString(),
+        }),
+      ),
     );
     socket.on("command_response", (d: AIResponse) => addResponse(d));
     socket.on("context_update", (d: { tokens?: number }) => setTokens(d?.tokens ?? 0));
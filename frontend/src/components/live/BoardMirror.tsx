@@ -0,0 +1,119 @@
+"use client";
+
+import { useEffect, useRef, useState } from "react";
+import type { Socket } from "socket.io-client";
+
+import type { BoardQuality } from "@/lib/socket";
+
+/** board_update: a full keyframe, or tiles to paint over frame `base`. */
+type BoardFrame = {
+  seq?: number;
+  key?: boolean;
+  base?: number;
+  width?: number;
+  height?: number;
+  image?: string;
+  tiles?: { x: number; y: number; image: string }[];
+};
+
+const QUALITY_KEY = "aura-board-quality";
+
+function loadImage(src: string): Promise<HTMLImageElement> {
+  return new Promise((resolve, reject) => {
+    const img = new Image();
+    img.onload = () => resolve(img);
+    img.onerror = () => reject(new Error("frame decode failed"));
+    img.src = src;
+  });
+}
+
+/** Board tier for this device: remembered choice, else "low" on save-data / slow links. */
+export function initialBoardQuality(): BoardQuality {
+  try {
+    const saved = localStorage.getItem(QUALITY_KEY);
+    if (saved === "high" || saved === "low") return saved;
+  } catch {
+    /* storage unavailable */
+  }
+  const conn = (navigator as Navigator & { connection?: { saveData?: boolean; effectiveType?: string } }).connection;
+  return conn?.saveData || ["slow-2g", "2g", "3g"].includes(conn?.effectiveType ?? "") ? "low" : "high";
+}
+
+export function rememberBoardQuality(q: BoardQuality) {
+  try {
+    localStorage.setItem(QUALITY_KEY, q);
+  } catch {
+    /* storage unavailable */
+  }
+}
+
+/** Read-only mirror of the teacher's board. The join-time `catchup` frame and keyframes
+ *  replace the canvas; deltas paint changed tiles in place. A delta for a frame we
+ *  don't hold asks for a keyframe. */
+export function BoardMirror({ socket }: { socket: Socket | null }) {
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const seqRef = useRef(0);
+  const chainRef = useRef<Promise<void>>(Promise.resolve());
+  const [hasFrame, setHasFrame] = useState(false);
+
+  useEffect(() => {
+    if (!socket) return;
+    const apply = async (d: BoardFrame) => {
+      const canvas = canvasRef.current;
+      const ctx = canvas?.getContext("2d");
+      if (!canvas || !ctx) return;
+      if (d.key || (d.image && d.key === undefined)) {
+        const img = await loadImage(d.image ?? "");
+        canvas.width = d.width ?? img.naturalWidth;
+        canvas.height = d.height ?? img.naturalHeight;
+        ctx.drawImage(img, 0, 0);
+        seqRef.current = d.seq ?? 0;
+        setHasFrame(true);
+        return;
+      }
+      if (!seqRef.current || d.base !== seqRef.current) {
+        socket.emit("board_resync");
+        return;
+      }
+      const tiles = await Promise.all((d.tiles ?? []).map((t) => loadImage(t.image)));
+      tiles.forEach((img, i) => ctx.drawImage(img, d.tiles![i].x, d.tiles![i].y));
+      seqRef.current = d.seq ?? seqRef.current;
+    };
+    // Frames apply strictly in arrival order (decoding is async).
+    const onFrame = (d: BoardFrame) => {
+      chainRef.current = chainRef.current.then(() => apply(d)).catch(() => {
+        seqRef.current = 0;
+        socket.emit("board_resync");
+      });
+    };
+    const onCatchup = (d: { board?: BoardFrame | null }) => {
+      if (d?.board) onFrame(d.board);
+    };
+    socket.on("board_update", onFrame);
+    socket.on("catchup", onCatchup);
+    return () => {
+      socket.off("board_update", onFrame);
+      socket.off("catchup", onCatchup);
+    };
+  }, [socket]);
+
+  return (
+    <>
+      <canvas
+        ref={canvasRef}
+        aria-label="Live board"
+        className={`h-full w-full object-contain ${hasFrame ? "" : "hidden"}`}
+      />
+      {!hasFrame && (
+        <div className="grid h-full place-items-center px-6 text-center">
+          <div>
+            <p className="text-sm font-medium">Waiting for the board…</p>
+            <p className="mt-1 text-xs text-muted-foreground">
+              Your teacher&apos;s board will appear here as they write.
+            </p>
+          </div>
+        </div>
+      )}
+    </>
+  );
+}
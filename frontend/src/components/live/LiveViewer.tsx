@@ -3,22 +3,32 @@
 import { Radio } from "lucide-react";
 import Link from "next/link";
 import { useEffect, useRef, useState } from "react";
+import type { Socket } from "socket.io-client";
 
 import { ResponseView } from "@/components/ai-panel/ResponseView";
 import { AskAura } from "@/components/live/AskAura";
+import { BoardMirror, initialBoardQuality, rememberBoardQuality } from "@/components/live/BoardMirror";
 import { LiveQuizStudent } from "@/components/livequiz/LiveQuizStudent";
 import { ThemeToggle } from "@/components/theme/ThemeToggle";
 import { liveApi } from "@/lib/api";
-import { connectStudentSocket, disconnectSocket } from "@/lib/socket";
+import { type BoardQuality, connectStudentSocket, disconnectSocket, setBoardQuality } from "@/lib/socket";
 import type { AIResponse, TranscriptEntry } from "@/types";
 
 type Status = "loading" | "ok" | "error";
+type TranscriptItem = { id?: string; text: string; timestamp?: string };
+
+const toEntry = (t: TranscriptItem): TranscriptEntry => ({
+  id: t.id ?? crypto.randomUUID(),
+  text: t.text,
+  timestamp: t.timestamp ?? new Date().toISOString(),
+});
 
 export function LiveViewer({ code }: { code: string }) {
   const [status, setStatus] = useState<Status>("loading");
   const [subject, setSubject] = useState("");
   const [connected, setConnected] = useState(false);
-  const [board, setBoard] = useState<string | null>(null);
+  const [socket, setSocket] = useState<Socket | null>(null);
+  const [quality, setQuality] = useState<BoardQuality>("high");
   const [transcripts, setTranscripts] = useState<TranscriptEntry[]>([]);
   const [responses, setResponses] = useState<AIResponse[]>([]);
   const startedRef = useRef(false);
@@ -33,27 +43,23 @@ export function LiveViewer({ code }: { code: string }) {
         setSubject(info.subject);
         setStatus("ok");
 
-        const socket = connectStudentSocket(info.joinCode);
+        const tier = initialBoardQuality();
+        setQuality(tier);
+        const socket = connectStudentSocket(info.joinCode, tier);
+        setSocket(socket);
         socket.on("connect", () => setConnected(true));
         socket.on("disconnect", () => setConnected(false));
         socket.on("connected", (d: { subject?: string }) => {
           setConnected(true);
           if (d?.subject) setSubject(d.subject);
         });
-        socket.on("board_update", (d: { image?: string }) => {
-          if (d?.image) setBoard(d.image);
+        // Late join: the board frame + recent transcript and AI responses in one payload.
+        socket.on("catchup", (d: { transcripts?: TranscriptItem[]; commands?: AIResponse[] }) => {
+          setTranscripts((d?.transcripts ?? []).map(toEntry).slice(-50));
+          setResponses([...(d?.commands ?? [])].reverse().slice(0, 12));
         });
-        socket.on("transcript_update", (d: { id?: string; text: string; timestamp?: string }) =>
-          setTranscripts((prev) =>
-            [
-              ...prev,
-              {
-                id: d.id ?? crypto.randomUUID(),
-                text: d.text,
-                timestamp: d.timestamp ?? new Date().toISOString(),
-              },
-            ].slice(-50),
-          ),
+        socket.on("transcript_batch", (d: { items?: TranscriptItem[] }) =>
+          setTranscripts((prev) => [...prev, ...(d?.items ?? []).map(toEntry)].slice(-50)),
         );
         socket.on("command_response", (d: AIResponse) =>
           setResponses((prev) => [d, ...prev].slice(0, 12)),
@@ -99,6 +105,19 @@ export function LiveViewer({ code }: { code: string }) {
           </div>
         </div>
         <div className="flex items-center gap-2">
+          <button
+            type="button"
+            onClick={() => {
+              const next: BoardQuality = quality === "high" ? "low" : "high";
+              setQuality(next);
+              rememberBoardQuality(next);
+              if (socket) setBoardQuality(socket, next);
+            }}
+            title="Board quality (Lite saves data on slow connections)"
+            className="rounded-full border border-border px-2.5 py-1 text-xs font-medium text-muted-foreground hover:text-foreground"
+          >
+            {quality === "high" ? "HD" : "Lite"}
+          </button>
           <span className="flex items-center gap-1.5 rounded-full bg-danger/10 px-2.5 py-1 text-xs font-medium text-danger">
             <Radio className="h-3.5 w-3.5" /> Watching
           </span>
@@ -109,19 +128,7 @@ export function LiveViewer({ code }: { code: string }) {
       <main className="grid flex-1 grid-cols-1 gap-3 overflow-hidden p-3 lg:grid-cols-[1fr_22rem]">
         {/* Board mirror */}
         <section className="relative min-h-0 overflow-hidden rounded-2xl border border-border bg-card">
-          {board ? (
-            // eslint-disable-next-line @next/next/no-img-element
-            <img src={board} alt="Live board" className="h-full w-full object-contain" />
-          ) : (
-            <div className="grid h-full place-items-center px-6 text-center">
-              <div>
-                <p className="text-sm font-medium">Waiting for the board…</p>
-                <p className="mt-1 text-xs text-muted-foreground">
-                  Your teacher&apos;s board will appear here as they write.
-                </p>
-              </div>
-            </div>
-          )}
+          <BoardMirror socket={socket} />
         </section>
 
         {/* Aura content + transcript */}
@@ -25,6 +25,7 @@ if (typeof window !== "undefined") {
 }
 
 const SNAPSHOT_INTERVAL_MS = 10_000;
+const EXPORT_PADDING = 16;
 const MAX_DROP_DIM = 360; // cap the size of dropped images on the board
 const IMAGE_MIMES = ["image/png", "image/jpeg", "image/svg+xml", "image/webp", "image/gif", "image/bmp"];
 
@@ -118,10 +119,13 @@ export function Board({ sessionId, recording }: { sessionId: string; recording:
           appState: { ...api.getAppState(), exportBackground: true },
           files: api.getFiles(),
           mimeType: "image/png",
-          exportPadding: 16,
+          exportPadding: EXPORT_PADDING,
         });
         const url = await getDataURL(blob);
-        getSocket()?.emit("canvas_snapshot", { sessionId, imageData: url, pageNumber: 1 });
+        // The scene rides along so the server reads typed text instead of OCR'ing it
+        // (files stay local: image cards are still read off the PNG).
+        const tldrawState = { format: "excalidraw", elements, exportPadding: EXPORT_PADDING };
+        getSocket()?.emit("canvas_snapshot", { sessionId, imageData: url, tldrawState, pageNumber: 1 });
       } catch {
         /* export can fail mid-edit; next tick retries */
       }
@@ -19,12 +19,15 @@ export function connectSocket(sessionId: string, token: string): Socket {
   return socket;
 }
 
-/** Connect as a read-only student viewer using a session join code (no JWT). */
-export function connectStudentSocket(joinCode: string): Socket {
+export type BoardQuality = "high" | "low";
+
+/** Connect as a read-only student viewer using a session join code (no JWT).
+ *  `quality` picks the board mirror tier (switchable later via `board_quality`). */
+export function connectStudentSocket(joinCode: string, quality: BoardQuality = "high"): Socket {
   if (socket?.connected) socket.disconnect();
   socket = io(WS_URL, {
     transports: ["websocket"],
-    auth: { role: "student", joinCode },
+    auth: { role: "student", joinCode, quality },
     reconnection: true,
     reconnectionAttempts: 5,
     reconnectionDelay: 1000,
@@ -33,6 +36,13 @@ export function connectStudentSocket(joinCode: string): Socket {
   return socket;
 }
 
+/** Switch a student socket's board tier. Also updates `auth`, which socket.io re-sends
+ *  on every auto-reconnect, so the server doesn't restore the tier picked at connect. */
+export function setBoardQuality(s: Socket, quality: BoardQuality): void {
+  s.auth = { ...(s.auth as Record<string, unknown>), quality };
+  s.emit("board_quality", { quality });
+}
+
 export function getSocket(): Socket | null {
   return socket;
 }